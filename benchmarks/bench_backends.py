@@ -0,0 +1,90 @@
+"""
+Compare the storage backends on the API endpoints.
+
+Usage:
+    python benchmarks/bench_backends.py [--size 100000] [--iterations 300]
+
+The response cache is disabled so that every request reaches the backend.
+SQLite numbers include the hop to the storage thread pool.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_quotes
+from quotes_api.main import app
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.response_cache import ResponseCache
+from quotes_api.services.storage import InMemoryBackend, SQLiteBackend
+
+ENDPOINTS = {
+    "by_id": "/api/v1/quotes/5",
+    "list": "/api/v1/quotes/?limit=100",
+    "by_category": "/api/v1/quotes/category/Amour",
+    "by_author": "/api/v1/quotes/author/Victor%20Hugo",
+    "random": "/api/v1/quotes/random",
+    "search": "/api/v1/quotes/search/?q=amour%20vie&limit=20",
+    "stats": "/api/v1/meta/stats",
+}
+
+
+def bench(client: TestClient, path: str, iterations: int) -> float:
+    """Return the mean latency of a GET request in microseconds."""
+    client.get(path)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = client.get(path)
+        assert response.status_code == 200, response.text
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    quotes = make_quotes(args.size)
+    with tempfile.TemporaryDirectory() as directory:
+        builders = {
+            "memory": lambda: QuoteService(backend=InMemoryBackend(quotes)),
+            "sqlite": lambda: QuoteService(
+                backend=SQLiteBackend(
+                    os.path.join(directory, "quotes.db"),
+                    quotes=quotes,
+                    pool_size=args.pool_size,
+                ),
+                max_workers=args.pool_size,
+            ),
+        }
+        print(f"{args.size} quotes, mean latency per request")
+        print(
+            f"{'backend':>8} {'build (s)':>10} "
+            + " ".join(f"{name:>12}" for name in ENDPOINTS)
+        )
+        for name, build in builders.items():
+            start = time.perf_counter()
+            service = build()
+            elapsed = time.perf_counter() - start
+            app.state.quote_service = service
+            app.state.response_cache = ResponseCache(max_entries=0)
+            client = TestClient(app)
+            timings = [
+                bench(client, path, args.iterations) for path in ENDPOINTS.values()
+            ]
+            print(
+                f"{name:>8} {elapsed:>10.3f} "
+                + " ".join(f"{t:>10.1f}us" for t in timings)
+            )
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Measure response compression on large cacheable payloads.
+
+Usage:
+    python benchmarks/bench_compression.py [--size 100000]
+
+For each endpoint, prints the raw and compressed sizes, the time of an
+uncompressed request and of a request served from the cached compressed
+variant, and what compressing the body on every request would add.
+"""
+
+import argparse
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_quotes
+from quotes_api.api.compression import ENCODINGS, compress
+from quotes_api.main import app
+from quotes_api.services.quote_service import QuoteService
+
+ENDPOINTS = ("/api/v1/quotes/?limit=1000", "/api/v1/meta/authors", "/api/v1/meta/stats")
+
+
+def timed(func, iterations: int) -> float:
+    """Return the mean time of func in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app.state.quote_service = QuoteService(make_quotes(args.size))
+    client = TestClient(app)
+
+    print(f"{args.size} quotes")
+    for path in ENDPOINTS:
+        identity = {"Accept-Encoding": "identity"}
+        raw = client.get(path, headers=identity).content
+        plain = timed(lambda: client.get(path, headers=identity), args.iterations)
+        for encoding in ENCODINGS:
+            headers = {"Accept-Encoding": encoding}
+            client.get(path, headers=headers)
+            cached = timed(lambda: client.get(path, headers=headers), args.iterations)
+            inline = timed(lambda: compress(raw, encoding), args.iterations)
+            size = len(compress(raw, encoding))
+            print(
+                f"{path:<28} {encoding:>4}: {len(raw) / 1024:8.1f} KiB"
+                f" -> {size / 1024:7.1f} KiB"
+                f"  request: identity {plain:5.2f} ms,"
+                f" {encoding} cached {cached:5.2f} ms"
+                f"  (+{inline:5.2f} ms if compressed per request)"
+            )
+
+
+if __name__ == "__main__":
+    main()
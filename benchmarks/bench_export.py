@@ -0,0 +1,69 @@
+"""
+Compare peak memory of the streaming export with a one-shot list response.
+
+Usage:
+    python benchmarks/bench_export.py [--size 200000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.corpus import make_quotes
+from quotes_api.api.export import gzip_chunks, ndjson_chunks
+from quotes_api.models.quote import QuoteListResponse
+from quotes_api.services.quote_service import QuoteService
+
+
+def measure(label, func):
+    """Print the time of func, then its peak allocation in a traced rerun."""
+    start = time.perf_counter()
+    size, first_chunk = func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:>16}: {elapsed:6.2f}s  peak {peak / 2**20:8.1f} MiB  "
+        f"{size / 2**20:8.1f} MiB out  first chunk after {first_chunk * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+    service = QuoteService(make_quotes(args.size))
+
+    def one_shot():
+        start = time.perf_counter()
+        quotes = service.get_all_quotes()
+        body = (
+            QuoteListResponse(data=quotes, count=len(quotes)).model_dump_json().encode()
+        )
+        return len(body), time.perf_counter() - start
+
+    def streamed(compress):
+        def run():
+            start = time.perf_counter()
+            chunks = ndjson_chunks(service.iter_quotes())
+            if compress:
+                chunks = gzip_chunks(chunks)
+            total, first = 0, None
+            for chunk in chunks:
+                if first is None and chunk:
+                    first = time.perf_counter() - start
+                total += len(chunk)
+            return total, first
+
+        return run
+
+    print(f"corpus: {args.size} quotes")
+    measure("one-shot JSON", one_shot)
+    measure("ndjson stream", streamed(False))
+    measure("ndjson+gzip", streamed(True))
+
+
+if __name__ == "__main__":
+    main()
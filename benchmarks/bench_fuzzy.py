@@ -0,0 +1,94 @@
+"""
+Measure the latency and accuracy of fuzzy author lookups.
+
+Usage:
+    python benchmarks/bench_fuzzy.py [--authors 50000] [--lookups 500]
+
+Builds --authors distinct, pronounceable "First Last" names, then looks up
+misspelled copies of some of them (one character dropped, doubled or
+replaced) in the trigram index and, for reference, with a
+linear scan ranking every name by edit distance.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from quotes_api.services.fuzzy_index import FuzzyIndex, fold_name, similarity
+
+SYLLABLES = (
+    "ma ri an to ne la lé o pa ul cé li ne ja cques hu go vol tai re ca mus "
+    "sa ge sse ber nard dé ni se ro bert mon tai gne pas cal zo la sté phan"
+).split()
+
+
+def make_names(count: int, rng: random.Random):
+    """Return ``count`` distinct random names."""
+    names = set()
+    while len(names) < count:
+        first = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 3))).title()
+        last = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).title()
+        names.add(f"{first} {last}")
+    return sorted(names)
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Return ``name`` with one typo."""
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.choice(("drop", "double", "replace"))
+    if kind == "drop":
+        return name[:i] + name[i + 1 :]
+    if kind == "double":
+        return name[:i] + name[i] + name[i:]
+    return name[:i] + rng.choice("aeiourstln") + name[i + 1 :]
+
+
+def timed(lookup, queries):
+    """Return the results of ``lookup`` over ``queries`` and their latencies in ms."""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(lookup(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--authors", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--scan-lookups", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    names = make_names(args.authors, rng)
+    targets = rng.sample(names, args.lookups)
+    queries = [misspell(name, rng) for name in targets]
+
+    start = time.perf_counter()
+    index = FuzzyIndex(names)
+    print(f"index of {len(index)} names built in {time.perf_counter() - start:.2f}s")
+
+    results, latencies = timed(index.match, queries)
+    found = sum(
+        bool(result) and result[0][0] == name for result, name in zip(results, targets)
+    )
+    p99 = latencies[int(len(latencies) * 0.99)]
+    print(
+        f"trigram index  p50 {statistics.median(latencies):7.2f}ms  p99 {p99:7.2f}ms  "
+        f"top match correct {found}/{len(queries)}"
+    )
+
+    folded = [fold_name(name) for name in names]
+
+    def scan(query):
+        query = fold_name(query)
+        return max(zip((similarity(query, other, 0.7) for other in folded), names))
+
+    results, latencies = timed(scan, queries[: args.scan_lookups])
+    print(f"linear scan    p50 {statistics.median(latencies):7.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure bulk import throughput and memory.
+
+Usage:
+    python benchmarks/bench_import.py [--size 1000000] [--format ndjson|csv]
+                                      [--backend memory|sqlite] [--chunk-size 5000]
+
+Writes a synthetic corpus of --size quotes (without ids) to a temporary
+file, imports it into an empty backend and prints the rows per second and
+the growth of the peak RSS. Run one configuration per process: the peak
+RSS never goes down.
+"""
+
+import argparse
+import logging
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks.corpus import make_quotes
+from quotes_api.api.export import csv_chunks, ndjson_chunks
+from quotes_api.services.bulk_import import BulkImporter
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.storage import InMemoryBackend, SQLiteBackend
+
+ENCODERS = {"ndjson": ndjson_chunks, "csv": csv_chunks}
+
+
+def peak_rss_mib() -> float:
+    """Peak resident set size of this process, in MiB (Linux reports KiB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_corpus(path: str, size: int, format: str) -> None:
+    """Write a synthetic corpus in batches, without ids."""
+    with open(path, "wb") as target:
+        for start in range(0, size, 10_000):
+            quotes = make_quotes(min(10_000, size - start), seed=start)
+            for quote in quotes:
+                quote.text = f"{quote.text} #{start + quote.id}"
+                quote.id = None
+            for chunk in ENCODERS[format]([quotes]):
+                target.write(chunk)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=sorted(ENCODERS), default="ndjson")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"quotes.{args.format}")
+        write_corpus(path, args.size, args.format)
+        file_mib = os.path.getsize(path) / 1024 / 1024
+
+        if args.backend == "sqlite":
+            backend = SQLiteBackend(os.path.join(directory, "quotes.db"))
+        else:
+            backend = InMemoryBackend()
+        service = QuoteService(backend=backend)
+        importer = BulkImporter(service, chunk_size=args.chunk_size)
+
+        baseline = peak_rss_mib()
+        start = time.perf_counter()
+        with open(path, "rb") as source:
+            report = importer.run(source, args.format)
+        elapsed = time.perf_counter() - start
+        service.close()
+
+    print(
+        f"{args.backend:>6} {args.format:>6} chunk={args.chunk_size}: "
+        f"{report.imported} quotes from {file_mib:.0f} MiB in {elapsed:.2f}s "
+        f"({report.imported / elapsed:,.0f} rows/s), "
+        f"peak RSS +{peak_rss_mib() - baseline:.0f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure the encode time of a /quotes/ page.
+
+Usage:
+    python benchmarks/bench_json.py [--size 100000] [--limits 100,1000]
+
+Pages are read from a QuoteService holding --size quotes, then encoded as
+a QuoteListResponse in three ways:
+
+    fastapi     what a response_model route did: dump the model to a dict,
+                run jsonable_encoder, then json.dumps
+    dump_json   model_dump_json() then encode, as render_page used to
+    adapter     TypeAdapter.dump_json straight to bytes, as render_page now does
+
+"request" is a full uncached GET /api/v1/quotes/?limit=N through the app.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from benchmarks.corpus import make_quotes
+from quotes_api.main import app
+from quotes_api.models.quote import QuoteListResponse
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.response_cache import ResponseCache
+
+adapter = TypeAdapter(QuoteListResponse)
+
+ENCODERS = {
+    "fastapi": lambda response: json.dumps(
+        jsonable_encoder(adapter.dump_python(response, mode="json")),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8"),
+    "dump_json": lambda response: response.model_dump_json().encode("utf-8"),
+    "adapter": lambda response: adapter.dump_json(response),
+}
+
+
+def timed(func, iterations: int) -> float:
+    """Return the mean time of func in microseconds."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--limits", default="100,1000")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    service = QuoteService(make_quotes(args.size))
+    app.state.quote_service = service
+    # A cache too small to hold a page: every request renders
+    app.state.response_cache = ResponseCache(max_entries=1, max_bytes=1)
+    client = TestClient(app)
+
+    print(f"{args.size} quotes")
+    print(f"{'limit':>6} " + " ".join(f"{name:>12}" for name in [*ENCODERS, "request"]))
+    for limit in (int(value) for value in args.limits.split(",")):
+        page = service.get_all_quotes(after_id=args.size // 2, limit=limit)
+        response = QuoteListResponse(data=page, count=len(page))
+        assert len({encode(response) for encode in ENCODERS.values()}) == 1
+        timings = [
+            timed(lambda: encode(response), args.iterations)
+            for encode in ENCODERS.values()
+        ]
+        path = f"/api/v1/quotes/?limit={limit}"
+        timings.append(timed(lambda: client.get(path), args.iterations))
+        print(f"{limit:>6} " + " ".join(f"{t:>10.1f}us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
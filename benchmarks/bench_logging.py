@@ -0,0 +1,76 @@
+"""
+Measure the caller-side cost of a request log line.
+
+Usage:
+    python benchmarks/bench_logging.py [--records 20000] [--write-delay-us 50]
+
+Lines go to a stream whose writes sleep, standing in for a slow or
+back-pressured stdout. "sync" renders and writes on the calling thread as
+the event loop used to; "async" only enqueues, with the given queue policy.
+"""
+
+import argparse
+import time
+
+from quotes_api.utils import logger as log_module
+
+
+class SlowStream:
+    """Text stream whose writes take a fixed time."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def run(mode: str, policy: str, records: int, delay: float) -> None:
+    settings = log_module.settings
+    settings.log_async = mode == "async"
+    settings.log_queue_policy = policy
+    settings.log_queue_size = 10_000
+    log_module.setup_logging(stream=SlowStream(delay))
+    logger = log_module.get_logger("bench")
+
+    start = time.perf_counter()
+    for index in range(records):
+        log_module.log_request_response(
+            logger,
+            "GET",
+            "/api/v1/quotes/random",
+            status_code=200,
+            duration=0.0012,
+            user_agent="bench",
+            remote_addr="127.0.0.1",
+            n=index,
+        )
+    elapsed = time.perf_counter() - start
+    stats = log_module.get_log_stats()
+    log_module.stop_logging()
+    label = mode if mode == "sync" else f"{mode}/{policy}"
+    print(
+        f"{label:>11}: {elapsed / records * 1e6:7.1f} us/record on the caller"
+        f"  dropped={stats.get('dropped', 0)}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--write-delay-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    delay = args.write_delay_us / 1e6
+    print(f"{args.records} records, {args.write_delay_us:g} us per write")
+    run("sync", "drop", args.records, delay)
+    run("async", "drop", args.records, delay)
+    run("async", "block", args.records, delay)
+
+
+if __name__ == "__main__":
+    main()
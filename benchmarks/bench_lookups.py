@@ -0,0 +1,63 @@
+"""
+Benchmark the quote lookup endpoints as the corpus grows.
+
+Usage:
+    python benchmarks/bench_lookups.py [--sizes 10,1000,100000,1000000]
+
+By-id, by-category and by-author lookups should stay flat: the queried
+category and author always hold the same number of quotes.
+"""
+
+import argparse
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_quotes
+from quotes_api.main import app
+from quotes_api.services.quote_service import QuoteService
+
+ENDPOINTS = {
+    "by_id": "/api/v1/quotes/5",
+    "by_category": "/api/v1/quotes/category/Amour",
+    "by_author": "/api/v1/quotes/author/Victor%20Hugo",
+    "random": "/api/v1/quotes/random",
+}
+
+
+def bench(client: TestClient, path: str, iterations: int) -> float:
+    """Return the mean latency of a GET request in microseconds."""
+    client.get(path)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        response = client.get(path)
+        assert response.status_code == 200, response.text
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,1000,100000,1000000")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    client = TestClient(app)
+    print(
+        f"{'quotes':>10} {'build (s)':>10} "
+        + " ".join(f"{name:>12}" for name in ENDPOINTS)
+    )
+    for size in (int(value) for value in args.sizes.split(",")):
+        quotes = make_quotes(size)
+        start = time.perf_counter()
+        app.state.quote_service = QuoteService(quotes)
+        build = time.perf_counter() - start
+        timings = [bench(client, path, args.iterations) for path in ENDPOINTS.values()]
+        print(
+            f"{size:>10} {build:>10.3f} " + " ".join(f"{t:>10.1f}us" for t in timings)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure retained memory per stored quote.
+
+Usage:
+    python benchmarks/bench_memory.py [--size 200000]
+
+Quotes are parsed from JSON lines, as a real corpus would be loaded, so
+every string is a fresh object. "pydantic" keeps the validated Quote
+models, as the store did before QuoteRecord; "records" keeps compact
+records with interned key strings; "store" is a full QuoteStore (records
+plus the id and key indexes).
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.corpus import make_quotes
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_store import QuoteRecord, QuoteStore
+
+
+def retained(build, lines) -> int:
+    """Return the bytes still allocated after building a structure from lines."""
+    gc.collect()
+    tracemalloc.start()
+    structure = build(lines)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    args = parser.parse_args()
+
+    lines = [quote.model_dump_json() for quote in make_quotes(args.size)]
+    builders = {
+        "pydantic": lambda lines: {
+            quote.id: quote for quote in map(Quote.model_validate_json, lines)
+        },
+        "records": lambda lines: {
+            quote.id: QuoteRecord.from_quote(quote)
+            for quote in map(Quote.model_validate_json, lines)
+        },
+        "store": lambda lines: QuoteStore(map(Quote.model_validate_json, lines)),
+    }
+    print(f"{args.size} quotes")
+    for name, build in builders.items():
+        size = retained(build, lines)
+        print(
+            f"{name:>9}: {size / 2**20:8.1f} MiB  {size / args.size:7.0f} bytes/quote"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Compare requests per second through the old and new request timing middleware.
+
+Usage:
+    python benchmarks/bench_middleware.py [--requests 3000] [--concurrency 32]
+
+"before" is the former @app.middleware("http") function (BaseHTTPMiddleware,
+time.time()); "after" is RequestTimingMiddleware. Both wrap the same
+FastAPI app and log through the same pipeline (to a discarding stream).
+Requests are driven in-process over raw ASGI, so the numbers reflect the
+application stack without any network or server overhead. /stream sends
+50 chunks, which BaseHTTPMiddleware relays through its memory stream.
+"""
+
+import argparse
+import asyncio
+import io
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from quotes_api.api.middleware import RequestTimingMiddleware
+from quotes_api.utils import logger as log_module
+from quotes_api.utils.logger import get_logger, log_request_response
+
+logger = get_logger("bench")
+
+
+def make_app(kind: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ping": "pong"}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"x" * 512] * 50), media_type="text/plain")
+
+    if kind == "after":
+        app.add_middleware(RequestTimingMiddleware)
+    else:
+
+        @app.middleware("http")
+        async def log_requests(request: Request, call_next):
+            start_time = time.time()
+            response = await call_next(request)
+            process_time = time.time() - start_time
+            log_request_response(
+                logger=logger,
+                method=request.method,
+                path=request.url.path,
+                status_code=response.status_code,
+                duration=process_time,
+                user_agent=request.headers.get("user-agent"),
+                remote_addr=request.client.host if request.client else None,
+            )
+            response.headers["X-Process-Time"] = str(process_time)
+            return response
+
+    return app
+
+
+async def drive(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Send requests through the app and return requests per second."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"user-agent", b"bench")],
+        "client": ("127.0.0.1", 5000),
+        "server": ("testserver", 80),
+    }
+
+    async def worker(count: int):
+        for _ in range(count):
+            # Like uvicorn: the body arrives once, then receive() waits for
+            # the response to complete and reports a disconnect
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            complete = asyncio.Event()
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                await complete.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.body" and not message.get(
+                    "more_body"
+                ):
+                    complete.set()
+
+            await app(dict(scope), receive, send)
+
+    await worker(100)  # warm up routing and middleware stack
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return (requests // concurrency * concurrency) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    log_module.setup_logging(stream=io.StringIO())
+    for path in ("/ping", "/stream"):
+        results = {
+            kind: asyncio.run(
+                drive(make_app(kind), path, args.requests, args.concurrency)
+            )
+            for kind in ("before", "after")
+        }
+        print(
+            f"{path:>8}: before {results['before']:8.0f} req/s"
+            f"  after {results['after']:8.0f} req/s"
+            f"  ({results['after'] / results['before']:.2f}x)"
+        )
+    log_module.stop_logging()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measure the latency of cheap lookups while heavy operations run.
+
+Usage:
+    python benchmarks/bench_offload.py [--size 200000] [--searches 64]
+
+Runs --searches concurrent searches on one event loop while a lookup by id
+is issued every millisecond, first with every call inline, then through
+the dispatcher (searches in its pool, two at a time). A lookup's latency
+counts from the moment it was due: inline, it waits behind whole
+searches; dispatched, it only shares the CPU with them (the GIL).
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.corpus import make_quotes
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.dispatch import OperationDispatcher
+from quotes_api.services.quote_service import QuoteService
+
+
+async def run(quotes: AsyncQuoteService, searches: int):
+    """Return sorted lookup latencies, in microseconds, and the search time."""
+    latencies = []
+    done = asyncio.Event()
+
+    async def lookups():
+        n = 0
+        while not done.is_set():
+            due = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            await quotes.get_quote_by_id(n % 1000 + 1)
+            latencies.append(max(0.0, time.perf_counter() - due) * 1e6)
+            n += 1
+
+    async def search_all():
+        await asyncio.sleep(0.01)
+        await asyncio.gather(
+            *(quotes.search_quotes("vie amour", limit=20) for _ in range(searches))
+        )
+        done.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(lookups(), search_all())
+    return sorted(latencies), time.perf_counter() - start
+
+
+def summary(latencies, seconds: float) -> str:
+    p99 = latencies[int(len(latencies) * 0.99)]
+    return (
+        f"lookups p50 {statistics.median(latencies):8.1f}us  p99 {p99:9.1f}us  "
+        f"max {latencies[-1]:10.1f}us  ({len(latencies)} lookups in {seconds:.2f}s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--searches", type=int, default=64)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    service = QuoteService(quotes=make_quotes(args.size))
+    for label, heavy in (("inline    ", frozenset()), ("dispatched", None)):
+        dispatcher = (
+            OperationDispatcher() if heavy is None else OperationDispatcher(heavy=heavy)
+        )
+        try:
+            latencies, seconds = asyncio.run(
+                run(AsyncQuoteService(service, dispatcher), args.searches)
+            )
+            search = dispatcher.stats()["search"]
+        finally:
+            dispatcher.close()
+        print(
+            f"{label}  {summary(latencies, seconds)}"
+            f"  search avg {search['avg_ms']:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
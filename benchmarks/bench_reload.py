@@ -0,0 +1,78 @@
+"""
+Measure corpus hot reload: rebuild time and read latency during reloads.
+
+Usage:
+    python benchmarks/bench_reload.py [--size 100000] [--reads 20000]
+
+Writes a corpus of --size quotes to a temporary NDJSON file, then times
+reads of one page by id while a background thread keeps reloading the
+file. Reads never wait for a reload; their tail latency only reflects
+the CPU the rebuild takes from them (the GIL).
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.corpus import make_quotes
+from quotes_api.api.export import ndjson_chunks
+from quotes_api.services.corpus_reload import CorpusReloader, FileSource
+from quotes_api.services.quote_service import QuoteService
+
+
+def read_latencies(service: QuoteService, reads: int):
+    """Return sorted latencies, in microseconds, of page reads."""
+    latencies = []
+    for n in range(reads):
+        start = time.perf_counter()
+        service.get_all_quotes(after_id=n % 1000, limit=10)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return sorted(latencies)
+
+
+def summary(latencies) -> str:
+    p50, p99 = statistics.median(latencies), latencies[int(len(latencies) * 0.99)]
+    return f"p50 {p50:6.1f}us  p99 {p99:7.1f}us  max {latencies[-1]:9.1f}us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=20_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.ndjson")
+        with open(path, "wb") as target:
+            for chunk in ndjson_chunks([make_quotes(args.size)]):
+                target.write(chunk)
+
+        service = QuoteService(quotes=())
+        reloader = CorpusReloader(service, FileSource(path))
+        reloader.reload()
+        print(f"{args.size} quotes: reload in {reloader.last_duration_ms:.0f} ms")
+        print(f"idle            {summary(read_latencies(service, args.reads))}")
+
+        stop = threading.Event()
+
+        def reload_forever():
+            while not stop.is_set():
+                reloader.reload()
+
+        thread = threading.Thread(target=reload_forever)
+        thread.start()
+        try:
+            latencies = read_latencies(service, args.reads)
+        finally:
+            stop.set()
+            thread.join()
+        print(f"during reloads  {summary(latencies)}  ({reloader.reloads - 1} swaps)")
+
+
+if __name__ == "__main__":
+    main()
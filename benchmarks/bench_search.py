@@ -0,0 +1,79 @@
+"""
+Benchmark the full-text search index.
+
+Usage:
+    python benchmarks/bench_search.py [--size 500000] [--limit 20]
+
+Reports index build time and memory, then per-query latency of the
+inverted index against the former linear substring scan.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.corpus import make_quotes
+from quotes_api.services.search_index import SearchIndex
+
+QUERIES = [
+    "vie",
+    "cœur",
+    "succes",
+    "amour courage",
+    "lumi",
+    "victor hugo",
+    "introuvable",
+]
+
+
+def linear_scan(quotes, query):
+    """The search implementation the index replaced."""
+    query_lower = query.lower()
+    return [
+        quote
+        for quote in quotes
+        if query_lower in quote.text.lower()
+        or (quote.author and query_lower in quote.author.lower())
+        or (quote.category and query_lower in quote.category.lower())
+    ]
+
+
+def timed(func, iterations):
+    """Return the mean call time of func in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    quotes = make_quotes(args.size)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SearchIndex(quotes)
+    build = time.perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"corpus: {args.size} quotes")
+    print(
+        f"build: {build:.2f}s, {memory / 2**20:.1f} MiB, "
+        f"{index.term_count} terms, {index.posting_count} postings"
+    )
+    print(f"{'query':>16} {'hits':>8} {'index (top-k)':>14} {'linear scan':>14}")
+    for query in QUERIES:
+        hits = len(index.search(query))
+        indexed = timed(lambda: index.search(query, args.limit), args.iterations)
+        scan = timed(lambda: linear_scan(quotes, query), 1)
+        print(f"{query:>16} {hits:>8} {indexed:>12.1f}us {scan / 1000:>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Measure search scaling across shard processes.
+
+Usage:
+    python benchmarks/bench_sharded_search.py [--size 2000000] [--shards 1,2,4,8]
+                                              [--clients 8] [--queries 400]
+
+Builds an in-memory corpus of --size quotes, then, for the in-process
+index and for each shard count, times single queries and the throughput
+of --clients threads searching at once. One in-process search uses one
+core; sharded, a query keeps up to N cores busy and the queries of
+concurrent clients overlap on the shards. Expect speedups to stop at the
+number of physical cores.
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import threading
+import time
+
+from benchmarks.corpus import iter_quotes
+from quotes_api.services.sharded_search import SearchShards
+from quotes_api.services.storage import InMemoryBackend
+
+QUERIES = [
+    "vie",
+    "amour succès",
+    "cœur âme",
+    "lumi",
+    "temps rêve",
+    "sagesse vérité",
+    "être",
+]
+
+
+def latencies(search, queries: int):
+    """Return sorted latencies, in milliseconds, of sequential searches."""
+    results = []
+    for n in range(queries):
+        start = time.perf_counter()
+        search(QUERIES[n % len(QUERIES)], 20)
+        results.append((time.perf_counter() - start) * 1e3)
+    return sorted(results)
+
+
+def throughput(search, clients: int, queries: int) -> float:
+    """Return the searches per second of ``clients`` threads sharing ``queries``."""
+
+    def run(client: int) -> None:
+        for n in range(client, queries, clients):
+            search(QUERIES[n % len(QUERIES)], 20)
+
+    threads = [
+        threading.Thread(target=run, args=(client,)) for client in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return queries / (time.perf_counter() - start)
+
+
+def report(label: str, search, args) -> float:
+    search("vie", 20)  # warm up the ranked lists
+    sequential = latencies(search, args.queries)
+    rate = throughput(search, args.clients, args.queries)
+    print(
+        f"{label:12s} p50 {statistics.median(sequential):7.2f}ms  "
+        f"p99 {sequential[int(len(sequential) * 0.99)]:7.2f}ms  "
+        f"{args.clients} clients {rate:8.1f} searches/s"
+    )
+    return rate
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=2_000_000)
+    parser.add_argument(
+        "--shards",
+        default=",".join(str(n) for n in (1, 2, 4, 8, 16, 32) if n <= cores) or "1",
+    )
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=400)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    start = time.perf_counter()
+    backend = InMemoryBackend(iter_quotes(args.size))
+    elapsed = time.perf_counter() - start
+    print(f"{args.size} quotes indexed in {elapsed:.1f}s ({cores} cores)")
+    baseline = report("in-process", backend.search_index.search, args)
+
+    for count in (int(value) for value in args.shards.split(",")):
+        start = time.perf_counter()
+        shards = SearchShards(backend, count)
+        built = time.perf_counter() - start
+        try:
+            rate = report(f"{count} shards", shards.search, args)
+        finally:
+            shards.close()
+        print(f"{'':12s} built in {built:.1f}s, throughput x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
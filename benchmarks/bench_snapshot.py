@@ -0,0 +1,97 @@
+"""
+Compare cold start and resident memory of the in-memory and snapshot backends.
+
+Usage:
+    python benchmarks/bench_snapshot.py [--sizes 10000,100000,1000000]
+
+Each measurement runs in a fresh interpreter. "memory" builds the indexed
+store from a generated corpus; "snapshot" maps a file built beforehand.
+Both then serve the same few thousand lookups. RSS growth of a snapshot
+worker is made of file pages shared with every other worker mapping it.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import psutil
+
+from benchmarks.corpus import make_quotes
+from quotes_api.services.storage import InMemoryBackend, SnapshotBackend, build_snapshot
+
+
+def exercise(backend) -> None:
+    """Serve a few thousand lookups, as a warm worker would."""
+    for quote_id in range(1, 2000):
+        backend.get(quote_id)
+    backend.by_category("Amour", limit=100)
+    backend.by_author("Victor Hugo", limit=100)
+    backend.page(after=1000, limit=100)
+
+
+def measure(mode: str, size: int, path: str) -> None:
+    """Print start-up seconds and RSS growth in MiB for one backend."""
+    process = psutil.Process()
+    if mode == "memory":
+        quotes = make_quotes(size)
+        gc.collect()
+        before = process.memory_info().rss
+        start = time.perf_counter()
+        backend = InMemoryBackend(quotes)
+        del quotes
+    else:
+        before = process.memory_info().rss
+        start = time.perf_counter()
+        backend = SnapshotBackend(path)
+    elapsed = time.perf_counter() - start
+    exercise(backend)
+    gc.collect()
+    print(f"{elapsed:.4f} {(process.memory_info().rss - before) / 2**20:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--measure", nargs=3, metavar=("MODE", "SIZE", "PATH"))
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    if args.measure:
+        mode, size, path = args.measure
+        measure(mode, int(size), path)
+        return
+
+    print(
+        f"{'quotes':>10} {'file MiB':>9} {'build (s)':>10} "
+        f"{'memory start':>13} {'memory RSS':>11} {'snap start':>11} {'snap RSS':>9}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(value) for value in args.sizes.split(",")):
+            path = os.path.join(directory, f"{size}.snap")
+            start = time.perf_counter()
+            build_snapshot(make_quotes(size), path)
+            build = time.perf_counter() - start
+            results = []
+            for mode in ("memory", "snapshot"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", mode, str(size), path],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout.split()
+                results.append((float(output[0]), float(output[1])))
+            (memory_start, memory_rss), (snap_start, snap_rss) = results
+            print(
+                f"{size:>10} {os.path.getsize(path) / 2**20:>9.1f} {build:>10.2f} "
+                f"{memory_start:>12.3f}s {memory_rss:>8.1f}MiB "
+                f"{snap_start * 1000:>9.2f}ms {snap_rss:>6.1f}MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare per-worker memory with and without a corpus preloaded before fork.
+
+Usage:
+    python benchmarks/bench_worker_rss.py [--size 200000] [--workers 4]
+
+Mimics a pre-forking server: in "per-worker" mode every forked worker
+builds its own QuoteService; in "preload" mode the master builds it (as
+gunicorn --preload does with PRELOAD_CORPUS=true) and workers inherit it
+copy-on-write. RSS counts shared pages in every worker, USS only the
+pages private to it, and PSS splits shared pages between their users.
+"""
+
+import argparse
+import gc
+import os
+import sys
+
+import psutil
+
+from benchmarks.corpus import make_quotes
+from quotes_api.services.quote_service import QuoteService
+
+
+def exercise(service: QuoteService) -> None:
+    """Serve a few requests' worth of reads, as a warm worker would."""
+    for quote_id in range(1, 1000):
+        service.get_quote_by_id(quote_id)
+    service.get_quotes_by_category("Amour")
+    service.search_quotes("vie", limit=20)
+
+
+def run(size: int, workers: int, preload: bool):
+    """Fork workers and return (rss, uss, pss) of each in MiB."""
+    quotes = make_quotes(size)
+    service = None
+    if preload:
+        service = QuoteService(quotes)
+        del quotes
+        gc.collect()
+        gc.freeze()
+
+    sync_read, sync_write = os.pipe()
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        if os.fork() == 0:
+            os.close(read_fd)
+            worker_service = service or QuoteService(quotes)
+            exercise(worker_service)
+            # Wait for siblings so shared pages are counted while all are alive.
+            os.read(sync_read, 1)
+            info = psutil.Process().memory_full_info()
+            os.write(write_fd, f"{info.rss} {info.uss} {info.pss}".encode())
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append(read_fd)
+
+    os.write(sync_write, b"x" * workers)
+    results = []
+    for read_fd in pipes:
+        results.append([int(v) / 2**20 for v in os.read(read_fd, 100).split()])
+        os.close(read_fd)
+        os.wait()
+    gc.unfreeze()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["per-worker", "preload"])
+    args = parser.parse_args()
+
+    if args.mode is None:
+        # Run each mode in a fresh interpreter so they do not share a heap.
+        for mode in ("per-worker", "preload"):
+            os.spawnv(
+                os.P_WAIT, sys.executable, [sys.executable, *sys.argv, "--mode", mode]
+            )
+        return
+
+    results = run(args.size, args.workers, args.mode == "preload")
+    print(f"{args.mode}: {args.size} quotes, {args.workers} workers")
+    for number, (rss, uss, pss) in enumerate(results, 1):
+        print(
+            f"  worker {number}: rss {rss:8.1f} MiB  uss {uss:8.1f} MiB"
+            f"  pss {pss:8.1f} MiB"
+        )
+    print(f"  total pss {sum(r[2] for r in results):.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Measure copy-on-write writes: write throughput and read latency under writes.
+
+Usage:
+    python benchmarks/bench_writes.py [--size 100000] [--writers 1,4,16]
+                                      [--writes 200] [--reads 20000]
+
+Every published write copies the id and term maps of the in-memory corpus,
+so a single write costs O(corpus). Writers running concurrently share one
+copy per batch (group commit): throughput grows with the number of
+writers. Reads never wait for the writer; their tail latency only reflects
+the CPU the copies take from them (the GIL).
+"""
+
+import argparse
+import logging
+import statistics
+import threading
+import time
+
+from benchmarks.corpus import make_quotes
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService
+
+
+def write_throughput(service: QuoteService, writers: int, writes: int) -> float:
+    """Return the writes per second of ``writers`` threads adding ``writes`` each."""
+
+    def run(worker: int) -> None:
+        for n in range(writes):
+            service.add_quote(
+                Quote(text=f"Citation {worker}-{n}", author="Bench", category="Bench")
+            )
+
+    threads = [
+        threading.Thread(target=run, args=(worker,)) for worker in range(writers)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return writers * writes / (time.perf_counter() - start)
+
+
+def read_latencies(service: QuoteService, reads: int):
+    """Return sorted latencies, in microseconds, of page reads."""
+    latencies = []
+    for n in range(reads):
+        start = time.perf_counter()
+        service.get_all_quotes(after_id=n % 1000, limit=10)
+        latencies.append((time.perf_counter() - start) * 1e6)
+    return sorted(latencies)
+
+
+def summary(latencies) -> str:
+    p50, p99 = statistics.median(latencies), latencies[int(len(latencies) * 0.99)]
+    return f"p50 {p50:6.1f}us  p99 {p99:7.1f}us  max {latencies[-1]:9.1f}us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--writers", default="1,4,16")
+    parser.add_argument("--writes", type=int, default=200, help="writes per writer")
+    parser.add_argument("--reads", type=int, default=20_000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    service = QuoteService(quotes=make_quotes(args.size))
+    for writers in (int(value) for value in args.writers.split(",")):
+        rate = write_throughput(service, writers, args.writes)
+        print(f"{writers:3d} writers: {rate:8,.0f} writes/s")
+
+    print(f"idle           {summary(read_latencies(service, args.reads))}")
+    stop = threading.Event()
+    writes = 0
+
+    def write_forever():
+        nonlocal writes
+        while not stop.is_set():
+            service.add_quote(Quote(text=f"Citation {writes}", author="Bench"))
+            writes += 1
+
+    thread = threading.Thread(target=write_forever)
+    thread.start()
+    try:
+        latencies = read_latencies(service, args.reads)
+    finally:
+        stop.set()
+        thread.join()
+    print(f"during writes  {summary(latencies)}  ({writes} writes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Synthetic corpus generator shared by the benchmarks.
+"""
+
+import random
+from typing import Iterator, List
+
+from quotes_api.models.quote import Quote
+
+WORDS = (
+    "vie amour succès bonheur travail rêve sagesse liberté homme femme temps "
+    "cœur âme monde raison vérité beauté courage espoir être faire savoir "
+    "créer aimer penser vivre mourir rire lumière ombre chemin élève œuvre"
+).split()
+
+SUFFIXES = ("", "s", "é", "ée", "ment", "ité", "eur", "ère", "ance", "ion")
+
+# Zipf-distributed vocabulary of a few thousand forms, most common first.
+VOCABULARY = [word + suffix for suffix in SUFFIXES for word in WORDS] + [
+    f"{word}{n}" for n in range(1, 100) for word in WORDS
+]
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+# The first quotes always land in the same category and author so that
+# lookups benchmarked across corpus sizes return a constant number of rows.
+FIXED_KEY_ROWS = 10
+
+
+def iter_quotes(count: int, seed: int = 42) -> Iterator[Quote]:
+    """
+    Generate a deterministic synthetic corpus lazily.
+
+    Args:
+        count: Number of quotes to generate
+        seed: Random seed
+
+    Returns:
+        An iterator over quotes with ids 1..count
+    """
+    rng = random.Random(seed)
+    author_count = max(1, count // 20)
+    for quote_id in range(1, count + 1):
+        if quote_id <= FIXED_KEY_ROWS:
+            author, category = "Victor Hugo", "Amour"
+        else:
+            author = f"Auteur {quote_id % author_count}"
+            category = f"Catégorie {quote_id % 50}"
+        yield Quote(
+            id=quote_id,
+            text=" ".join(
+                rng.choices(VOCABULARY, WEIGHTS, k=rng.randint(6, 18))
+            ).capitalize()
+            + ".",
+            author=author,
+            category=category,
+            language="fr" if quote_id % 5 else "en",
+        )
+
+
+def make_quotes(count: int, seed: int = 42) -> List[Quote]:
+    """
+    Build a deterministic synthetic corpus.
+
+    Args:
+        count: Number of quotes to generate
+        seed: Random seed
+
+    Returns:
+        Quotes with ids 1..count
+    """
+    return list(iter_quotes(count, seed))
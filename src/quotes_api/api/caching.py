@@ -0,0 +1,112 @@
+"""
+Helpers serving read-only endpoints from the response cache.
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from quotes_api.api.compression import compress, negotiate_encoding, should_compress
+from quotes_api.api.responses import encode_json
+from quotes_api.config import settings
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.response_cache import ResponseCache
+
+
+def make_etag(quote_service: QuoteService, key: Hashable) -> str:
+    """
+    Build a strong ETag for a response.
+
+    It hashes the corpus fingerprint, the application version and the
+    response key, so every worker serving the same corpus agrees on it.
+    """
+    seed = f"{settings.app_version}|{quote_service.fingerprint:016x}|{key!r}"
+    return '"' + hashlib.blake2b(seed.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _validators(quote_service: QuoteService, key: Hashable) -> Tuple[str, int]:
+    return make_etag(quote_service, key), quote_service.version
+
+
+async def cached_json_response(
+    request: Request,
+    cache: ResponseCache,
+    quotes: AsyncQuoteService,
+    operation: str,
+    key: Hashable,
+    render: Callable[[], Any],
+    max_age: int,
+) -> Response:
+    """
+    Return a JSON response with validators, rendering it only when needed.
+
+    A request whose If-None-Match carries the current ETag gets a bodiless
+    304 without touching the cache or the serializer. Otherwise the encoded
+    body comes from the response cache, and is rendered on a miss, as
+    ``operation``: inline, or in the pool for a heavy operation (see
+    AsyncQuoteService).
+
+    When the client accepts gzip or br and the body reaches the minimum
+    size, the compressed variant is served from the cache too: it is
+    computed once per corpus version. Each negotiated coding has its own
+    ETag, as the bytes differ.
+
+    Args:
+        request: Incoming request
+        cache: Response cache
+        quotes: Service whose corpus the response depends on
+        operation: Operation name under which the body is rendered
+        key: Route and parameters identifying the response
+        render: Builds the response content, or its encoded bytes; may
+            raise HTTPException, in which case nothing is cached
+        max_age: Cache-Control max-age in seconds
+
+    Returns:
+        304 or 200 response carrying ETag and Cache-Control headers
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    # The validators and the body must describe the same corpus version,
+    # even when a write is published in between.
+    quote_service = quotes.service
+    with quote_service.pinned():
+        etag, version = await quote_service.run(
+            _validators, quote_service, key if encoding is None else (key, encoding)
+        )
+        headers: Dict[str, str] = {
+            "ETag": etag,
+            "Cache-Control": f"public, max-age={max_age}",
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        body = cache.get(key, version)
+        if body is None:
+            body = await quotes.run(operation, lambda: encode_json(render()))
+            cache.put(key, version, body)
+        if encoding is not None and should_compress(body):
+            variant = cache.get_variant(key, version, encoding)
+            if variant is None:
+                variant = await run_in_threadpool(compress, body, encoding)
+                cache.put_variant(key, version, encoding, variant)
+            body = variant
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
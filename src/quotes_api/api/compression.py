@@ -0,0 +1,111 @@
+"""
+Content-Encoding negotiation and compression of JSON responses.
+
+gzip is always available; brotli ("br") is offered when the brotli
+package is installed. Bodies smaller than COMPRESSION_MIN_SIZE are sent
+as they are: below a packet or so, compression only costs CPU.
+"""
+
+import gzip
+from typing import Dict, Optional, Tuple, cast
+
+from fastapi import Request, Response
+
+from quotes_api.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+#: Supported codings, in server preference order.
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], available: Tuple[str, ...] = ENCODINGS
+) -> Optional[str]:
+    """
+    Pick the content coding of a response from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Request header value
+        available: Supported codings, preferred first
+
+    Returns:
+        The coding with the highest q-value, ties going to the server
+        preference, or None to send the body as it is
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best: Optional[str] = None
+    best_weight = 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with a content coding.
+
+    gzip output carries no timestamp, so every worker produces the same
+    bytes for the same body.
+
+    Args:
+        body: Uncompressed body
+        encoding: "gzip" or "br"
+
+    Returns:
+        Compressed body
+    """
+    if encoding == "br":
+        return cast(
+            bytes, brotli.compress(body, quality=settings.compression_brotli_quality)
+        )
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level, mtime=0)
+
+
+def should_compress(body: bytes) -> bool:
+    """Whether a body is large enough to be worth compressing."""
+    return len(body) >= settings.compression_min_size
+
+
+def json_response(
+    request: Request, body: bytes, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Build a JSON response, compressing it on the fly when negotiated.
+
+    For bodies that are not cached; cached bodies keep their compressed
+    variants in the response cache instead.
+
+    Args:
+        request: Incoming request
+        body: Encoded JSON body
+        headers: Extra response headers
+
+    Returns:
+        Response with Content-Encoding and Vary set as appropriate
+    """
+    headers = dict(headers or {})
+    headers["Vary"] = "Accept-Encoding"
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is not None and should_compress(body):
+        body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
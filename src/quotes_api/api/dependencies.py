@@ -0,0 +1,125 @@
+"""
+Shared FastAPI dependencies.
+"""
+
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request
+
+from quotes_api.config import settings
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.corpus_reload import CorpusReloader
+from quotes_api.services.dispatch import OperationDispatcher
+from quotes_api.services.metrics import MetricsRegistry
+from quotes_api.services.quote_service import QuoteService, create_quote_service
+from quotes_api.services.response_cache import ResponseCache
+from quotes_api.services.system_sampler import SystemSampler
+
+
+async def get_quote_service(request: Request) -> QuoteService:
+    """
+    Return the process-wide quote service.
+
+    The service is created once by the application lifespan. Apps driven
+    without their lifespan (e.g. a bare TestClient) get one lazily.
+    """
+    state = request.app.state
+    service = getattr(state, "quote_service", None)
+    if service is None:
+        service = state.quote_service = create_quote_service()
+    return service
+
+
+def create_dispatcher() -> OperationDispatcher:
+    """Build the dispatcher of heavy operations from the settings."""
+    return OperationDispatcher(
+        max_workers=settings.offload_workers,
+        max_concurrency=settings.offload_max_concurrency,
+        limits=settings.offload_limits,
+    )
+
+
+async def get_dispatcher(request: Request) -> OperationDispatcher:
+    """Return the process-wide dispatcher of heavy operations."""
+    state = request.app.state
+    dispatcher = getattr(state, "dispatcher", None)
+    if dispatcher is None:
+        dispatcher = state.dispatcher = create_dispatcher()
+    return dispatcher
+
+
+async def get_async_quote_service(request: Request) -> AsyncQuoteService:
+    """Return the async facade of the process-wide quote service."""
+    return AsyncQuoteService(
+        await get_quote_service(request), await get_dispatcher(request)
+    )
+
+
+async def get_corpus_reloader(request: Request) -> Optional[CorpusReloader]:
+    """Return the corpus reloader installed by the lifespan, if any."""
+    return getattr(request.app.state, "corpus_reloader", None)
+
+
+async def get_system_sampler(request: Request) -> SystemSampler:
+    """
+    Return the process-wide system sampler.
+
+    The lifespan hook starts it; without the lifespan an idle sampler is
+    created and samples on demand.
+    """
+    state = request.app.state
+    sampler = getattr(state, "system_sampler", None)
+    if sampler is None:
+        sampler = state.system_sampler = SystemSampler(
+            interval=settings.health_sample_interval,
+            history_size=settings.health_history_size,
+        )
+    return sampler
+
+
+async def get_response_cache(request: Request) -> ResponseCache:
+    """Return the process-wide cache of encoded responses."""
+    state = request.app.state
+    cache = getattr(state, "response_cache", None)
+    if cache is None:
+        cache = state.response_cache = ResponseCache(
+            max_entries=settings.response_cache_max_entries,
+            max_bytes=settings.response_cache_max_bytes,
+        )
+    return cache
+
+
+async def get_metrics(request: Request) -> MetricsRegistry:
+    """
+    Return the process-wide metrics registry.
+
+    The application creates it with the timing middleware that feeds it;
+    apps without that middleware get an empty one.
+    """
+    state = request.app.state
+    metrics = getattr(state, "metrics", None)
+    if metrics is None:
+        metrics = state.metrics = MetricsRegistry()
+    return metrics
+
+
+async def require_admin(authorization: Optional[str] = Header(None)) -> None:
+    """
+    Guard admin endpoints with the ``admin_token`` bearer token.
+
+    Raises:
+        HTTPException: 403 while no token is configured, 401 on a missing
+            or wrong token
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode("utf-8"), settings.admin_token.encode("utf-8")
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
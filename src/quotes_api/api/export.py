@@ -0,0 +1,61 @@
+"""
+Streaming encoders for corpus exports.
+"""
+
+import csv
+import io
+import zlib
+from typing import Iterable, Iterator, List
+
+from quotes_api.models.quote import Quote
+
+CSV_COLUMNS = [
+    "id",
+    "text",
+    "author",
+    "category",
+    "language",
+    "created_at",
+    "updated_at",
+]
+
+
+def ndjson_chunks(batches: Iterable[List[Quote]]) -> Iterator[bytes]:
+    """Encode batches of quotes as newline-delimited JSON, one chunk per batch."""
+    to_json = Quote.__pydantic_serializer__.to_json
+    for batch in batches:
+        yield b"".join(to_json(quote) + b"\n" for quote in batch)
+
+
+def csv_chunks(batches: Iterable[List[Quote]]) -> Iterator[bytes]:
+    """Encode batches of quotes as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    yield buffer.getvalue().encode("utf-8")
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [
+                quote.id,
+                quote.text,
+                quote.author or "",
+                quote.category or "",
+                quote.language,
+                quote.created_at.isoformat() if quote.created_at else "",
+                quote.updated_at.isoformat() if quote.updated_at else "",
+            ]
+            for quote in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a chunk stream into a single gzip member on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,87 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from quotes_api.api.dependencies import (
+    get_async_quote_service,
+    get_metrics,
+    get_response_cache,
+)
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.metrics import MetricsRegistry
+from quotes_api.services.response_cache import ResponseCache
+
+router = APIRouter(tags=["metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def process_snapshot(
+    metrics: MetricsRegistry, cache: ResponseCache, quotes: AsyncQuoteService
+) -> Dict[str, Any]:
+    """
+    Capture this process's request, cache, index and operation metrics.
+
+    Args:
+        metrics: Request metrics registry
+        cache: Response cache
+        quotes: Quote service facade
+
+    Returns:
+        Snapshot as built by MetricsRegistry.snapshot
+    """
+    cache_stats = cache.stats()
+    index_sizes = await quotes.get_index_sizes()
+    operations = quotes.dispatcher.stats()
+
+    def per_operation(field: str, scale: float = 1.0) -> Dict[str, float]:
+        return {name: stats[field] * scale for name, stats in operations.items()}
+
+    return metrics.snapshot(
+        counters={
+            "quotes_api_response_cache_hits_total": {"": cache_stats["hits"]},
+            "quotes_api_response_cache_misses_total": {"": cache_stats["misses"]},
+            "quotes_api_response_cache_evictions_total": {"": cache_stats["evictions"]},
+            "quotes_api_response_cache_variant_hits_total": {
+                encoding: counts["hits"]
+                for encoding, counts in cache_stats["variants"].items()
+            },
+            "quotes_api_response_cache_variant_misses_total": {
+                encoding: counts["misses"]
+                for encoding, counts in cache_stats["variants"].items()
+            },
+            "quotes_api_operation_calls_total": per_operation("calls"),
+            "quotes_api_operation_errors_total": per_operation("errors"),
+            "quotes_api_operation_seconds_total": per_operation("total_ms", 1e-3),
+            "quotes_api_operation_wait_seconds_total": per_operation("wait_ms", 1e-3),
+        },
+        gauges={
+            "quotes_api_response_cache_entries": {"": cache_stats["entries"]},
+            "quotes_api_response_cache_bytes": {"": cache_stats["bytes"]},
+            "quotes_api_index_size": dict(index_sizes),
+            "quotes_api_operation_in_flight": per_operation("in_flight"),
+            "quotes_api_operation_waiting": per_operation("waiting"),
+        },
+    )
+
+
+@router.get("/metrics", summary="Prometheus metrics", response_class=PlainTextResponse)
+async def metrics_endpoint(
+    metrics: MetricsRegistry = Depends(get_metrics),
+    cache: ResponseCache = Depends(get_response_cache),
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+) -> PlainTextResponse:
+    """
+    Expose metrics in the Prometheus text format.
+
+    With METRICS_DIR set, the figures cover every worker process.
+    """
+    snapshot = await process_snapshot(metrics, cache, quotes)
+    return PlainTextResponse(
+        metrics.render(metrics.collect(snapshot)), media_type=CONTENT_TYPE
+    )
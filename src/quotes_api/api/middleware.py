@@ -0,0 +1,105 @@
+"""
+ASGI middleware.
+"""
+
+import time
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from quotes_api.services.metrics import MetricsRegistry
+from quotes_api.utils.logger import get_logger, log_request_response
+
+logger = get_logger(__name__)
+
+
+class RequestTimingMiddleware:
+    """
+    Time and log every HTTP request.
+
+    A plain ASGI middleware rather than @app.middleware("http"): messages
+    are forwarded as they come, so there is no extra task or memory stream
+    per request and streamed bodies reach the client chunk by chunk. The
+    X-Process-Time header holds the seconds until the response started; the
+    logged duration also covers sending the body.
+
+    When given a MetricsRegistry, requests are also recorded there, under
+    the path template of the matched route.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: Optional[MetricsRegistry] = None):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            metrics: Registry recording request metrics, if enabled
+        """
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        start = time.perf_counter_ns()
+        status_code: Optional[int] = None
+        size = 0
+        if metrics is not None:
+            metrics.request_started(scope["method"])
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code, size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = (time.perf_counter_ns() - start) / 1e9
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", ()),
+                        (b"x-process-time", str(elapsed).encode("latin-1")),
+                    ],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        except Exception:
+            # The server error handler outside this middleware answers 500
+            status_code = status_code or 500
+            raise
+        finally:
+            duration = (time.perf_counter_ns() - start) / 1e9
+            if metrics is not None:
+                route = scope.get("route")
+                if route is not None:
+                    template = route.path
+                else:
+                    # Plain Starlette routes (docs) have static paths
+                    template = scope["path"] if "endpoint" in scope else "unmatched"
+                metrics.request_finished(
+                    scope["method"],
+                    template,
+                    status_code or 0,
+                    duration,
+                    size,
+                )
+            user_agent = None
+            for name, value in scope["headers"]:
+                if name == b"user-agent":
+                    user_agent = value.decode("latin-1")
+                    break
+            client = scope.get("client")
+            log_request_response(
+                logger=logger,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration=duration,
+                user_agent=user_agent,
+                remote_addr=client[0] if client else None,
+            )
@@ -0,0 +1,113 @@
+"""
+Cursor pagination and field projection for list endpoints.
+"""
+
+import base64
+import binascii
+from typing import AbstractSet, Callable, FrozenSet, List, Optional, cast
+
+from pydantic import TypeAdapter
+
+from quotes_api.models.quote import NameMatch, Quote, QuoteListResponse
+from quotes_api.utils.exceptions import ValidationError
+
+QUOTE_FIELDS: FrozenSet[str] = frozenset(Quote.model_fields)
+
+_list_response = TypeAdapter(QuoteListResponse)
+
+
+def encode_cursor(position: int) -> str:
+    """Encode a resume position (last id, or offset for ranked results)."""
+    return (
+        base64.urlsafe_b64encode(str(position).encode("ascii"))
+        .decode("ascii")
+        .rstrip("=")
+    )
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = int(base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii"))
+    except (ValueError, UnicodeError, binascii.Error):
+        raise ValidationError("Invalid cursor", field="cursor", value=cursor)
+    if position < 0:
+        raise ValidationError("Invalid cursor", field="cursor", value=cursor)
+    return position
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parse a comma-separated field projection such as "id,text".
+
+    Returns:
+        The selected fields, or None to return every field
+
+    Raises:
+        ValidationError: If a field does not exist on quotes
+    """
+    if not fields:
+        return None
+    selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = selected - QUOTE_FIELDS
+    if unknown:
+        raise ValidationError(
+            f"Unknown quote fields: {', '.join(sorted(unknown))}",
+            field="fields",
+            value=fields,
+        )
+    return selected or None
+
+
+def render_page(
+    quotes: List[Quote],
+    limit: int,
+    next_position: Callable[[List[Quote]], int],
+    message: str,
+    fields: Optional[AbstractSet[str]] = None,
+    total: Optional[int] = None,
+    matches: Optional[List[NameMatch]] = None,
+) -> bytes:
+    """
+    Encode one page of a quote list.
+
+    Args:
+        quotes: Up to limit + 1 quotes; the extra one only signals a next page
+        limit: Page size
+        next_position: Maps the page to the position the next page resumes at
+        message: Response message
+        fields: Quote fields to keep, or None for all
+        total: Number of matching quotes, when known
+        matches: Near matches the page was resolved from, if any
+
+    Returns:
+        Encoded QuoteListResponse
+    """
+    page = quotes[:limit]
+    next_cursor = encode_cursor(next_position(page)) if len(quotes) > limit else None
+    response = QuoteListResponse(
+        data=page,
+        count=len(page),
+        message=message,
+        total=total,
+        next_cursor=next_cursor,
+        matches=matches,
+    )
+    exclude = None
+    if fields is not None:
+        exclude = {"data": {"__all__": set(QUOTE_FIELDS - fields)}}
+    return _list_response.dump_json(response, exclude=exclude)
+
+
+def after_last_id(page: List[Quote]) -> int:
+    """Resume position of id-ordered lists: the last id served."""
+    # Served quotes are stored ones: their id is always set.
+    return cast(int, page[-1].id)
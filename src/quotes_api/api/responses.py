@@ -0,0 +1,63 @@
+"""
+JSON encoding for API responses.
+
+orjson is used when installed; otherwise the standard library encoder
+produces the same compact UTF-8 output. Pydantic models are serialized
+straight to bytes by their compiled serializer, never through a dict.
+"""
+
+import json
+from types import ModuleType
+from typing import Any, Optional, cast
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode plain content (dicts, lists, scalars) as compact JSON.
+
+    Values neither encoder handles natively, such as models nested in a
+    dict, fall back to FastAPI's jsonable_encoder.
+    """
+    if orjson is not None:
+        encoded = orjson.dumps(
+            content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS
+        )
+        return cast(bytes, encoded)
+    return json.dumps(
+        content,
+        default=jsonable_encoder,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def encode_json(content: Any) -> bytes:
+    """Encode already-encoded bytes, a Pydantic model or plain content."""
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class of the application.
+
+    Accepts a Pydantic model as content: routes returning
+    ``FastJSONResponse(model)`` skip FastAPI's dict round trip.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
@@ -5,6 +5,7 @@ API v1 routes.
 from .quotes import router as quotes_router
 from .health import router as health_router
 from .meta import router as meta_router
+from .admin import router as admin_router
 
 # Create main v1 router
 from fastapi import APIRouter
@@ -15,5 +16,6 @@ router = APIRouter(tags=["v1"])
 router.include_router(quotes_router, tags=["quotes"])
 router.include_router(health_router, tags=["health"])
 router.include_router(meta_router, tags=["meta"])
+router.include_router(admin_router, tags=["admin"])
 
-__all__ = ["router", "quotes_router", "health_router", "meta_router"]
\ No newline at end of file
+__all__ = ["router", "quotes_router", "health_router", "meta_router", "admin_router"]
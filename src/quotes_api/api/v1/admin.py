@@ -0,0 +1,59 @@
+"""
+Administration endpoints, guarded by the admin token.
+"""
+
+import tempfile
+from typing import Any, Dict, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from quotes_api.api.dependencies import get_async_quote_service, require_admin
+from quotes_api.config import settings
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.bulk_import import BulkImporter
+
+router = APIRouter(
+    prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.post("/import", summary="Bulk import quotes")
+async def import_quotes(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query(
+        "ndjson", description="Format of the request body"
+    ),
+    replace: bool = Query(
+        False, description="Replace the corpus instead of appending to it"
+    ),
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+) -> Dict[str, Any]:
+    """
+    Import an NDJSON or CSV file sent as the raw request body.
+
+    The upload is spooled to a temporary file (in memory up to
+    IMPORT_SPOOL_SIZE bytes), then parsed and loaded off the event loop.
+    The new corpus is served only once fully loaded.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=settings.import_spool_size) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.import_max_bytes:
+                raise HTTPException(status_code=413, detail="Import file too large")
+            spool.write(chunk)
+        spool.seek(0)
+
+        importer = BulkImporter(
+            quotes.service,
+            chunk_size=settings.import_chunk_size,
+            replace=replace,
+            max_errors=settings.import_max_errors,
+        )
+        report = await quotes.run("import", importer.run, spool, format)
+
+    return {
+        "success": True,
+        "data": report.to_dict(),
+        "message": f"Imported {report.imported} quotes",
+    }
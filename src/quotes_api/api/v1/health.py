@@ -3,11 +3,24 @@ Health check and monitoring endpoints.
 """
 
 import time
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from quotes_api.api.dependencies import (
+    get_corpus_reloader,
+    get_dispatcher,
+    get_quote_service,
+    get_response_cache,
+    get_system_sampler,
+)
 from quotes_api.config import settings
+from quotes_api.services.corpus_reload import CorpusReloader
+from quotes_api.services.dispatch import OperationDispatcher
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.response_cache import ResponseCache
+from quotes_api.services.system_sampler import SystemSampler
+from quotes_api.utils.logger import get_log_stats
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -30,15 +43,26 @@ async def health_check() -> Dict[str, Any]:
 
 
 @router.get("/detailed", summary="Detailed health check")
-async def detailed_health_check() -> Dict[str, Any]:
+async def detailed_health_check(
+    sampler: SystemSampler = Depends(get_system_sampler),
+    cache: ResponseCache = Depends(get_response_cache),
+    quote_service: QuoteService = Depends(get_quote_service),
+    reloader: Optional[CorpusReloader] = Depends(get_corpus_reloader),
+    dispatcher: OperationDispatcher = Depends(get_dispatcher),
+) -> Dict[str, Any]:
     """
     Detailed health check with system information.
 
-    Returns comprehensive health information including system resources.
+    Returns comprehensive health information including system resources,
+    read from the background sampler so the probe never blocks, the
+    served corpus version with its hot-reload and sharded search status,
+    and the timings of the service operations.
     """
-    import sys
-    import platform
-    from psutil import virtual_memory, cpu_percent
+    latest = sampler.latest()
+    backend = quote_service.backend  # one snapshot for both values
+    version, quotes = await quote_service.run(
+        lambda: (backend.version, backend.count())
+    )
 
     return {
         "status": "healthy",
@@ -47,20 +71,41 @@ async def detailed_health_check() -> Dict[str, Any]:
         "version": settings.app_version,
         "environment": settings.environment,
         "system": {
-            "platform": platform.platform(),
-            "python_version": sys.version,
-            "cpu_percent": cpu_percent(interval=1),
-            "memory": {
-                "total": virtual_memory().total,
-                "available": virtual_memory().available,
-                "percent": virtual_memory().percent
-            }
+            **sampler.platform,
+            "cpu_percent": latest.get("cpu_percent"),
+            "memory": latest.get("memory"),
+            "event_loop_lag_ms": latest.get("event_loop_lag_ms"),
+            "process": latest.get("process"),
+            "sampled_at": latest["timestamp"],
         },
+        "history": {
+            "interval": sampler.interval,
+            "running": sampler.running,
+            "samples": sampler.history(),
+        },
+        "corpus": {
+            "version": version,
+            "quotes": quotes,
+            "reload": reloader.stats() if reloader is not None else None,
+            "search_shards": (
+                quote_service.sharded_search.stats()
+                if quote_service.sharded_search is not None
+                else None
+            ),
+        },
+        "operations": {
+            "workers": dispatcher.max_workers,
+            "max_concurrency": dispatcher.max_concurrency,
+            "limits": dispatcher.limits,
+            "stats": dispatcher.stats(),
+        },
+        "response_cache": cache.stats(),
+        "logging": get_log_stats(),
         "features": {
             "metrics_enabled": settings.enable_metrics,
             "docs_enabled": settings.enable_docs,
-            "health_check_enabled": settings.enable_health_check
-        }
+            "health_check_enabled": settings.enable_health_check,
+        },
     }
 
 
@@ -69,4 +114,4 @@ async def ping() -> Dict[str, str]:
     """
     Simple ping endpoint for basic connectivity testing.
     """
-    return {"ping": "pong"}
\ No newline at end of file
+    return {"ping": "pong"}
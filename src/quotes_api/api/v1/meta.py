@@ -2,72 +2,104 @@
 Metadata and informational endpoints.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Request
 
+from quotes_api.api.caching import cached_json_response
+from quotes_api.api.dependencies import get_async_quote_service, get_response_cache
 from quotes_api.config import settings
-from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.response_cache import ResponseCache
 
 router = APIRouter(prefix="/meta", tags=["metadata"])
-quote_service = QuoteService()
 
 
 @router.get("/info", summary="Application information")
-async def get_app_info():
+async def get_app_info(
+    request: Request,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
     """Return general information about the application."""
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "description": "A simple FastAPI application for serving inspirational quotes",
-        "environment": settings.environment,
-        "api_version": "v1",
-        "docs_url": "/docs" if settings.enable_docs else None
-    }
+    def render():
+        return {
+            "name": settings.app_name,
+            "version": settings.app_version,
+            "description": (
+                "A simple FastAPI application for serving inspirational quotes"
+            ),
+            "environment": settings.environment,
+            "api_version": "v1",
+            "docs_url": "/docs" if settings.enable_docs else None,
+        }
+
+    return await cached_json_response(
+        request,
+        cache,
+        quotes,
+        "info",
+        ("meta", "info"),
+        render,
+        settings.cache_max_age_meta,
+    )
 
 
 @router.get("/stats", summary="Quote statistics")
-async def get_quote_stats():
+async def get_quote_stats(
+    request: Request,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
     """Return statistics about the quote collection."""
-    quotes = quote_service.get_all_quotes()
-    categories = quote_service.get_categories()
-    authors = quote_service.get_authors()
-
-    category_counts = {}
-    for category in categories:
-        category_quotes = quote_service.get_quotes_by_category(category)
-        category_counts[category] = len(category_quotes)
-
-    author_counts = {}
-    for author in authors:
-        author_quotes = quote_service.get_quotes_by_author(author)
-        author_counts[author] = len(author_quotes)
-
-    return {
-        "total_quotes": len(quotes),
-        "total_categories": len(categories),
-        "total_authors": len(authors),
-        "categories": category_counts,
-        "authors": author_counts,
-        "language_distribution": {
-            "fr": len(quotes)  # Currently all quotes are in French
-        }
-    }
+    return await cached_json_response(
+        request,
+        cache,
+        quotes,
+        "stats",
+        ("meta", "stats"),
+        quotes.service.get_stats,
+        settings.cache_max_age_meta,
+    )
 
 
 @router.get("/categories", summary="List all categories")
-async def get_categories():
+async def get_categories(
+    request: Request,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
     """Return all available quote categories."""
-    categories = quote_service.get_categories()
-    return {
-        "categories": categories,
-        "count": len(categories)
-    }
+    def render():
+        categories = quotes.service.get_categories()
+        return {"categories": categories, "count": len(categories)}
+
+    return await cached_json_response(
+        request,
+        cache,
+        quotes,
+        "categories",
+        ("meta", "categories"),
+        render,
+        settings.cache_max_age_meta,
+    )
 
 
 @router.get("/authors", summary="List all authors")
-async def get_authors():
+async def get_authors(
+    request: Request,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
     """Return all available quote authors."""
-    authors = quote_service.get_authors()
-    return {
-        "authors": authors,
-        "count": len(authors)
-    }
\ No newline at end of file
+    def render():
+        authors = quotes.service.get_authors()
+        return {"authors": authors, "count": len(authors)}
+
+    return await cached_json_response(
+        request,
+        cache,
+        quotes,
+        "authors",
+        ("meta", "authors"),
+        render,
+        settings.cache_max_age_meta,
+    )
@@ -2,80 +2,524 @@
 Quote-related API endpoints.
 """
 
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Literal, Optional, Tuple, TypeVar
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
-from quotes_api.models.quote import Quote, QuoteResponse, QuoteListResponse
+from quotes_api.api.caching import cached_json_response
+from quotes_api.api.compression import json_response, negotiate_encoding
+from quotes_api.api.dependencies import (
+    get_async_quote_service,
+    get_response_cache,
+    require_admin,
+)
+from quotes_api.api.export import csv_chunks, gzip_chunks, ndjson_chunks
+from quotes_api.api.pagination import (
+    after_last_id,
+    decode_cursor,
+    parse_fields,
+    render_page,
+)
+from quotes_api.api.responses import FastJSONResponse, encode_json
+from quotes_api.config import settings
+from quotes_api.models.quote import (
+    NameMatch,
+    Quote,
+    QuoteBatchRequest,
+    QuoteBatchResponse,
+    QuoteInput,
+    QuoteListResponse,
+    QuotePatch,
+    QuoteResponse,
+)
+from quotes_api.services.async_quote_service import AsyncQuoteService
 from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.response_cache import ResponseCache
+from quotes_api.utils.exceptions import QuoteNotFoundError, ValidationError
+
+T = TypeVar("T")
 
 router = APIRouter(prefix="/quotes", tags=["quotes"])
-quote_service = QuoteService()
 
 
 @router.get("/random", response_model=QuoteResponse, summary="Get a random quote")
-async def get_random_quote():
-    """Return a random quote from the collection."""
-    quote = quote_service.get_random_quote()
-    return QuoteResponse(data=quote, message="Random quote retrieved successfully")
+async def get_random_quote(
+    request: Request,
+    category: Optional[str] = Query(None, description="Only draw from this category"),
+    author: Optional[str] = Query(None, description="Only draw from this author"),
+    language: Optional[str] = Query(None, description="Only draw from this language"),
+    weighting: Optional[str] = Query(None, description="Bias the draw: recency"),
+    no_repeat: bool = Query(
+        False, description="Do not repeat a quote until all were seen"
+    ),
+    session: Optional[str] = Query(
+        None,
+        max_length=128,
+        description="Client identifier for no_repeat; defaults to the client address",
+    ),
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """Return a random quote, optionally filtered, weighted or without repeats."""
+    if no_repeat and session is None:
+        session = request.client.host if request.client else ""
+    quote = await quotes.get_random_quote(
+        category=category,
+        author=author,
+        language=language,
+        weighting=weighting,
+        session=session if no_repeat else None,
+    )
+    if quote is None:
+        raise HTTPException(
+            status_code=404, detail="No quotes found matching the filters"
+        )
+    return FastJSONResponse(
+        QuoteResponse(data=quote, message="Random quote retrieved successfully"),
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+# Query parameters shared by the list endpoints
+LIMIT_QUERY = Query(
+    settings.page_size_default,
+    ge=1,
+    le=settings.page_size_max,
+    description="Maximum number of quotes to return",
+)
+CURSOR_QUERY = Query(
+    None, description="Cursor returned as next_cursor by the previous page"
+)
+FIELDS_QUERY = Query(
+    None, description="Comma-separated quote fields to return, e.g. id,text"
+)
+FUZZY_QUERY = Query(
+    True, description="Fall back to the closest names when the name has no exact match"
+)
+
+
+def resolve_name(
+    name: str,
+    count: Callable[[str], int],
+    similar: Callable[[str, int, float], List[Tuple[str, float]]],
+    fuzzy: bool,
+) -> Tuple[str, int, Optional[List[NameMatch]]]:
+    """
+    Resolve an author or category name, tolerating typos and missing accents.
+
+    Args:
+        name: Requested name
+        count: Counts the quotes under a name
+        similar: Finds the closest names and their scores
+        fuzzy: Whether to look for near matches when there is no exact one
+
+    Returns:
+        The name to serve, its number of quotes (0 when none) and the
+        near matches it was picked from, or None for an exact match
+    """
+    total = count(name)
+    if total or not fuzzy:
+        return name, total, None
+    candidates = similar(name, settings.fuzzy_max_matches, settings.fuzzy_min_score)
+    matches = [
+        NameMatch(name=match, score=round(score, 3), count=count(match))
+        for match, score in candidates
+    ]
+    if not matches:
+        return name, 0, None
+    return matches[0].name, matches[0].count, matches
 
 
 @router.get("/", response_model=QuoteListResponse, summary="Get all quotes")
-async def get_all_quotes():
-    """Return all available quotes."""
-    quotes = quote_service.get_all_quotes()
-    return QuoteListResponse(
+async def get_all_quotes(
+    request: Request,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    """Return quotes in id order, one page at a time."""
+    after_id = decode_cursor(cursor)
+    selected = parse_fields(fields)
+
+    quote_service = quotes.service
+
+    def render() -> bytes:
+        page = quote_service.get_all_quotes(after_id, limit + 1)
+        return render_page(
+            page,
+            limit,
+            after_last_id,
+            message="All quotes retrieved successfully",
+            fields=selected,
+            total=quote_service.get_quote_count(),
+        )
+
+    key = ("quotes", limit, after_id, selected)
+    return await cached_json_response(
+        request, cache, quotes, "page", key, render, settings.cache_max_age_quotes
+    )
+
+
+@router.get("/export", summary="Export the whole corpus")
+async def export_quotes(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format"),
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """
+    Stream every quote as newline-delimited JSON or CSV.
+
+    Quotes are encoded batch by batch while the response is sent, so
+    server memory does not grow with the corpus. The stream is gzipped on
+    the fly when the client accepts it. Batches are read and encoded in
+    the pool of heavy operations, which bounds concurrent exports.
+    """
+    batches = quotes.service.iter_quotes(batch_size=settings.export_batch_size)
+    if format == "csv":
+        chunks, media_type, filename = csv_chunks(batches), "text/csv", "quotes.csv"
+    else:
+        chunks = ndjson_chunks(batches)
+        media_type, filename = "application/x-ndjson", "quotes.ndjson"
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding",
+    }
+    accept_encoding = request.headers.get("accept-encoding")
+    if negotiate_encoding(accept_encoding, available=("gzip",)) == "gzip":
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        quotes.stream("export", chunks), media_type=media_type, headers=headers
+    )
+
+
+def parse_ids(ids: str) -> List[int]:
+    """
+    Parse a comma-separated id list such as "1,2,3".
+
+    Raises:
+        ValidationError: If an item is not an integer
+    """
+    try:
+        return [int(item) for item in ids.split(",") if item.strip()]
+    except ValueError:
+        raise ValidationError(
+            "IDs must be comma-separated integers", field="ids", value=ids
+        )
+
+
+def render_batch(quote_service: QuoteService, ids: List[int]) -> QuoteBatchResponse:
+    """
+    Resolve a batch of ids in one pass over the id index.
+
+    Raises:
+        ValidationError: If the batch is empty or larger than batch_max_ids
+    """
+    if not ids:
+        raise ValidationError("At least one ID is required", field="ids")
+    if len(ids) > settings.batch_max_ids:
+        raise ValidationError(
+            f"At most {settings.batch_max_ids} IDs per batch",
+            field="ids",
+            value=len(ids),
+        )
+    quotes, missing = quote_service.get_quotes_by_ids(ids)
+    return QuoteBatchResponse(
         data=quotes,
         count=len(quotes),
-        message="All quotes retrieved successfully"
+        missing=missing,
+        message=f"{len(quotes)} of {len(ids)} quotes retrieved successfully",
+    )
+
+
+@router.get(
+    "/batch", response_model=QuoteBatchResponse, summary="Get many quotes by ID"
+)
+async def get_quotes_batch(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated quote IDs, e.g. 1,2,3"),
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    """Return the requested quotes in request order, listing the missing IDs."""
+    quote_ids = parse_ids(ids)
+
+    def render() -> QuoteBatchResponse:
+        return render_batch(quotes.service, quote_ids)
+
+    return await cached_json_response(
+        request,
+        cache,
+        quotes,
+        "batch",
+        ("batch", tuple(quote_ids)),
+        render,
+        settings.cache_max_age_quotes,
     )
 
 
+@router.post(
+    "/batch", response_model=QuoteBatchResponse, summary="Get many quotes by ID"
+)
+async def post_quotes_batch(
+    request: Request,
+    batch: QuoteBatchRequest,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """Return the requested quotes in request order, listing the missing IDs."""
+    batch_response = await quotes.run("batch", render_batch, quotes.service, batch.ids)
+    return json_response(request, encode_json(batch_response))
+
+
 @router.get("/{quote_id}", response_model=QuoteResponse, summary="Get a quote by ID")
-async def get_quote_by_id(quote_id: int):
+async def get_quote_by_id(
+    request: Request,
+    quote_id: int,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
     """Return a specific quote by its ID."""
-    quote = quote_service.get_quote_by_id(quote_id)
-    if not quote:
-        raise HTTPException(status_code=404, detail="Quote not found")
-    return QuoteResponse(data=quote, message="Quote retrieved successfully")
+    def render() -> QuoteResponse:
+        quote = quotes.service.get_quote_by_id(quote_id)
+        if not quote:
+            raise HTTPException(status_code=404, detail="Quote not found")
+        return QuoteResponse(data=quote, message="Quote retrieved successfully")
+
+    return await cached_json_response(
+        request,
+        cache,
+        quotes,
+        "quote",
+        ("quote", quote_id),
+        render,
+        settings.cache_max_age_quotes,
+    )
 
 
 @router.get("/category/{category}", response_model=QuoteListResponse, summary="Get quotes by category")
-async def get_quotes_by_category(category: str):
-    """Return all quotes from a specific category."""
-    quotes = quote_service.get_quotes_by_category(category)
-    if not quotes:
-        raise HTTPException(status_code=404, detail=f"No quotes found in category: {category}")
-    return QuoteListResponse(
-        data=quotes,
-        count=len(quotes),
-        message=f"Quotes from category '{category}' retrieved successfully"
+async def get_quotes_by_category(
+    request: Request,
+    category: str,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    fuzzy: bool = FUZZY_QUERY,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    """
+    Return quotes from a specific category, one page at a time.
+
+    A category without an exact match resolves to the closest category
+    (typos, missing accents); the near matches and their scores are listed
+    in ``matches``.
+    """
+    after_id = decode_cursor(cursor)
+    selected = parse_fields(fields)
+
+    quote_service = quotes.service
+
+    def render() -> bytes:
+        name, total, matches = resolve_name(
+            category,
+            quote_service.count_quotes_by_category,
+            quote_service.find_similar_categories,
+            fuzzy,
+        )
+        if not total:
+            raise HTTPException(
+                status_code=404, detail=f"No quotes found in category: {category}"
+            )
+        page = quote_service.get_quotes_by_category(name, after_id, limit + 1)
+        message = f"Quotes from category '{name}' retrieved successfully"
+        if matches:
+            message += f" (closest match for '{category}')"
+        return render_page(
+            page,
+            limit,
+            after_last_id,
+            message=message,
+            fields=selected,
+            total=total,
+            matches=matches,
+        )
+
+    key = ("category", category, limit, after_id, selected, fuzzy)
+    return await cached_json_response(
+        request, cache, quotes, "category", key, render, settings.cache_max_age_quotes
     )
 
 
 @router.get("/author/{author}", response_model=QuoteListResponse, summary="Get quotes by author")
-async def get_quotes_by_author(author: str):
-    """Return all quotes from a specific author."""
-    quotes = quote_service.get_quotes_by_author(author)
-    if not quotes:
-        raise HTTPException(status_code=404, detail=f"No quotes found from author: {author}")
-    return QuoteListResponse(
-        data=quotes,
-        count=len(quotes),
-        message=f"Quotes from author '{author}' retrieved successfully"
+async def get_quotes_by_author(
+    request: Request,
+    author: str,
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    fuzzy: bool = FUZZY_QUERY,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+    cache: ResponseCache = Depends(get_response_cache),
+):
+    """
+    Return quotes from a specific author, one page at a time.
+
+    An author without an exact match resolves to the closest author (typos,
+    missing accents); the near matches and their scores are listed in
+    ``matches``.
+    """
+    after_id = decode_cursor(cursor)
+    selected = parse_fields(fields)
+
+    quote_service = quotes.service
+
+    def render() -> bytes:
+        name, total, matches = resolve_name(
+            author,
+            quote_service.count_quotes_by_author,
+            quote_service.find_similar_authors,
+            fuzzy,
+        )
+        if not total:
+            raise HTTPException(
+                status_code=404, detail=f"No quotes found from author: {author}"
+            )
+        page = quote_service.get_quotes_by_author(name, after_id, limit + 1)
+        message = f"Quotes from author '{name}' retrieved successfully"
+        if matches:
+            message += f" (closest match for '{author}')"
+        return render_page(
+            page,
+            limit,
+            after_last_id,
+            message=message,
+            fields=selected,
+            total=total,
+            matches=matches,
+        )
+
+    key = ("author", author, limit, after_id, selected, fuzzy)
+    return await cached_json_response(
+        request, cache, quotes, "author", key, render, settings.cache_max_age_quotes
     )
 
 
 @router.get("/search/", response_model=QuoteListResponse, summary="Search quotes")
 async def search_quotes(
+    request: Request,
     q: str = Query(..., min_length=1, description="Search query to find quotes"),
+    limit: int = LIMIT_QUERY,
+    cursor: Optional[str] = CURSOR_QUERY,
+    fields: Optional[str] = FIELDS_QUERY,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
 ):
-    """Search quotes by text, author, or category."""
-    quotes = quote_service.search_quotes(q)
-    if not quotes:
+    """Search quotes by text, author, or category, best matches first."""
+    offset = decode_cursor(cursor) or 0
+    selected = parse_fields(fields)
+    results = await quotes.search_quotes(q, limit=limit + 1, offset=offset)
+    if not results and not offset:
         raise HTTPException(status_code=404, detail=f"No quotes found matching: {q}")
-    return QuoteListResponse(
-        data=quotes,
-        count=len(quotes),
-        message=f"Quotes matching '{q}' retrieved successfully"
-    )
\ No newline at end of file
+    body = render_page(
+        results,
+        limit,
+        lambda page: offset + len(page),
+        message=f"Quotes matching '{q}' retrieved successfully",
+        fields=selected,
+    )
+    return json_response(request, body)
+
+
+async def found(write: Awaitable[T]) -> T:
+    """
+    Await a write, turning an unknown quote ID into a 404.
+
+    Raises:
+        HTTPException: 404 if the quote to change does not exist
+    """
+    try:
+        return await write
+    except QuoteNotFoundError:
+        raise HTTPException(status_code=404, detail="Quote not found")
+
+
+@router.post(
+    "/",
+    response_model=QuoteResponse,
+    status_code=201,
+    summary="Create a quote",
+    dependencies=[Depends(require_admin)],
+)
+async def create_quote(
+    request: Request,
+    quote_input: QuoteInput,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """Add a quote; its ID is assigned by the server."""
+    quote = await quotes.add_quote(Quote(**quote_input.model_dump()))
+    location = request.url_for("get_quote_by_id", quote_id=quote.id).path
+    return FastJSONResponse(
+        QuoteResponse(data=quote, message="Quote created successfully"),
+        status_code=201,
+        headers={"Location": location},
+    )
+
+
+@router.put(
+    "/{quote_id}",
+    response_model=QuoteResponse,
+    summary="Replace a quote",
+    dependencies=[Depends(require_admin)],
+)
+async def replace_quote(
+    quote_id: int,
+    quote_input: QuoteInput,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """Replace every field of a quote; omitted optional fields are cleared."""
+    quote = await found(
+        quotes.update_quote(Quote(id=quote_id, **quote_input.model_dump()))
+    )
+    return FastJSONResponse(
+        QuoteResponse(data=quote, message="Quote updated successfully")
+    )
+
+
+@router.patch(
+    "/{quote_id}",
+    response_model=QuoteResponse,
+    summary="Update some fields of a quote",
+    dependencies=[Depends(require_admin)],
+)
+async def patch_quote(
+    quote_id: int,
+    changes: QuotePatch,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """Change the fields present in the body; the others are kept."""
+    quote = await found(
+        quotes.patch_quote(quote_id, changes.model_dump(exclude_unset=True))
+    )
+    return FastJSONResponse(
+        QuoteResponse(data=quote, message="Quote updated successfully")
+    )
+
+
+@router.delete(
+    "/{quote_id}",
+    response_model=QuoteResponse,
+    summary="Delete a quote",
+    dependencies=[Depends(require_admin)],
+)
+async def delete_quote(
+    quote_id: int,
+    quotes: AsyncQuoteService = Depends(get_async_quote_service),
+):
+    """Delete a quote and return it."""
+    quote = await found(quotes.delete_quote(quote_id))
+    return FastJSONResponse(
+        QuoteResponse(data=quote, message="Quote deleted successfully")
+    )
@@ -0,0 +1,90 @@
+"""
+Command-line maintenance tools.
+
+Usage:
+    python -m quotes_api.cli snapshot quotes.snap [--input quotes.ndjson]
+    python -m quotes_api.cli import quotes.csv [--format csv] [--replace]
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from quotes_api.config import settings
+from quotes_api.models.quote import Quote
+from quotes_api.services.bulk_import import FORMATS, BulkImporter, format_for_path
+from quotes_api.services.quote_service import create_quote_service, sample_quotes
+from quotes_api.services.storage.snapshot import build_snapshot
+
+
+def read_ndjson(path: str) -> List[Quote]:
+    """Read quotes from a newline-delimited JSON file, as served by /quotes/export."""
+    with open(path, "rb") as source:
+        return [Quote.model_validate_json(line) for line in source if line.strip()]
+
+
+def build_snapshot_command(args: argparse.Namespace) -> None:
+    """Compile a corpus into a memory-mapped snapshot."""
+    quotes = read_ndjson(args.input) if args.input else sample_quotes()
+    count = build_snapshot(quotes, args.output)
+    print(f"Wrote {count} quotes to {args.output}")
+
+
+def import_command(args: argparse.Namespace) -> None:
+    """Stream a quote file into the storage backend selected by the settings."""
+    if settings.storage_backend == "memory":
+        print(
+            "STORAGE_BACKEND=memory: the file is validated but nothing is persisted",
+            file=sys.stderr,
+        )
+    service = create_quote_service()
+    try:
+        importer = BulkImporter(
+            service,
+            chunk_size=args.chunk_size,
+            replace=args.replace,
+            max_errors=settings.import_max_errors,
+        )
+        with open(args.input, "rb") as source:
+            report = importer.run(source, args.format or format_for_path(args.input))
+        stored = service.get_quote_count()
+    finally:
+        service.close()
+    for error in report.errors:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    print(
+        f"Imported {report.imported} of {report.read} rows "
+        f"({report.duplicates} duplicates, {report.invalid} invalid) "
+        f"in {report.duration_ms / 1e3:.2f}s; {stored} quotes stored"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse the command line and run the selected command."""
+    parser = argparse.ArgumentParser(prog="quotes_api.cli", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser("snapshot", help="Build a corpus snapshot file")
+    snapshot.add_argument("output", help="Snapshot file to write")
+    snapshot.add_argument(
+        "--input", help="NDJSON corpus; defaults to the sample quotes"
+    )
+    snapshot.set_defaults(handler=build_snapshot_command)
+
+    bulk = commands.add_parser("import", help="Bulk import an NDJSON or CSV file")
+    bulk.add_argument("input", help="File to import")
+    bulk.add_argument(
+        "--format", choices=FORMATS, help="Defaults to the file extension"
+    )
+    bulk.add_argument(
+        "--replace", action="store_true", help="Replace the corpus instead of appending"
+    )
+    bulk.add_argument("--chunk-size", type=int, default=settings.import_chunk_size)
+    bulk.set_defaults(handler=import_command)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 Application settings and configuration.
 """
 
-from typing import List
+from typing import Dict, List
 
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings
@@ -24,10 +24,89 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
+    # Render and write logs on a background thread behind a bounded queue
+    log_async: bool = True
+    log_queue_size: int = 10_000
+    log_queue_policy: str = "drop"  # "drop" or "block" when the queue is full
+    # Per-path request log sampling, e.g. "/api/v1/health/ping=0.01"
+    log_sample_rates_raw: str = ""
 
     # API
     api_v1_prefix: str = "/api/v1"
     cors_origins_raw: str = ""
+    page_size_default: int = 100
+    page_size_max: int = 1000
+    export_batch_size: int = 1000
+    random_max_sessions: int = 10_000
+    batch_max_ids: int = 100
+
+    # Storage ("memory", "sqlite" or "snapshot")
+    storage_backend: str = "memory"
+    sqlite_path: str = "quotes.db"
+    sqlite_pool_size: int = 4
+    snapshot_path: str = "quotes.snap"
+
+    # Corpus file or SQLite database loaded into the memory backend at
+    # startup (empty: the sample quotes), optionally watched and hot-reloaded
+    corpus_path: str = ""
+    corpus_watch: bool = False
+    corpus_watch_interval: float = 2.0
+
+    # Bulk import
+    import_chunk_size: int = 5000
+    import_max_bytes: int = 1024 * 1024 * 1024
+    # Uploads larger than this are spooled to a temporary file
+    import_spool_size: int = 16 * 1024 * 1024
+    import_max_errors: int = 20
+
+    # Admin endpoints (disabled while empty); send "Authorization: Bearer <token>"
+    admin_token: str = ""
+
+    # Heavy operations (search, stats, exports, writes...) run in a thread
+    # pool; at most offload_max_concurrency calls of one operation at once,
+    # with per-operation overrides such as "search=4,export=1"
+    offload_workers: int = 4
+    offload_max_concurrency: int = 2
+    offload_limits_raw: str = ""
+
+    # Sharded search: with N > 0, searches run on N worker processes, each
+    # indexing 1/N of the corpus (memory and snapshot backends). Shards are
+    # rebuilt once the corpus has not changed for the rebuild delay.
+    search_shards: int = 0
+    search_shard_rebuild_delay: float = 1.0
+
+    # Fuzzy author/category lookup: names without an exact match resolve to
+    # their closest names scoring at least fuzzy_min_score (0 to 1)
+    fuzzy_min_score: float = 0.7
+    fuzzy_max_matches: int = 5
+
+    # Workers
+    # Build the corpus at import time so that a pre-forking server
+    # (gunicorn --preload) shares it copy-on-write across workers.
+    preload_corpus: bool = False
+
+    # Response cache
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # Response compression (gzip, and br when brotli is installed)
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5
+
+    # HTTP caching (Cache-Control max-age, in seconds, per route family)
+    cache_max_age_quotes: int = 60
+    cache_max_age_meta: int = 300
+
+    # Health sampling
+    health_sample_interval: float = 5.0
+    health_history_size: int = 60
+
+    # Metrics
+    # Directory shared by worker processes so /metrics covers all of them
+    # (empty: the answering process only)
+    metrics_dir: str = ""
+    metrics_flush_interval: float = 5.0
 
     # Feature flags
     enable_metrics: bool = True
@@ -52,6 +131,26 @@ class Settings(BaseSettings):
         # Handle comma-separated format
         return [origin.strip() for origin in v.split(",") if origin.strip()]
 
+    @property
+    def log_sample_rates(self) -> Dict[str, float]:
+        """Parse request log sampling rates from raw string."""
+        rates = {}
+        for item in self.log_sample_rates_raw.split(","):
+            path, _, rate = item.strip().rpartition("=")
+            if path:
+                rates[path] = float(rate)
+        return rates
+
+    @property
+    def offload_limits(self) -> Dict[str, int]:
+        """Parse per-operation concurrency limits from raw string."""
+        limits = {}
+        for item in self.offload_limits_raw.split(","):
+            operation, _, limit = item.strip().rpartition("=")
+            if operation:
+                limits[operation] = int(limit)
+        return limits
+
     def get_cors_origins(self) -> List[str]:
         """Get CORS origins with environment-specific additions."""
         origins = list(self.cors_origins)
@@ -77,4 +176,4 @@ class Settings(BaseSettings):
 
 
 # Create global settings instance
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -2,35 +2,116 @@
 Main FastAPI application entry point.
 """
 
-import time
+import gc
 from contextlib import asynccontextmanager
+from typing import Optional, Tuple
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
+from quotes_api.api.dependencies import create_dispatcher
+from quotes_api.api.metrics import process_snapshot
+from quotes_api.api.metrics import router as metrics_router
+from quotes_api.api.middleware import RequestTimingMiddleware
+from quotes_api.api.responses import FastJSONResponse
 from quotes_api.api.v1 import router as v1_router
 from quotes_api.config import settings
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.corpus_reload import CorpusReloader, create_corpus_reloader
+from quotes_api.services.metrics import MetricsRegistry
+from quotes_api.services.quote_service import QuoteService, create_quote_service
+from quotes_api.services.response_cache import ResponseCache
+from quotes_api.services.system_sampler import SystemSampler
 from quotes_api.utils import setup_logging
 from quotes_api.utils.exceptions import QuotesAPIException
-from quotes_api.utils.logger import get_logger, log_request_response
+from quotes_api.utils.logger import get_logger
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
 
+def preload_quote_service() -> Tuple[QuoteService, Optional[CorpusReloader]]:
+    """
+    Build the quote service, and load its corpus file, before workers fork.
+
+    Objects alive at this point are moved to the permanent GC generation so
+    that collections in the workers do not write to, and un-share, the
+    pages holding the corpus. The reloader is returned unstarted: threads
+    do not survive a fork, so each worker starts its own watcher.
+    """
+    service = create_quote_service()
+    reloader = create_corpus_reloader(service)
+    if reloader is not None:
+        reloader.reload()
+    gc.collect()
+    gc.freeze()
+    logger.info("Corpus preloaded before fork", quotes=service.get_quote_count())
+    return service, reloader
+
+
+preloaded_quote_service: Optional[QuoteService] = None
+preloaded_reloader: Optional[CorpusReloader] = None
+if settings.preload_corpus:
+    preloaded_quote_service, preloaded_reloader = preload_quote_service()
+
+
+def async_quote_service(app: FastAPI) -> AsyncQuoteService:
+    """Return the async facade of the service currently installed on an app."""
+    return AsyncQuoteService(app.state.quote_service, app.state.dispatcher)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Starting Quotes API", version=settings.app_version)
 
-    # Startup
+    # Startup: one quote service per process, shared by every router
+    app.state.quote_service = preloaded_quote_service or create_quote_service()
+    reloader = preloaded_reloader or create_corpus_reloader(app.state.quote_service)
+    if reloader is not None:
+        if not reloader.loaded:
+            await run_in_threadpool(reloader.reload)
+        if settings.corpus_watch:
+            reloader.start()
+    app.state.corpus_reloader = reloader
+    sharded_search = app.state.quote_service.sharded_search
+    if sharded_search is not None:
+        # Built in the background; searches use the in-process index until then.
+        sharded_search.follow(app.state.quote_service.backend)
+    app.state.dispatcher = create_dispatcher()
+    app.state.response_cache = ResponseCache(
+        max_entries=settings.response_cache_max_entries,
+        max_bytes=settings.response_cache_max_bytes,
+    )
+    app.state.system_sampler = SystemSampler(
+        interval=settings.health_sample_interval,
+        history_size=settings.health_history_size,
+    )
+    app.state.system_sampler.start()
+    if metrics_registry is not None:
+        metrics_registry.start(
+            lambda: process_snapshot(
+                metrics_registry, app.state.response_cache, async_quote_service(app)
+            )
+        )
     logger.info("Application started successfully")
     yield
 
     # Shutdown
     logger.info("Shutting down Quotes API")
+    await app.state.system_sampler.stop()
+    if reloader is not None:
+        await run_in_threadpool(reloader.stop)
+    if metrics_registry is not None and metrics_registry.directory:
+        await metrics_registry.stop(
+            await process_snapshot(
+                metrics_registry, app.state.response_cache, async_quote_service(app)
+            )
+        )
+    app.state.dispatcher.close()
+    app.state.quote_service.close()
 
 
 # Create FastAPI application
@@ -42,6 +123,7 @@ app = FastAPI(
     redoc_url="/redoc" if settings.enable_docs else None,
     openapi_url="/openapi.json" if settings.enable_docs else None,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -56,29 +138,17 @@ if cors_origins:
     )
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log HTTP requests and responses."""
-    start_time = time.time()
-
-    response = await call_next(request)
-
-    process_time = time.time() - start_time
-    log_request_response(
-        logger=logger,
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-        duration=process_time,
-        user_agent=request.headers.get("user-agent"),
-        remote_addr=request.client.host if request.client else None,
+# Request timing, logging and metrics middleware (outermost of the app's middleware)
+metrics_registry: Optional[MetricsRegistry] = (
+    MetricsRegistry(
+        directory=settings.metrics_dir or None,
+        flush_interval=settings.metrics_flush_interval,
     )
-
-    # Add processing time header
-    response.headers["X-Process-Time"] = str(process_time)
-
-    return response
+    if settings.enable_metrics
+    else None
+)
+app.state.metrics = metrics_registry
+app.add_middleware(RequestTimingMiddleware, metrics=metrics_registry)
 
 
 # Exception handlers
@@ -86,7 +156,7 @@ async def log_requests(request: Request, call_next):
 async def quotes_api_exception_handler(request: Request, exc: QuotesAPIException):
     """Handle custom Quotes API exceptions."""
     logger.error("Application error", exc_info=exc, **exc.to_dict())
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=400,
         content={
             "success": False,
@@ -100,7 +170,7 @@ async def quotes_api_exception_handler(request: Request, exc: QuotesAPIException
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
     logger.error("Unexpected error", exc_info=exc)
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -112,6 +182,8 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # Include API routes
 app.include_router(v1_router, prefix=settings.api_v1_prefix)
+if settings.enable_metrics:
+    app.include_router(metrics_router)
 
 
 # Root endpoint
@@ -143,4 +215,4 @@ if __name__ == "__main__":
         port=settings.port,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
-    )
\ No newline at end of file
+    )
@@ -19,11 +19,25 @@ class Quote(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Update timestamp")
 
-    class Config:
-        """Pydantic config."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
+
+class QuoteInput(BaseModel):
+    """Request body creating or replacing a quote."""
+
+    text: str = Field(..., description="Quote text", min_length=1, max_length=1000)
+    author: Optional[str] = Field(None, description="Quote author", max_length=100)
+    category: Optional[str] = Field(None, description="Quote category", max_length=50)
+    language: str = Field("fr", description="Quote language", max_length=5)
+
+
+class QuotePatch(BaseModel):
+    """Request body changing some fields of a quote; omitted fields are kept."""
+
+    text: Optional[str] = Field(
+        None, description="Quote text", min_length=1, max_length=1000
+    )
+    author: Optional[str] = Field(None, description="Quote author", max_length=100)
+    category: Optional[str] = Field(None, description="Quote category", max_length=50)
+    language: Optional[str] = Field(None, description="Quote language", max_length=5)
 
 
 class QuoteResponse(BaseModel):
@@ -34,10 +48,57 @@ class QuoteResponse(BaseModel):
     message: str = Field("Quote retrieved successfully", description="Response message")
 
 
+class NameMatch(BaseModel):
+    """Near match of a misspelled author or category name."""
+
+    name: str = Field(..., description="Matched name")
+    score: float = Field(
+        ..., description="Similarity to the requested name, from 0 to 1"
+    )
+    count: int = Field(..., description="Number of quotes under this name")
+
+
 class QuoteListResponse(BaseModel):
     """API response model for multiple quotes."""
 
     success: bool = Field(True, description="Success status")
     data: list[Quote] = Field(..., description="List of quotes")
     count: int = Field(..., description="Number of quotes")
-    message: str = Field("Quotes retrieved successfully", description="Response message")
\ No newline at end of file
+    message: str = Field(
+        "Quotes retrieved successfully", description="Response message"
+    )
+    total: Optional[int] = Field(
+        None, description="Number of matching quotes, when known"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, if any"
+    )
+    matches: Optional[list[NameMatch]] = Field(
+        None,
+        description=(
+            "Near matches of an author or category that has no exact match, best "
+            "first; the quotes are those of the first"
+        ),
+    )
+
+
+class QuoteBatchRequest(BaseModel):
+    """Request body of a batch lookup."""
+
+    ids: list[int] = Field(
+        ..., min_length=1, description="Quote IDs to resolve, in order"
+    )
+
+
+class QuoteBatchResponse(BaseModel):
+    """API response model for a batch lookup."""
+
+    success: bool = Field(True, description="Success status")
+    data: list[Quote] = Field(..., description="Found quotes, in request order")
+    count: int = Field(..., description="Number of quotes found")
+    missing: list[int] = Field(
+        default_factory=list, description="Requested IDs that do not exist"
+    )
+    message: str = Field(
+        "Quotes retrieved successfully", description="Response message"
+    )
@@ -3,5 +3,15 @@ Business logic services for Arbah Quotes API.
 """
 
 from .quote_service import QuoteService
+from .quote_store import QuoteStore
+from .search_index import SearchIndex
+from .storage import InMemoryBackend, QuoteBackend, SQLiteBackend
 
-__all__ = ["QuoteService"]
\ No newline at end of file
+__all__ = [
+    "QuoteService",
+    "QuoteStore",
+    "SearchIndex",
+    "QuoteBackend",
+    "InMemoryBackend",
+    "SQLiteBackend",
+]
@@ -0,0 +1,127 @@
+"""
+Async facade of the quote service.
+"""
+
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.dispatch import OperationDispatcher
+from quotes_api.services.quote_service import QuoteService
+
+T = TypeVar("T")
+
+
+class AsyncQuoteService:
+    """
+    Async API over a QuoteService, for request handlers.
+
+    Every method names an operation. Cheap lookups (by id, pages, counts,
+    random draws) run inline on the event loop, or through
+    ``QuoteService.run`` over a blocking backend. Operations listed as
+    heavy by the dispatcher (search, statistics, name listings, exports,
+    writes, imports) run in its bounded pool under a per-operation
+    concurrency limit. All of them are timed per operation.
+    """
+
+    def __init__(self, service: QuoteService, dispatcher: OperationDispatcher):
+        """
+        Initialize the facade.
+
+        Args:
+            service: Synchronous service doing the work
+            dispatcher: Pool, limits and timings shared by the process
+        """
+        self._service = service
+        self._dispatcher = dispatcher
+
+    @property
+    def service(self) -> QuoteService:
+        """Underlying synchronous service."""
+        return self._service
+
+    @property
+    def dispatcher(self) -> OperationDispatcher:
+        """Dispatcher running the calls."""
+        return self._dispatcher
+
+    async def run(
+        self, operation: str, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Call a synchronous function of the service as an operation.
+
+        Args:
+            operation: Operation name, deciding where the call runs
+            func: Function to call
+            *args: Positional arguments of ``func``
+            **kwargs: Keyword arguments of ``func``
+        """
+        dispatcher = self._dispatcher
+        if dispatcher.is_heavy(operation):
+            return await dispatcher.offload(operation, func, *args, **kwargs)
+        if self._service.blocking:
+            return await dispatcher.timed(
+                operation, self._service.run(func, *args, **kwargs)
+            )
+        return dispatcher.inline(operation, func, *args, **kwargs)
+
+    def stream(self, operation: str, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """Iterate over a blocking iterator, each step running in the pool."""
+        return self._dispatcher.stream(operation, iterator)
+
+    async def get_random_quote(self, **filters: Any) -> Optional[Quote]:
+        """Get a random quote (see QuoteService.get_random_quote)."""
+        return await self.run("random", self._service.get_random_quote, **filters)
+
+    async def get_quote_by_id(self, quote_id: int) -> Optional[Quote]:
+        """Get a quote by its ID."""
+        return await self.run("quote", self._service.get_quote_by_id, quote_id)
+
+    async def get_quotes_by_ids(
+        self, quote_ids: Sequence[int]
+    ) -> Tuple[List[Quote], List[int]]:
+        """Resolve many quote IDs, returning the found quotes and the missing IDs."""
+        return await self.run("batch", self._service.get_quotes_by_ids, quote_ids)
+
+    async def search_quotes(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Quote]:
+        """Search quotes, best matches first."""
+        return await self.run(
+            "search", self._service.search_quotes, query, limit, offset
+        )
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Get per-category, per-author and per-language quote counts."""
+        return await self.run("stats", self._service.get_stats)
+
+    async def get_index_sizes(self) -> Dict[str, int]:
+        """Get the number of entries in each corpus index."""
+        return await self.run("index_sizes", self._service.get_index_sizes)
+
+    async def add_quote(self, quote: Quote) -> Quote:
+        """Add a quote (see QuoteService.add_quote)."""
+        return await self.run("write", self._service.add_quote, quote)
+
+    async def update_quote(self, quote: Quote) -> Quote:
+        """Replace a quote (see QuoteService.update_quote)."""
+        return await self.run("write", self._service.update_quote, quote)
+
+    async def patch_quote(self, quote_id: int, changes: Dict[str, Any]) -> Quote:
+        """Change some fields of a quote (see QuoteService.patch_quote)."""
+        return await self.run("write", self._service.patch_quote, quote_id, changes)
+
+    async def delete_quote(self, quote_id: int) -> Quote:
+        """Delete a quote (see QuoteService.delete_quote)."""
+        return await self.run("write", self._service.delete_quote, quote_id)
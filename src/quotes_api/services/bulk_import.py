@@ -0,0 +1,294 @@
+"""
+Streaming bulk import of quote datasets.
+
+Input files (NDJSON, as served by /quotes/export, or CSV with a header
+row) are parsed ``chunk_size`` rows at a time. Each chunk is validated in
+a single TypeAdapter call and deduplicated on its normalized text and
+author before being handed to the backend, so only one chunk of raw rows
+is alive at a time whatever the file size. The backend builds its indexes
+once at the end and the new corpus is published in one step: readers see
+either the old corpus or the complete new one (see
+QuoteService.import_quotes).
+"""
+
+import csv
+import hashlib
+import io
+import json
+import time
+from types import ModuleType
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter
+from pydantic import ValidationError as PydanticValidationError
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.search_index import tokenize
+from quotes_api.utils.exceptions import ValidationError
+
+orjson: Optional[ModuleType]
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+FORMATS = ("ndjson", "csv")
+
+_loads = orjson.loads if orjson is not None else json.loads
+_quote_list = TypeAdapter(List[Quote])
+
+# (line number, parsed row or None, parse error or None)
+_Row = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def format_for_path(path: str) -> str:
+    """Guess the import format of a file from its extension."""
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def dedupe_key(text: str, author: Optional[str]) -> int:
+    """
+    64-bit key identifying a quote regardless of case, accents, spacing
+    and punctuation.
+
+    Two quotes with the same key are considered duplicates. Text is
+    normalized into the folded word tokens of the search index, whose
+    per-token cache makes this far cheaper than folding whole strings.
+    """
+    normalized = " ".join(tokenize(text)) + "\x1f" + " ".join(tokenize(author or ""))
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def read_ndjson_rows(source: IO[bytes]) -> Iterator[_Row]:
+    """Parse newline-delimited JSON objects, skipping blank lines."""
+    for line_number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = _loads(line)
+        except ValueError as exc:
+            yield line_number, None, f"Invalid JSON: {exc}"
+            continue
+        if isinstance(row, dict):
+            yield line_number, row, None
+        else:
+            yield line_number, None, "Expected a JSON object"
+
+
+def read_csv_rows(source: IO[bytes]) -> Iterator[_Row]:
+    """
+    Parse CSV rows keyed by the header row.
+
+    Empty cells are treated as missing, so optional fields fall back to
+    their defaults; unknown columns are ignored.
+    """
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, {
+                key: value for key, value in row.items() if key is not None and value
+            }, None
+    except (csv.Error, UnicodeDecodeError) as exc:
+        yield reader.line_num + 1, None, f"Invalid CSV: {exc}"
+    finally:
+        # Leave the caller's file open.
+        text.detach()
+
+
+_READERS = {"ndjson": read_ndjson_rows, "csv": read_csv_rows}
+
+
+def validate_chunk(rows: List[Dict[str, Any]]) -> Tuple[List[Quote], Dict[int, str]]:
+    """
+    Validate a chunk of rows in one call.
+
+    When some rows are invalid, the rest are validated again without them.
+
+    Returns:
+        The valid quotes in input order, and an error message per invalid
+        row position
+    """
+    try:
+        return _quote_list.validate_python(rows), {}
+    except PydanticValidationError as exc:
+        errors: Dict[int, str] = {}
+        for error in exc.errors():
+            position, *field = error["loc"]
+            errors.setdefault(
+                int(position), f"{'.'.join(map(str, field)) or 'row'}: {error['msg']}"
+            )
+        valid = [row for position, row in enumerate(rows) if position not in errors]
+        return _quote_list.validate_python(valid), errors
+
+
+class ImportReport:
+    """Outcome of a bulk import."""
+
+    def __init__(self, format: str, replace: bool, max_errors: int = 20):
+        """
+        Initialize an empty report.
+
+        Args:
+            format: Input format
+            replace: Whether the import replaced the corpus
+            max_errors: Number of error messages kept as samples
+        """
+        self.format = format
+        self.replace = replace
+        self.max_errors = max_errors
+        self.read = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.version: Optional[int] = None
+        self.duration_ms = 0.0
+
+    def reject(self, line: int, message: str) -> None:
+        """Count an invalid row, keeping its message if room is left."""
+        self.invalid += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the report to a dictionary."""
+        return {
+            "format": self.format,
+            "mode": "replace" if self.replace else "append",
+            "read": self.read,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "errors": self.errors,
+            "version": self.version,
+            "duration_ms": round(self.duration_ms, 2),
+        }
+
+
+class BulkImporter:
+    """
+    Stream a quote file into a QuoteService.
+
+    Quotes keep the id they carry when it is free; quotes without one are
+    numbered after the highest id so far. Rows whose normalized text and
+    author were already seen, in the file or (when appending) in the
+    corpus, are skipped.
+    """
+
+    def __init__(
+        self,
+        service: QuoteService,
+        chunk_size: int = 5000,
+        replace: bool = False,
+        max_errors: int = 20,
+    ):
+        """
+        Initialize the importer.
+
+        Args:
+            service: Service receiving the quotes
+            chunk_size: Rows parsed and validated at a time
+            replace: Replace the corpus instead of appending to it
+            max_errors: Number of error messages kept in the report
+        """
+        self._service = service
+        self.chunk_size = max(1, chunk_size)
+        self.replace = replace
+        self.max_errors = max_errors
+
+    def run(self, source: IO[bytes], format: str = "ndjson") -> ImportReport:
+        """
+        Import a file and publish the resulting corpus.
+
+        Args:
+            source: Binary file positioned at the start of the data
+            format: "ndjson" or "csv"
+
+        Returns:
+            The import report
+
+        Raises:
+            ValidationError: On an unknown format
+            ReadOnlyStorageError: If the backend cannot be written
+        """
+        if format not in _READERS:
+            raise ValidationError(f"Unknown import format: {format!r}", field="format")
+        report = ImportReport(format, self.replace, self.max_errors)
+        seen: Set[int] = set()
+        taken: Set[int] = set()
+        start = time.perf_counter()
+        report.version = self._service.import_quotes(
+            self._quotes(_READERS[format](source), report, seen, taken),
+            replace=self.replace,
+            prepare=None if self.replace else lambda: self._scan(seen, taken),
+        )
+        report.duration_ms = (time.perf_counter() - start) * 1e3
+        return report
+
+    def _scan(self, seen: Set[int], taken: Set[int]) -> None:
+        """Collect the dedupe keys and ids of the current corpus."""
+        # Runs under the service's write lock, before the backend's write
+        # transaction opens: the scan may need a connection of its own.
+        for batch in self._service.iter_quotes(self.chunk_size):
+            for quote in batch:
+                seen.add(dedupe_key(quote.text, quote.author))
+                if quote.id is not None:
+                    taken.add(quote.id)
+
+    def _quotes(
+        self,
+        rows: Iterator[_Row],
+        report: ImportReport,
+        seen: Set[int],
+        taken: Set[int],
+    ) -> Iterator[Quote]:
+        # Runs inside QuoteService.import_quotes, after _scan.
+        last_id = max(taken, default=0)
+
+        for lines, chunk in self._chunks(rows, report):
+            quotes, errors = validate_chunk(chunk)
+            valid_lines = [
+                line for position, line in enumerate(lines) if position not in errors
+            ]
+            for position, message in errors.items():
+                report.reject(lines[position], message)
+
+            for line, quote in zip(valid_lines, quotes):
+                key = dedupe_key(quote.text, quote.author)
+                if key in seen:
+                    report.duplicates += 1
+                    continue
+                if quote.id is None:
+                    last_id += 1
+                    quote.id = last_id
+                elif quote.id in taken:
+                    report.reject(line, f"id: Duplicate quote id {quote.id}")
+                    continue
+                else:
+                    last_id = max(last_id, quote.id)
+                seen.add(key)
+                taken.add(quote.id)
+                report.imported += 1
+                yield quote
+
+    def _chunks(
+        self, rows: Iterator[_Row], report: ImportReport
+    ) -> Iterator[Tuple[List[int], List[Dict[str, Any]]]]:
+        """Group parsed rows into chunks, reporting rows that failed to parse."""
+        lines: List[int] = []
+        chunk: List[Dict[str, Any]] = []
+        for line, row, error in rows:
+            report.read += 1
+            if row is None:
+                report.reject(line, error or "Unreadable row")
+                continue
+            lines.append(line)
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield lines, chunk
+                lines, chunk = [], []
+        if chunk:
+            yield lines, chunk
@@ -0,0 +1,330 @@
+"""
+Hot reload of the in-memory corpus from a watched data source.
+
+The source is an NDJSON or CSV file, or a SQLite database as written by
+the SQLite backend (e.g. by ``python -m quotes_api.cli import``). A daemon
+thread polls its signature; when it changed and then stayed stable for one
+interval, the whole corpus is rebuilt off to the side with every index
+and published by QuoteService with a single reference swap. Requests
+already running finish on the snapshot they started with, and reads take
+no lock.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterator, Optional, Union
+
+from quotes_api.config import settings
+from quotes_api.models.quote import Quote
+from quotes_api.services.bulk_import import BulkImporter, ImportReport, format_for_path
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.storage.sqlite import _COLUMNS, _quote
+from quotes_api.utils.exceptions import ConfigurationError
+from quotes_api.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+class FileSource:
+    """NDJSON or CSV corpus file, loaded through the bulk import pipeline."""
+
+    kind = "file"
+
+    def __init__(self, path: str, chunk_size: int = 5000):
+        """
+        Initialize the source.
+
+        Args:
+            path: Corpus file; the format follows its extension
+            chunk_size: Rows validated at a time
+        """
+        self.path = path
+        self.format = format_for_path(path)
+        self.chunk_size = chunk_size
+
+    def signature(self) -> Hashable:
+        """Identity of the current file contents; None while it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def load(self, service: QuoteService) -> ImportReport:
+        """Replace the corpus of a service with the file contents."""
+        importer = BulkImporter(service, chunk_size=self.chunk_size, replace=True)
+        with open(self.path, "rb") as source:
+            return importer.run(source, self.format)
+
+    def close(self) -> None:
+        """Release resources held by the source."""
+
+
+class SQLiteSource:
+    """
+    SQLite database with the schema of the SQLite backend.
+
+    Commits from any connection or process are detected with
+    ``PRAGMA data_version`` on a dedicated connection; replacing the file
+    is detected from its inode.
+    """
+
+    kind = "sqlite"
+
+    def __init__(self, path: str, batch_size: int = 5000):
+        """
+        Initialize the source.
+
+        Args:
+            path: Database file
+            batch_size: Rows fetched at a time
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self._connection: Optional[sqlite3.Connection] = None
+        self._inode: Optional[int] = None
+
+    def signature(self) -> Hashable:
+        """Identity of the committed database state; None while it is missing."""
+        try:
+            inode = os.stat(self.path).st_ino
+        except FileNotFoundError:
+            return None
+        if self._connection is None or inode != self._inode:
+            self.close()
+            self._connection = self._connect()
+            self._inode = inode
+        return inode, self._connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self, service: QuoteService) -> ImportReport:
+        """Replace the corpus of a service with the database contents."""
+        report = ImportReport("sqlite", replace=True)
+        start = time.perf_counter()
+        connection = self._connect()
+        try:
+            # One read transaction: the rows form a single consistent snapshot.
+            connection.execute("BEGIN")
+            report.version = service.import_quotes(
+                self._rows(connection, report), replace=True
+            )
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+        report.duration_ms = (time.perf_counter() - start) * 1e3
+        return report
+
+    def close(self) -> None:
+        """Close the watching connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"file:{self.path}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+
+    def _rows(
+        self, connection: sqlite3.Connection, report: ImportReport
+    ) -> Iterator[Quote]:
+        cursor = connection.execute(f"SELECT {_COLUMNS} FROM quotes ORDER BY id")
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            report.read += len(rows)
+            report.imported += len(rows)
+            for row in rows:
+                yield _quote(row)
+
+
+CorpusSource = Union[FileSource, SQLiteSource]
+
+
+def open_source(path: str) -> CorpusSource:
+    """Open the corpus source stored at a path, by extension."""
+    if path.lower().endswith(SQLITE_SUFFIXES):
+        return SQLiteSource(path, batch_size=settings.import_chunk_size)
+    return FileSource(path, chunk_size=settings.import_chunk_size)
+
+
+class CorpusReloader:
+    """
+    Reload a QuoteService from a source whenever the source changes.
+
+    A failed reload is logged and leaves the current corpus in place; the
+    next change of the source is tried again.
+    """
+
+    def __init__(
+        self, service: QuoteService, source: CorpusSource, interval: float = 2.0
+    ):
+        """
+        Initialize the reloader.
+
+        Args:
+            service: Service whose corpus is replaced
+            source: Watched data source
+            interval: Seconds between two polls of the source
+        """
+        self._service = service
+        self.source = source
+        self.interval = interval
+        self._loaded: Hashable = None
+        self._pending: Hashable = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # Serializes the watcher and explicit reloads.
+        self._reload_lock = threading.RLock()
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_duration_ms: Optional[float] = None
+        self.last_swap: Optional[float] = None
+        self.last_report: Optional[ImportReport] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the source was loaded at least once."""
+        return self.last_swap is not None
+
+    @property
+    def running(self) -> bool:
+        """Whether the watcher thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def reload(self) -> bool:
+        """
+        Rebuild the corpus from the source now and swap it in.
+
+        Returns:
+            Whether the new corpus was published
+        """
+        with self._reload_lock:
+            signature = self.source.signature()
+            start = time.perf_counter()
+            try:
+                report = self.source.load(self._service)
+            except Exception as exc:
+                self.failures += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                logger.error(
+                    "Corpus reload failed", source=self.source.path, exc_info=exc
+                )
+                return False
+            finally:
+                # Retry only once the source changes again.
+                self._loaded = self._pending = signature
+            self.last_duration_ms = (time.perf_counter() - start) * 1e3
+            self.last_swap = time.time()
+            self.last_report = report
+            self.last_error = None
+            self.reloads += 1
+            logger.info(
+                "Corpus reloaded",
+                source=self.source.path,
+                version=report.version,
+                quotes=report.imported,
+                invalid=report.invalid,
+                duration_ms=round(self.last_duration_ms, 2),
+            )
+            return True
+
+    def check(self) -> bool:
+        """
+        Reload if the source changed and has been stable since the last check.
+
+        Waiting for a stable signature avoids loading a file that is still
+        being written; replacing it with an atomic rename is faster still.
+
+        Returns:
+            Whether a new corpus was published
+        """
+        with self._reload_lock:
+            signature = self.source.signature()
+            if signature is None or signature == self._loaded:
+                self._pending = self._loaded
+                return False
+            if signature != self._pending:
+                self._pending = signature
+                return False
+            return self.reload()
+
+    def start(self) -> None:
+        """Start watching the source in a daemon thread."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="quotes-corpus-reload", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching, waiting for a reload in progress to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.source.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return reload counters and the outcome of the last reload."""
+        report = self.last_report
+        return {
+            "source": self.source.path,
+            "kind": self.source.kind,
+            "watching": self.running,
+            "interval": self.interval,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "last_duration_ms": (
+                round(self.last_duration_ms, 2)
+                if self.last_duration_ms is not None
+                else None
+            ),
+            "last_swap": self.last_swap,
+            "snapshot_version": report.version if report is not None else None,
+            "last_import": report.to_dict() if report is not None else None,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as exc:  # keep watching whatever happens
+                logger.error(
+                    "Corpus watcher error", source=self.source.path, exc_info=exc
+                )
+
+
+def create_corpus_reloader(service: QuoteService) -> Optional[CorpusReloader]:
+    """
+    Build the reloader selected by the settings.
+
+    Returns:
+        None when no ``corpus_path`` is configured
+
+    Raises:
+        ConfigurationError: If a corpus path is set for a backend other
+            than the in-memory one
+    """
+    if not settings.corpus_path:
+        return None
+    if settings.storage_backend != "memory":
+        raise ConfigurationError(
+            "corpus_path requires the memory storage backend", config_key="corpus_path"
+        )
+    return CorpusReloader(
+        service,
+        open_source(settings.corpus_path),
+        interval=settings.corpus_watch_interval,
+    )
@@ -0,0 +1,245 @@
+"""
+Dispatch of synchronous service calls from async code.
+
+Cheap calls run inline on the event loop. Heavy operations run in a
+bounded thread pool, and each operation has its own concurrency limit:
+callers over the limit wait on the event loop without holding a thread,
+so a burst of one kind of heavy call (e.g. searches) can neither block
+the loop nor take every worker from the others. Every call is timed per
+operation.
+
+The pool runs threads: the in-memory corpus lives in this process, and
+the GIL still lets the event loop run between two slices of a heavy call.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+#: Operations whose cost grows with the corpus, run in the pool.
+HEAVY_OPERATIONS: FrozenSet[str] = frozenset(
+    {
+        "search",
+        "stats",
+        "categories",
+        "authors",
+        "index_sizes",
+        "export",
+        "write",
+        "import",
+    }
+)
+
+_DONE = object()
+
+
+class OperationStats:
+    """Call counters and timings of one operation."""
+
+    __slots__ = (
+        "calls",
+        "errors",
+        "seconds",
+        "max_seconds",
+        "wait_seconds",
+        "in_flight",
+        "waiting",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.in_flight = 0
+        self.waiting = 0
+
+    def record(self, seconds: float, failed: bool) -> None:
+        """Count a finished call and its duration."""
+        self.calls += 1
+        self.errors += failed
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the stats to a dictionary, durations in milliseconds."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "avg_ms": round(self.seconds / self.calls * 1e3, 3) if self.calls else None,
+            "max_ms": round(self.max_seconds * 1e3, 3),
+            "total_ms": round(self.seconds * 1e3, 3),
+            "wait_ms": round(self.wait_seconds * 1e3, 3),
+        }
+
+
+class OperationDispatcher:
+    """
+    Run service calls inline or in a bounded pool, timing each operation.
+
+    Stats are only updated from the event loop thread, so they need no
+    lock (as in MetricsRegistry).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_concurrency: int = 2,
+        limits: Optional[Dict[str, int]] = None,
+        heavy: FrozenSet[str] = HEAVY_OPERATIONS,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            max_workers: Threads running heavy operations
+            max_concurrency: Heavy calls of one operation running at once
+            limits: Per-operation overrides of ``max_concurrency``
+            heavy: Operations run in the pool; the others run inline
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_concurrency = max(1, max_concurrency)
+        self.limits = dict(limits or {})
+        self.heavy = heavy
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, OperationStats] = {}
+
+    def is_heavy(self, operation: str) -> bool:
+        """Whether an operation runs in the pool."""
+        return operation in self.heavy
+
+    def limit(self, operation: str) -> int:
+        """Number of calls of an operation allowed to run at once."""
+        return max(1, self.limits.get(operation, self.max_concurrency))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the stats of every operation called so far, by name."""
+        return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def inline(
+        self, operation: str, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """Call a cheap function on the current thread, timing it."""
+        stats = self._operation(operation)
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            stats.record(time.perf_counter() - start, failed)
+
+    async def timed(self, operation: str, awaitable: Awaitable[T]) -> T:
+        """Await a call dispatched elsewhere (e.g. a storage pool), timing it."""
+        stats = self._operation(operation)
+        start = time.perf_counter()
+        failed = True
+        stats.in_flight += 1
+        try:
+            result = await awaitable
+            failed = False
+            return result
+        finally:
+            stats.in_flight -= 1
+            stats.record(time.perf_counter() - start, failed)
+
+    async def offload(
+        self, operation: str, func: Callable[..., T], *args: Any, **kwargs: Any
+    ) -> T:
+        """
+        Run a heavy function in the pool once the operation has a free slot.
+
+        The current context (e.g. a snapshot pinned by QuoteService.pinned)
+        is carried over to the worker thread. The recorded duration
+        includes the wait for a slot, also reported as ``wait_ms``.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        async with self._slot(operation):
+            return await loop.run_in_executor(
+                self._pool(), functools.partial(context.run, func, *args, **kwargs)
+            )
+
+    async def stream(self, operation: str, iterator: Iterator[T]) -> AsyncIterator[T]:
+        """
+        Pull every item of a blocking iterator in the pool.
+
+        One slot of the operation is held until the stream ends or is
+        closed, so the limit bounds the number of concurrent streams.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        step = functools.partial(context.run, next, iterator, _DONE)
+        async with self._slot(operation):
+            while True:
+                item = await loop.run_in_executor(self._pool(), step)
+                if item is _DONE:
+                    return
+                yield item  # type: ignore[misc]
+
+    def close(self) -> None:
+        """Release the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _operation(self, operation: str) -> OperationStats:
+        stats = self._stats.get(operation)
+        if stats is None:
+            stats = self._stats[operation] = OperationStats()
+        return stats
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="quotes-heavy"
+            )
+        return self._executor
+
+    @asynccontextmanager
+    async def _slot(self, operation: str) -> AsyncIterator[OperationStats]:
+        """Hold one of the operation's slots, timing the whole block."""
+        semaphore = self._slots.get(operation)
+        if semaphore is None:
+            semaphore = self._slots[operation] = asyncio.Semaphore(
+                self.limit(operation)
+            )
+        stats = self._operation(operation)
+        start = time.perf_counter()
+        stats.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats.waiting -= 1
+        stats.wait_seconds += time.perf_counter() - start
+        stats.in_flight += 1
+        failed = True
+        try:
+            yield stats
+            failed = False
+        finally:
+            stats.in_flight -= 1
+            semaphore.release()
+            stats.record(time.perf_counter() - start, failed)
@@ -0,0 +1,164 @@
+"""
+Typo- and accent-tolerant lookup of names (authors, categories).
+"""
+
+import heapq
+import math
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from quotes_api.services.search_index import tokenize
+
+
+def fold_name(name: str) -> str:
+    """Normalize a name for fuzzy matching: folded words joined by single spaces."""
+    return " ".join(tokenize(name))
+
+
+def trigrams(folded: str) -> FrozenSet[str]:
+    """Return the trigrams of a folded name, padded so that short names have some."""
+    padded = f"  {folded} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a: str, b: str, min_score: float = 0.0) -> float:
+    """
+    Return 1 - Levenshtein distance / length of the longer string.
+
+    The computation stops early, returning 0.0, once the score is sure to
+    fall below ``min_score``.
+    """
+    if a == b:
+        return 1.0
+    longest = max(len(a), len(b))
+    max_distance = math.floor((1 - min_score) * longest + 1e-9)
+    if abs(len(a) - len(b)) > max_distance:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        left = i
+        for j, other in enumerate(b, 1):
+            # min() of three values, inlined: this loop dominates lookups.
+            cost = previous[j - 1] + (char != other)
+            if left + 1 < cost:
+                cost = left + 1
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            current.append(cost)
+            left = cost
+        if min(current) > max_distance:
+            return 0.0
+        previous = current
+    distance = previous[-1]
+    return 1 - distance / longest if distance <= max_distance else 0.0
+
+
+class FuzzyIndex:
+    """
+    Trigram index ranking names by edit distance to a misspelled query.
+
+    Names are folded (case, accents, punctuation), so "Succes" matches
+    "Succès" exactly. Candidates are read from the postings of the query's
+    trigrams, rarest first, until ``max_scanned`` names are collected: the
+    rare trigrams are the ones that tell names apart, and the cost of a
+    lookup stays bounded (a few milliseconds) however many names share the
+    common ones. Candidates sharing enough trigrams with the query are then
+    ranked by Levenshtein similarity.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        min_overlap: float = 0.3,
+        max_candidates: int = 30,
+        max_scanned: int = 2000,
+    ):
+        """
+        Build the index.
+
+        Args:
+            names: Display names to index
+            min_overlap: Dice coefficient of trigrams a candidate must reach
+            max_candidates: Candidates ranked by edit distance per lookup
+            max_scanned: Names read from the postings per lookup
+        """
+        self.min_overlap = min_overlap
+        self.max_candidates = max_candidates
+        self.max_scanned = max_scanned
+        self._names: List[str] = []
+        self._folded: List[str] = []
+        self._grams: List[FrozenSet[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        for name in names:
+            folded = fold_name(name)
+            if not folded:
+                continue
+            position = len(self._names)
+            self._names.append(name)
+            self._folded.append(folded)
+            grams = trigrams(folded)
+            self._grams.append(grams)
+            for gram in grams:
+                postings = self._postings.get(gram)
+                if postings is None:
+                    self._postings[gram] = [position]
+                else:
+                    postings.append(position)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match(
+        self, name: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """
+        Return the indexed names closest to a name.
+
+        Args:
+            name: Possibly misspelled name
+            limit: Maximum number of names
+            min_score: Minimum similarity, in [0, 1]
+
+        Returns:
+            (name, similarity) pairs, best first; 1.0 when only case,
+            accents or punctuation differ
+        """
+        folded = fold_name(name)
+        if not folded or limit <= 0:
+            return []
+        grams = trigrams(folded)
+        postings = sorted(
+            (self._postings[gram] for gram in grams if gram in self._postings), key=len
+        )
+        if not postings:
+            return []
+
+        # A name with a Dice coefficient of at least min_overlap shares at
+        # least `needed` trigrams with the query, so it holds one of the
+        # len(grams) - needed + 1 rarest ones: later postings bring nothing.
+        overlap = self.min_overlap
+        needed = max(1, math.ceil(overlap * len(grams) / (2 - overlap)))
+        seen: Set[int] = set()
+        for positions in postings[: max(0, len(grams) - needed + 1)]:
+            room = self.max_scanned - len(seen)
+            if room <= 0:
+                break
+            seen.update(positions if len(positions) <= room else positions[:room])
+
+        candidates = []
+        all_grams = self._grams
+        for position in seen:
+            shared = len(grams & all_grams[position])
+            if 2 * shared >= overlap * (len(grams) + len(all_grams[position])):
+                candidates.append((shared, -position))
+        best = heapq.nlargest(self.max_candidates, candidates)
+
+        scored = []
+        for _, position in best:
+            position = -position
+            score = similarity(folded, self._folded[position], min_score)
+            if score >= min_score and score > 0:
+                scored.append((-score, self._names[position]))
+        return [
+            (display, -negative) for negative, display in heapq.nsmallest(limit, scored)
+        ]
@@ -0,0 +1,618 @@
+"""
+Request metrics and Prometheus text exposition.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from types import ModuleType
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from quotes_api.utils.logger import get_logger
+
+fcntl: Optional[ModuleType]
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no file locks on Windows
+    fcntl = None
+
+logger = get_logger(__name__)
+
+#: Upper bounds, in seconds, of the request latency histogram.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+#: Upper bounds, in bytes, of the response size histogram.
+SIZE_BUCKETS: Tuple[float, ...] = (
+    128,
+    512,
+    2048,
+    8192,
+    32768,
+    131072,
+    524288,
+    2097152,
+    8388608,
+)
+
+#: Metadata of the counters and gauges a process snapshot may carry:
+#: name -> (type, help, label name or None). Gauges listed in MAX_GAUGES
+#: describe shared state (the corpus) and are aggregated with max, other
+#: gauges are summed over live processes.
+METRICS: Dict[str, Tuple[str, str, Optional[str]]] = {
+    "quotes_api_response_cache_hits_total": ("counter", "Response cache hits.", None),
+    "quotes_api_response_cache_misses_total": (
+        "counter",
+        "Response cache misses.",
+        None,
+    ),
+    "quotes_api_response_cache_evictions_total": (
+        "counter",
+        "Response cache evictions.",
+        None,
+    ),
+    "quotes_api_response_cache_variant_hits_total": (
+        "counter",
+        "Compressed variants served from the response cache.",
+        "encoding",
+    ),
+    "quotes_api_response_cache_variant_misses_total": (
+        "counter",
+        "Compressed variants computed on a response cache miss.",
+        "encoding",
+    ),
+    "quotes_api_response_cache_entries": ("gauge", "Cached responses.", None),
+    "quotes_api_response_cache_bytes": (
+        "gauge",
+        "Bytes of cached response bodies.",
+        None,
+    ),
+    "quotes_api_index_size": ("gauge", "Entries per corpus index.", "index"),
+    "quotes_api_operation_calls_total": (
+        "counter",
+        "Service operation calls.",
+        "operation",
+    ),
+    "quotes_api_operation_errors_total": (
+        "counter",
+        "Service operation calls that raised.",
+        "operation",
+    ),
+    "quotes_api_operation_seconds_total": (
+        "counter",
+        "Time spent in service operations, waits included.",
+        "operation",
+    ),
+    "quotes_api_operation_wait_seconds_total": (
+        "counter",
+        "Time heavy operations waited for a free slot.",
+        "operation",
+    ),
+    "quotes_api_operation_in_flight": (
+        "gauge",
+        "Service operations running.",
+        "operation",
+    ),
+    "quotes_api_operation_waiting": (
+        "gauge",
+        "Heavy operations waiting for a free slot.",
+        "operation",
+    ),
+}
+MAX_GAUGES = {"quotes_api_index_size"}
+
+#: Files of the shared metrics directory that are not worker snapshots.
+EXITED_FILE = "exited.json"
+LOCK_FILE = ".lock"
+
+Series = Tuple[str, str, int]
+
+
+class _Histograms:
+    """Latency and size histograms of one (method, route, status) series."""
+
+    __slots__ = ("latency", "latency_sum", "size", "size_sum")
+
+    def __init__(self, latency_slots: int, size_slots: int):
+        # One count per bucket plus the +Inf overflow, not cumulative
+        self.latency = [0] * latency_slots
+        self.latency_sum = 0.0
+        self.size = [0] * size_slots
+        self.size_sum = 0
+
+
+class _Aggregate:
+    """Metrics summed over process snapshots."""
+
+    def __init__(self) -> None:
+        self.requests: Dict[Series, List[Any]] = {}
+        self.in_flight: Dict[str, int] = {}
+        self.counters: Dict[str, Dict[str, float]] = {}
+        self.gauges: Dict[str, Dict[str, float]] = {}
+        self.workers = 0
+
+    def add(self, snapshot: Dict[str, Any]) -> None:
+        """Add a snapshot; only running processes contribute gauges and in-flight."""
+        for row in snapshot["requests"]:
+            method, route, status, latency, latency_sum, size, size_sum = row
+            total = self.requests.get((method, route, status))
+            if total is None:
+                self.requests[(method, route, status)] = [
+                    list(latency),
+                    latency_sum,
+                    list(size),
+                    size_sum,
+                ]
+                continue
+            total[0] = [a + b for a, b in zip(total[0], latency)]
+            total[1] += latency_sum
+            total[2] = [a + b for a, b in zip(total[2], size)]
+            total[3] += size_sum
+        for name, values in snapshot["counters"].items():
+            merged = self.counters.setdefault(name, {})
+            for label, value in values.items():
+                merged[label] = merged.get(label, 0) + value
+        if snapshot["alive"]:
+            self.workers += 1
+            for method, value in snapshot["in_flight"].items():
+                self.in_flight[method] = self.in_flight.get(method, 0) + value
+            self._add_gauges(snapshot["gauges"])
+
+    def _add_gauges(self, gauges: Dict[str, Dict[str, float]]) -> None:
+        for name, values in gauges.items():
+            merged = self.gauges.setdefault(name, {})
+            for label, value in values.items():
+                previous = merged.get(label)
+                if previous is None:
+                    merged[label] = value
+                elif name in MAX_GAUGES:
+                    merged[label] = max(previous, value)
+                else:
+                    merged[label] = previous + value
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Return the counters and histograms as the snapshot of an exited process."""
+        return {
+            "pid": 0,
+            "requests": [
+                [method, route, status, *totals]
+                for (method, route, status), totals in self.requests.items()
+            ],
+            "in_flight": {},
+            "counters": self.counters,
+            "gauges": {},
+        }
+
+
+class MetricsRegistry:
+    """
+    HTTP request metrics of this process.
+
+    Requests are recorded by the timing middleware on the event loop
+    thread, the only writer, so recording is a dict lookup, a bisect and a
+    few integer increments with no lock. Histograms are stored as
+    per-bucket counts and made cumulative only when rendered.
+
+    With a shared ``directory``, every worker periodically writes a
+    snapshot there and the worker answering /metrics sums the snapshots of
+    all workers. Snapshot files are named after the process id and start
+    time, so a worker reusing the pid of an exited one gets a file of its
+    own. The counters of exited workers are folded into a persisted total
+    before their file is deleted, so totals do not go backwards; their
+    gauges and in-flight requests are ignored.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        flush_interval: float = 5.0,
+        latency_buckets: Sequence[float] = LATENCY_BUCKETS,
+        size_buckets: Sequence[float] = SIZE_BUCKETS,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            directory: Directory shared by the workers, or None for a
+                single process
+            flush_interval: Seconds between snapshot writes
+            latency_buckets: Latency histogram upper bounds, in seconds
+            size_buckets: Response size histogram upper bounds, in bytes
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.latency_buckets = tuple(latency_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._series: Dict[Series, _Histograms] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._process: Optional[Tuple[int, Optional[int], str]] = None
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def pid(self) -> int:
+        """Id of the current process, read on use (the app may be imported pre-fork)."""
+        return os.getpid()
+
+    @property
+    def process_id(self) -> str:
+        """Identifier of the current process, unique even when pids are reused."""
+        return self._current_process()[2]
+
+    def request_started(self, method: str) -> None:
+        """Count a request as in flight."""
+        self._in_flight[method] = self._in_flight.get(method, 0) + 1
+
+    def request_finished(
+        self, method: str, route: str, status: int, duration: float, size: int
+    ) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            method: HTTP method
+            route: Route path template
+            status: Response status code
+            duration: Seconds spent on the request
+            size: Response body bytes
+        """
+        self._in_flight[method] -= 1
+        key = (method, route, status)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Histograms(
+                len(self.latency_buckets) + 1, len(self.size_buckets) + 1
+            )
+        series.latency[bisect_left(self.latency_buckets, duration)] += 1
+        series.latency_sum += duration
+        series.size[bisect_left(self.size_buckets, size)] += 1
+        series.size_sum += size
+
+    def snapshot(
+        self,
+        counters: Optional[Dict[str, Dict[str, float]]] = None,
+        gauges: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Capture this process's metrics as JSON-serializable data.
+
+        Args:
+            counters: Values of METRICS counters, by label value ("" if unlabelled)
+            gauges: Values of METRICS gauges, by label value
+
+        Returns:
+            Snapshot dictionary
+        """
+        _, started, process_id = self._current_process()
+        return {
+            "pid": self.pid,
+            "process": process_id,
+            "started": started,
+            "requests": [
+                [
+                    method,
+                    route,
+                    status,
+                    series.latency,
+                    series.latency_sum,
+                    series.size,
+                    series.size_sum,
+                ]
+                for (method, route, status), series in self._series.items()
+            ],
+            "in_flight": dict(self._in_flight),
+            "counters": counters or {},
+            "gauges": gauges or {},
+        }
+
+    def flush(self, snapshot: Dict[str, Any]) -> None:
+        """Write this process's snapshot to the shared directory, atomically."""
+        directory = self.directory
+        if not directory:
+            return
+        self._write(directory, f"{snapshot['process']}.json", snapshot)
+
+    def collect(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Gather the snapshots of every worker.
+
+        Files of exited workers are folded into the persisted total of
+        exited workers and deleted (where file locks are available).
+
+        Args:
+            snapshot: This process's live snapshot
+
+        Returns:
+            The live snapshot, the other workers' latest files and the
+            total of exited workers, each flagged with whether its process
+            is still running
+        """
+        snapshots = [dict(snapshot, alive=True)]
+        directory = self.directory
+        if not directory:
+            return snapshots
+        own = f"{snapshot['process']}.json"
+        with self._locked(directory) as locked:
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(".json") or name in (own, EXITED_FILE):
+                    continue
+                other = self._read(directory, name)
+                if other is None:
+                    continue
+                alive = _process_alive(other["pid"], other.get("started"))
+                if not alive and locked:
+                    self._retire(directory, name, other)
+                else:
+                    snapshots.append(dict(other, alive=alive))
+            exited = self._read(directory, EXITED_FILE)
+        if exited is not None:
+            snapshots.append(dict(exited, alive=False))
+        return snapshots
+
+    def render(self, snapshots: Iterable[Dict[str, Any]]) -> str:
+        """
+        Render aggregated snapshots in the Prometheus text format.
+
+        Args:
+            snapshots: Output of collect()
+
+        Returns:
+            Exposition text
+        """
+        aggregate = _Aggregate()
+        for snapshot in snapshots:
+            aggregate.add(snapshot)
+        lines: List[str] = []
+        self._render_requests(lines, aggregate)
+        _render_metrics(lines, aggregate)
+        _header(
+            lines, "quotes_api_workers", "gauge", "Worker processes reporting metrics."
+        )
+        lines.append(f"quotes_api_workers {aggregate.workers}")
+        return "\n".join(lines) + "\n"
+
+    def _render_requests(self, lines: List[str], aggregate: _Aggregate) -> None:
+        ordered = sorted(aggregate.requests.items())
+
+        _header(
+            lines,
+            "quotes_api_http_requests_total",
+            "counter",
+            "HTTP requests by method, route and status.",
+        )
+        for (method, route, status), (latency, _, _, _) in ordered:
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"quotes_api_http_requests_total{{{labels}}} {sum(latency)}")
+
+        _header(
+            lines,
+            "quotes_api_http_request_duration_seconds",
+            "histogram",
+            "HTTP request latency, including the response body.",
+        )
+        for (method, route, status), (latency, latency_sum, _, _) in ordered:
+            _histogram(
+                lines,
+                "quotes_api_http_request_duration_seconds",
+                _labels(method=method, route=route, status=status),
+                self.latency_buckets,
+                latency,
+                latency_sum,
+            )
+
+        _header(
+            lines,
+            "quotes_api_http_response_size_bytes",
+            "histogram",
+            "HTTP response body size.",
+        )
+        for (method, route, status), (_, _, size, size_sum) in ordered:
+            _histogram(
+                lines,
+                "quotes_api_http_response_size_bytes",
+                _labels(method=method, route=route, status=status),
+                self.size_buckets,
+                size,
+                size_sum,
+            )
+
+        _header(
+            lines,
+            "quotes_api_http_requests_in_flight",
+            "gauge",
+            "HTTP requests being served.",
+        )
+        for method, value in sorted(aggregate.in_flight.items()):
+            labels = _labels(method=method)
+            lines.append(f"quotes_api_http_requests_in_flight{{{labels}}} {value}")
+
+    def _current_process(self) -> Tuple[int, Optional[int], str]:
+        """Return the pid, start time and identifier of the current process."""
+        pid = self.pid
+        process = self._process
+        if process is None or process[0] != pid:
+            started = _process_start(pid)
+            suffix = str(started) if started is not None else uuid.uuid4().hex
+            process = self._process = (pid, started, f"{pid}-{suffix}")
+        return process
+
+    def _retire(self, directory: str, name: str, snapshot: Dict[str, Any]) -> None:
+        """Fold an exited worker's snapshot into the exited total, then delete it."""
+        aggregate = _Aggregate()
+        exited = self._read(directory, EXITED_FILE)
+        for part in (exited, snapshot):
+            if part is not None:
+                aggregate.add(dict(part, alive=False))
+        self._write(directory, EXITED_FILE, aggregate.to_snapshot())
+        os.unlink(os.path.join(directory, name))
+
+    @contextmanager
+    def _locked(self, directory: str) -> Iterator[bool]:
+        """Hold the directory lock; yield False where file locks are unavailable."""
+        if fcntl is None:
+            yield False
+            return
+        with open(os.path.join(directory, LOCK_FILE), "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield True
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self, directory: str, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(directory, name)) as handle:
+                return cast(Dict[str, Any], json.load(handle))
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, directory: str, name: str, data: Dict[str, Any]) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as handle:
+                json.dump(data, handle)
+            os.replace(temp_path, os.path.join(directory, name))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def start(self, snapshot: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        """
+        Start writing snapshots periodically when a directory is set.
+
+        Args:
+            snapshot: Coroutine function building this process's snapshot
+        """
+        if self.directory and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(snapshot))
+
+    async def stop(self, snapshot: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Stop the flush task.
+
+        Args:
+            snapshot: Final snapshot to write, if any
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if snapshot is not None:
+            self.flush(snapshot)
+
+    async def _run(self, snapshot: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                self.flush(await snapshot())
+            except Exception as exc:
+                logger.warning("Metrics flush failed", error=str(exc))
+
+
+def _process_start(pid: int) -> Optional[int]:
+    """Start time of a process, in clock ticks since boot (Linux), or None."""
+    try:
+        with open(f"/proc/{pid}/stat") as handle:
+            stat = handle.read()
+        # Fields after the parenthesized command name start at field 3.
+        return int(stat[stat.rindex(")") + 2 :].split()[19])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _process_alive(pid: int, started: Optional[int] = None) -> bool:
+    """Whether a process runs, and is the one started at ``started`` when known."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    if started is None:
+        return True
+    current = _process_start(pid)
+    return current is None or current == started
+
+
+def _render_metrics(lines: List[str], aggregate: _Aggregate) -> None:
+    for name, (kind, help_text, label_name) in METRICS.items():
+        values = (aggregate.counters if kind == "counter" else aggregate.gauges).get(
+            name
+        )
+        if not values:
+            continue
+        _header(lines, name, kind, help_text)
+        for label, value in sorted(values.items()):
+            selector = f"{{{_labels(**{label_name: label})}}}" if label_name else ""
+            lines.append(f"{name}{selector} {_number(value)}")
+
+
+def _header(lines: List[str], name: str, kind: str, help_text: str) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(
+    lines: List[str],
+    name: str,
+    labels: str,
+    bounds: Sequence[float],
+    counts: Sequence[int],
+    total: float,
+) -> None:
+    cumulative = 0
+    for bound, count in zip(bounds, counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{_number(bound)}"}} {cumulative}')
+    cumulative += counts[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{{{labels}}} {_number(total)}")
+    lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+
+def _labels(**labels: Any) -> str:
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items())
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return (
+        repr(float(value))
+        if isinstance(value, float) and not value.is_integer()
+        else str(int(value))
+    )
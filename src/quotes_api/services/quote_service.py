@@ -2,127 +2,657 @@
 Quote business logic service.
 """
 
-import random
-from typing import List, Optional
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
+from pydantic import ValidationError as PydanticValidationError
+
+from quotes_api.config import settings
 from quotes_api.models.quote import Quote
+from quotes_api.services.quote_store import fold_key
+from quotes_api.services.random_selection import RandomSelector
+from quotes_api.services.sharded_search import ShardedSearch
+from quotes_api.services.storage import (
+    InMemoryBackend,
+    QuoteBackend,
+    SnapshotBackend,
+    SQLiteBackend,
+)
+from quotes_api.utils.exceptions import (
+    ConfigurationError,
+    QuoteNotFoundError,
+    ValidationError,
+)
 
+T = TypeVar("T")
 
-class QuoteService:
-    """Service for managing quotes."""
-
-    def __init__(self):
-        """Initialize the quote service."""
-        # Sample quotes database
-        self._quotes = [
-            Quote(
-                id=1,
-                text="La vie est une fleur dont l'amour est le miel.",
-                author="Victor Hugo",
-                category="Amour",
-                language="fr"
-            ),
-            Quote(
-                id=2,
-                text="Le succès n'est pas la clé du bonheur. Le bonheur est la clé du succès.",
-                author="Albert Schweitzer",
-                category="Succès",
-                language="fr"
-            ),
-            Quote(
-                id=3,
-                text="La seule façon de faire un travail formidable est d'aimer ce que vous faites.",
-                author="Steve Jobs",
-                category="Travail",
-                language="fr"
-            ),
-            Quote(
-                id=4,
-                text="L'avenir appartient à ceux qui croient à la beauté de leurs rêves.",
-                author="Eleanor Roosevelt",
-                category="Rêves",
-                language="fr"
-            ),
-            Quote(
-                id=5,
-                text="La seule vraie sagesse est de savoir que l'on ne sait rien.",
-                author="Socrate",
-                category="Sagesse",
-                language="fr"
-            ),
-            Quote(
-                id=6,
-                text="La vie est trop courte pour boire du mauvais vin.",
-                author="Proverbe français",
-                category="Plaisir",
-                language="fr"
-            ),
-            Quote(
-                id=7,
-                text="Dans la vie, il n'y a pas de solutions. Il y a des forces en marche.",
-                author="Albert Camus",
-                category="Philosophie",
-                language="fr"
+# (service, backend) pinned by QuoteService.pinned for the current context.
+_pinned: contextvars.ContextVar[
+    Optional[Tuple["QuoteService", QuoteBackend]]
+] = contextvars.ContextVar("quotes_pinned_backend", default=None)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class _PendingWrite:
+    """A write queued for the single writer, and its outcome."""
+
+    __slots__ = ("apply", "result", "error", "done")
+
+    def __init__(self, apply: Callable[[QuoteBackend], Any]):
+        self.apply = apply
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+def sample_quotes() -> List[Quote]:
+    """Return the built-in sample corpus."""
+    return [
+        Quote(
+            id=1,
+            text="La vie est une fleur dont l'amour est le miel.",
+            author="Victor Hugo",
+            category="Amour",
+            language="fr",
+        ),
+        Quote(
+            id=2,
+            text=(
+                "Le succès n'est pas la clé du bonheur. "
+                "Le bonheur est la clé du succès."
             ),
-            Quote(
-                id=8,
-                text="L'homme n'est rien d'autre que ce qu'il fait de lui-même.",
-                author="Jean-Paul Sartre",
-                category="Existentialisme",
-                language="fr"
+            author="Albert Schweitzer",
+            category="Succès",
+            language="fr",
+        ),
+        Quote(
+            id=3,
+            text=(
+                "La seule façon de faire un travail formidable "
+                "est d'aimer ce que vous faites."
             ),
-            Quote(
-                id=9,
-                text="La liberté consiste à pouvoir faire tout ce qui ne nuit pas à autrui.",
-                author="Déclaration des Droits de l'Homme",
-                category="Liberté",
-                language="fr"
+            author="Steve Jobs",
+            category="Travail",
+            language="fr",
+        ),
+        Quote(
+            id=4,
+            text="L'avenir appartient à ceux qui croient à la beauté de leurs rêves.",
+            author="Eleanor Roosevelt",
+            category="Rêves",
+            language="fr",
+        ),
+        Quote(
+            id=5,
+            text="La seule vraie sagesse est de savoir que l'on ne sait rien.",
+            author="Socrate",
+            category="Sagesse",
+            language="fr",
+        ),
+        Quote(
+            id=6,
+            text="La vie est trop courte pour boire du mauvais vin.",
+            author="Proverbe français",
+            category="Plaisir",
+            language="fr",
+        ),
+        Quote(
+            id=7,
+            text="Dans la vie, il n'y a pas de solutions. Il y a des forces en marche.",
+            author="Albert Camus",
+            category="Philosophie",
+            language="fr",
+        ),
+        Quote(
+            id=8,
+            text="L'homme n'est rien d'autre que ce qu'il fait de lui-même.",
+            author="Jean-Paul Sartre",
+            category="Existentialisme",
+            language="fr",
+        ),
+        Quote(
+            id=9,
+            text=(
+                "La liberté consiste à pouvoir faire "
+                "tout ce qui ne nuit pas à autrui."
             ),
-            Quote(
-                id=10,
-                text="L'imagination est plus importante que le savoir.",
-                author="Albert Einstein",
-                category="Créativité",
-                language="fr"
+            author="Déclaration des Droits de l'Homme",
+            category="Liberté",
+            language="fr",
+        ),
+        Quote(
+            id=10,
+            text="L'imagination est plus importante que le savoir.",
+            author="Albert Einstein",
+            category="Créativité",
+            language="fr",
+        ),
+    ]
+
+
+class QuoteService:
+    """
+    Service for managing quotes.
+
+    The corpus is a versioned snapshot behind one reference. Reads take no
+    lock: they use the snapshot published when they start. Writes go
+    through a single writer, which applies them to a copy of the snapshot
+    (see QuoteBackend.begin_write) and publishes it with a reference swap,
+    so the quote, its index entries, the statistics and the version
+    change together. Response caches are keyed by version, so publishing
+    also invalidates them.
+    """
+
+    def __init__(
+        self,
+        quotes: Optional[Iterable[Quote]] = None,
+        backend: Optional[QuoteBackend] = None,
+        max_workers: int = 4,
+        selector: Optional[RandomSelector] = None,
+        sharded_search: Optional[ShardedSearch] = None,
+    ):
+        """
+        Initialize the quote service.
+
+        Args:
+            quotes: Initial corpus of the default in-memory backend; defaults
+                to the built-in sample quotes
+            backend: Storage backend; overrides ``quotes`` when given
+            max_workers: Threads running calls of a blocking backend
+            selector: Random selection state; a default one when None
+            sharded_search: Worker processes running searches, when enabled
+        """
+        if backend is None:
+            backend = InMemoryBackend(sample_quotes() if quotes is None else quotes)
+        self._backend = backend
+        # Held by the single writer; reads never take it.
+        self._write_lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self._queue: List[_PendingWrite] = []
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._selector = selector or RandomSelector()
+        self._sharded_search = sharded_search
+
+    @property
+    def backend(self) -> QuoteBackend:
+        """Storage backend holding the corpus read by the current context."""
+        pinned = _pinned.get()
+        if pinned is not None and pinned[0] is self:
+            return pinned[1]
+        return self._backend
+
+    @property
+    def sharded_search(self) -> Optional[ShardedSearch]:
+        """Sharded search across worker processes, None when disabled."""
+        return self._sharded_search
+
+    @property
+    def blocking(self) -> bool:
+        """Whether service calls must run off the event loop."""
+        return self._backend.blocking
+
+    @property
+    def version(self) -> int:
+        """Corpus version; changes on every write."""
+        return self.backend.version
+
+    @property
+    def fingerprint(self) -> int:
+        """Content hash of the corpus, stable across processes."""
+        return self.backend.fingerprint
+
+    @contextmanager
+    def pinned(self) -> Iterator[QuoteBackend]:
+        """
+        Serve every read of the current context from one snapshot.
+
+        Within the block (including calls made through ``run``), the
+        service keeps reading the snapshot current on entry even if writes
+        are published meanwhile, e.g. so that a response and its ETag
+        describe the same version. Backends isolating readers through
+        their storage only pin the backend object.
+        """
+        backend = self.backend
+        token = _pinned.set((self, backend))
+        try:
+            yield backend
+        finally:
+            _pinned.reset(token)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Call a service method from async code without blocking the event loop.
+
+        In-memory calls run inline. Calls into a blocking backend run in a
+        bounded thread pool, so at most ``max_workers`` of them are in flight
+        and the rest queue without holding threads.
+        """
+        if not self._backend.blocking:
+            return func(*args, **kwargs)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="quotes-storage"
             )
-        ]
+        # Carry the pinned snapshot over to the worker thread.
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(context.run, func, *args, **kwargs)
+        )
 
-    def get_random_quote(self) -> Quote:
-        """Get a random quote."""
-        return random.choice(self._quotes)
+    def close(self) -> None:
+        """Release the worker threads and processes, and the backend."""
+        if self._sharded_search is not None:
+            self._sharded_search.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._backend.close()
+
+    def get_random_quote(
+        self,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        language: Optional[str] = None,
+        weighting: Optional[str] = None,
+        session: Optional[str] = None,
+    ) -> Optional[Quote]:
+        """
+        Get a random quote, or None when no quote matches.
+
+        Args:
+            category: Only draw from this category
+            author: Only draw from this author
+            language: Only draw from this language
+            weighting: Bias the draw (see random_selection.WEIGHTINGS)
+            session: Client identifier; draws for the same session and
+                filters do not repeat until the whole pool was seen
+
+        Raises:
+            ValidationError: On an unknown or incompatible weighting
+        """
+        backend = self.backend
+        if not (category or author or language or weighting or session):
+            return backend.random()
+        version = backend.version
+        pool = backend.random_pool(category, author, language)
+        pool_key = tuple(
+            fold_key(value) if value else None for value in (category, author, language)
+        )
+        quote_id = self._selector.pick(pool, pool_key, version, weighting, session)
+        return backend.get(quote_id) if quote_id is not None else None
 
     def get_quote_by_id(self, quote_id: int) -> Optional[Quote]:
         """Get a quote by its ID."""
-        return next((quote for quote in self._quotes if quote.id == quote_id), None)
+        return self.backend.get(quote_id)
+
+    def get_quotes_by_ids(
+        self, quote_ids: Sequence[int]
+    ) -> Tuple[List[Quote], List[int]]:
+        """
+        Resolve many quote IDs in one pass.
+
+        Returns:
+            The found quotes in request order, and the IDs that do not exist
+        """
+        found, missing = [], []
+        for quote_id, quote in zip(quote_ids, self.backend.get_many(quote_ids)):
+            if quote is None:
+                missing.append(quote_id)
+            else:
+                found.append(quote)
+        return found, missing
 
-    def get_all_quotes(self) -> List[Quote]:
-        """Get all quotes."""
-        return self._quotes.copy()
+    def get_quote_count(self) -> int:
+        """Get the number of quotes."""
+        return self.backend.count()
 
-    def get_quotes_by_category(self, category: str) -> List[Quote]:
+    def get_all_quotes(
+        self, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        """Get quotes in id order, optionally one page after a given ID."""
+        return self.backend.page(after_id, limit)
+
+    def iter_quotes(self, batch_size: int = 1000) -> Iterator[List[Quote]]:
+        """
+        Iterate over every quote in id order, in batches.
+
+        Only one batch is materialized at a time, so memory stays constant
+        whatever the corpus size.
+        """
+        backend = self.backend
+        after_id = None
+        while True:
+            batch = backend.page(after_id, batch_size)
+            if not batch:
+                return
+            yield batch
+            after_id = batch[-1].id
+
+    def get_quotes_by_category(
+        self, category: str, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
         """Get quotes by category."""
-        return [quote for quote in self._quotes if quote.category and quote.category.lower() == category.lower()]
+        return self.backend.by_category(category, after_id, limit)
 
-    def get_quotes_by_author(self, author: str) -> List[Quote]:
+    def get_quotes_by_author(
+        self, author: str, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
         """Get quotes by author."""
-        return [quote for quote in self._quotes if quote.author and quote.author.lower() == author.lower()]
-
-    def search_quotes(self, query: str) -> List[Quote]:
-        """Search quotes by text content."""
-        query_lower = query.lower()
-        return [
-            quote for quote in self._quotes
-            if query_lower in quote.text.lower() or
-            (quote.author and query_lower in quote.author.lower()) or
-            (quote.category and query_lower in quote.category.lower())
-        ]
+        return self.backend.by_author(author, after_id, limit)
+
+    def get_quotes_by_language(
+        self, language: str, after_id: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        """Get quotes by language."""
+        return self.backend.by_language(language, after_id, limit)
+
+    def count_quotes_by_category(self, category: str) -> int:
+        """Get the number of quotes in a category."""
+        return self.backend.count_category(category)
+
+    def count_quotes_by_author(self, author: str) -> int:
+        """Get the number of quotes by an author."""
+        return self.backend.count_author(author)
+
+    def search_quotes(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Quote]:
+        """
+        Search quotes by text, author or category, best matches first.
+
+        With sharded search, the query runs on the shards of the current
+        corpus; while they are being built, it runs on the backend's own
+        index, with the same results.
+        """
+        backend = self.backend
+        if self._sharded_search is not None:
+            ranked = self._sharded_search.search(
+                backend, query, None if limit is None else limit + offset
+            )
+            if ranked is not None:
+                quotes = backend.get_many([quote_id for quote_id, _ in ranked[offset:]])
+                return [quote for quote in quotes if quote is not None]
+        return backend.search(query, limit, offset)
+
+    def find_similar_categories(
+        self, category: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the categories closest to a misspelled or unaccented name.
+
+        Returns:
+            (category, score) pairs, best first; the score is in [0, 1]
+        """
+        return self.backend.similar_categories(category, limit, min_score)
+
+    def find_similar_authors(
+        self, author: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the authors closest to a misspelled or unaccented name.
+
+        Returns:
+            (author, score) pairs, best first; the score is in [0, 1]
+        """
+        return self.backend.similar_authors(author, limit, min_score)
 
     def get_categories(self) -> List[str]:
         """Get all unique categories."""
-        categories = {quote.category for quote in self._quotes if quote.category}
-        return sorted(list(categories))
+        return sorted(self.backend.categories())
 
     def get_authors(self) -> List[str]:
         """Get all unique authors."""
-        authors = {quote.author for quote in self._quotes if quote.author}
-        return sorted(list(authors))
\ No newline at end of file
+        return sorted(self.backend.authors())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-category, per-author and per-language quote counts."""
+        return self.backend.stats()
+
+    def get_index_sizes(self) -> Dict[str, int]:
+        """Get the number of entries in each corpus index, for metrics."""
+        stats = self.backend.stats()
+        return {
+            "quotes": stats["total_quotes"],
+            "categories": stats["total_categories"],
+            "authors": stats["total_authors"],
+            "languages": len(stats["language_distribution"]),
+            "random_sessions": self._selector.session_count,
+            **self.backend.index_stats(),
+        }
+
+    def add_quote(self, quote: Quote) -> Quote:
+        """
+        Add a quote, assigning an ID when it has none.
+
+        ``created_at`` is set to the current time unless given.
+
+        Raises:
+            ValidationError: If a quote with the same ID exists
+            ReadOnlyStorageError: If the backend cannot be written
+        """
+        if quote.created_at is None:
+            quote = quote.model_copy(update={"created_at": _now()})
+        return self._write(lambda backend: backend.add(quote))
+
+    def update_quote(self, quote: Quote) -> Quote:
+        """
+        Replace an existing quote.
+
+        The stored ``created_at`` is kept and ``updated_at`` set to the
+        current time.
+
+        Raises:
+            QuoteNotFoundError: If no quote has the ID of ``quote``
+            ReadOnlyStorageError: If the backend cannot be written
+        """
+
+        def apply(backend: QuoteBackend) -> Quote:
+            previous = backend.get(quote.id) if quote.id is not None else None
+            if previous is None:
+                raise QuoteNotFoundError(quote_id=quote.id)
+            return backend.update(
+                quote.model_copy(
+                    update={"created_at": previous.created_at, "updated_at": _now()}
+                )
+            )
+
+        return self._write(apply)
+
+    def patch_quote(self, quote_id: int, changes: Dict[str, Any]) -> Quote:
+        """
+        Change some fields of an existing quote.
+
+        The read of the current quote and the write of the new one happen
+        in the same write step, so concurrent patches never lose changes.
+
+        Args:
+            quote_id: ID of the quote to change
+            changes: New value per field name
+
+        Raises:
+            QuoteNotFoundError: If no quote has this ID
+            ValidationError: If the changed quote is invalid
+            ReadOnlyStorageError: If the backend cannot be written
+        """
+
+        def apply(backend: QuoteBackend) -> Quote:
+            previous = backend.get(quote_id)
+            if previous is None:
+                raise QuoteNotFoundError(quote_id=quote_id)
+            fields = {
+                **previous.model_dump(),
+                **changes,
+                "id": quote_id,
+                "updated_at": _now(),
+            }
+            try:
+                quote = Quote.model_validate(fields)
+            except PydanticValidationError as exc:
+                error = exc.errors()[0]
+                field = ".".join(map(str, error["loc"]))
+                raise ValidationError(f"{field}: {error['msg']}", field=field)
+            return backend.update(quote)
+
+        return self._write(apply)
+
+    def delete_quote(self, quote_id: int) -> Quote:
+        """
+        Delete a quote by its ID and return it.
+
+        Raises:
+            QuoteNotFoundError: If no quote has this ID
+            ReadOnlyStorageError: If the backend cannot be written
+        """
+        return self._write(lambda backend: backend.delete(quote_id))
+
+    def _write(self, apply: Callable[[QuoteBackend], T]) -> T:
+        """
+        Run a write through the single writer and publish its result.
+
+        Writes are queued. Whichever caller holds the write lock drains the
+        queue, applies every write to one ``begin_write`` copy of the
+        backend and publishes it with a single reference swap; callers
+        whose write was drained by another just collect their outcome.
+        Concurrent writes thus share the cost of one copy (group commit).
+        A failing write is reported to its caller only: it raises before
+        changing anything, and the rest of its batch is still published.
+        """
+        pending = _PendingWrite(apply)
+        with self._queue_lock:
+            self._queue.append(pending)
+        with self._write_lock:
+            if not pending.done:
+                self._apply_queued()
+        if pending.error is not None:
+            raise pending.error
+        return cast(T, pending.result)
+
+    def _apply_queued(self) -> None:
+        # Called with the write lock held.
+        with self._queue_lock:
+            batch, self._queue = self._queue, []
+        try:
+            draft = self._backend.begin_write()
+            for write in batch:
+                try:
+                    write.result = write.apply(draft)
+                except Exception as exc:
+                    write.error = exc
+            if any(write.error is None for write in batch):
+                self._backend = draft
+        except Exception as exc:
+            for write in batch:
+                write.error = exc
+        finally:
+            for write in batch:
+                write.done = True
+
+    def import_quotes(
+        self,
+        quotes: Iterable[Quote],
+        replace: bool = False,
+        prepare: Optional[Callable[[], None]] = None,
+    ) -> int:
+        """
+        Load quotes in bulk and publish the result in one step.
+
+        ``quotes`` is consumed lazily while the write lock is held.
+        ``prepare`` runs under the same lock but before the backend opens
+        its write transaction: it is where the current corpus can be read
+        (e.g. to deduplicate against it) without racing other writes. Doing
+        so from ``quotes`` would need a second database connection while
+        the transaction holds one. Readers keep using the previous corpus
+        until the new one is swapped in.
+
+        Args:
+            quotes: Quotes to load; ids must be set and not already stored
+            replace: Drop the current corpus instead of appending to it
+            prepare: Called before loading, under the write lock
+
+        Returns:
+            The version of the new corpus
+
+        Raises:
+            ReadOnlyStorageError: If the backend cannot be written
+            ValidationError: If a quote has no id or a duplicate one
+        """
+        with self._write_lock:
+            if prepare is not None:
+                prepare()
+            backend = self._backend.bulk_load(quotes, replace)
+            self._backend = backend
+            return backend.version
+
+
+def create_quote_service() -> QuoteService:
+    """
+    Build the quote service selected by the settings.
+
+    The SQLite database is seeded with the sample corpus when it is empty;
+    a snapshot must have been built beforehand (see quotes_api.cli). With
+    a ``corpus_path``, the in-memory corpus starts empty until the corpus
+    reloader loads it (see corpus_reload). With ``search_shards``, no
+    worker process starts before ``ShardedSearch.follow`` is called.
+
+    Raises:
+        ConfigurationError: If ``storage_backend`` names no known backend,
+            or ``search_shards`` is set for the SQLite backend
+    """
+    selector = RandomSelector(max_sessions=settings.random_max_sessions)
+    sharded_search = None
+    if settings.search_shards > 0:
+        if settings.storage_backend == "sqlite":
+            raise ConfigurationError(
+                "search_shards requires the memory or snapshot storage backend",
+                config_key="search_shards",
+            )
+        sharded_search = ShardedSearch(
+            settings.search_shards, rebuild_delay=settings.search_shard_rebuild_delay
+        )
+    if settings.storage_backend == "memory":
+        return QuoteService(
+            quotes=() if settings.corpus_path else None,
+            selector=selector,
+            sharded_search=sharded_search,
+        )
+    if settings.storage_backend == "sqlite":
+        backend = SQLiteBackend(
+            settings.sqlite_path,
+            quotes=sample_quotes(),
+            pool_size=settings.sqlite_pool_size,
+        )
+        return QuoteService(
+            backend=backend, max_workers=settings.sqlite_pool_size, selector=selector
+        )
+    if settings.storage_backend == "snapshot":
+        return QuoteService(
+            backend=SnapshotBackend(settings.snapshot_path),
+            selector=selector,
+            sharded_search=sharded_search,
+        )
+    raise ConfigurationError(
+        f"Unknown storage backend: {settings.storage_backend!r}",
+        config_key="storage_backend",
+    )
@@ -0,0 +1,601 @@
+"""
+Indexed in-memory quote storage.
+"""
+
+import bisect
+import hashlib
+import itertools
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.fuzzy_index import FuzzyIndex
+from quotes_api.utils.exceptions import QuoteNotFoundError, ValidationError
+
+# Versions are unique across every store in the process, so a version seen
+# by a cache can never be confused with one from a replaced store.
+_versions = itertools.count(1)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class QuoteRecord:
+    """
+    Compact stored form of a quote.
+
+    A slotted object has no per-instance ``__dict__`` nor validation state,
+    and its author, category and language strings are interned, so all the
+    quotes of an author share one string. Records are internal: convert them
+    with ``to_quote`` where an API model is needed. Treat them as immutable.
+    """
+
+    __slots__ = (
+        "id",
+        "text",
+        "author",
+        "category",
+        "language",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        text: str,
+        author: Optional[str] = None,
+        category: Optional[str] = None,
+        language: str = "fr",
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+    ):
+        self.id = id
+        self.text = text
+        self.author = _intern(author)
+        self.category = _intern(category)
+        self.language = sys.intern(language)
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def from_quote(cls, quote: Quote, id: Optional[int] = None) -> "QuoteRecord":
+        """Build a record from a validated quote, optionally assigning its id."""
+        quote_id = quote.id if id is None else id
+        if quote_id is None:
+            raise ValidationError("Stored quotes must have an id", field="id")
+        return cls(
+            quote_id,
+            quote.text,
+            quote.author,
+            quote.category,
+            quote.language,
+            quote.created_at,
+            quote.updated_at,
+        )
+
+    def to_quote(self) -> Quote:
+        """Return the API model of this record, skipping validation."""
+        return Quote.model_construct(
+            id=self.id,
+            text=self.text,
+            author=self.author,
+            category=self.category,
+            language=self.language,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    def _values(self) -> Tuple[Any, ...]:
+        return (
+            self.id,
+            self.text,
+            self.author,
+            self.category,
+            self.language,
+            self.created_at,
+            self.updated_at,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, QuoteRecord):
+            return NotImplemented
+        return self._values() == other._values()
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"QuoteRecord(id={self.id!r}, text={self.text!r}, author={self.author!r})"
+        )
+
+
+def _row_digest(quote: Union[Quote, QuoteRecord]) -> int:
+    """64-bit content digest of a quote, stable across processes."""
+    row = "\x1f".join(
+        str(value)
+        for value in (
+            quote.id,
+            quote.text,
+            quote.author,
+            quote.category,
+            quote.language,
+            quote.created_at,
+            quote.updated_at,
+        )
+    )
+    return int.from_bytes(
+        hashlib.blake2b(row.encode("utf-8"), digest_size=8).digest(), "big"
+    )
+
+
+def fold_key(value: str) -> str:
+    """Normalize an index key for case-insensitive lookups."""
+    return value.casefold()
+
+
+class _KeyIndex:
+    """Secondary index mapping a case-folded key to the sorted ids holding it."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._ids: Dict[str, List[int]] = {}
+        self._names: Dict[str, str] = {}
+        # Keys whose id list this index may mutate; None when it owns them all.
+        self._owned: Optional[Set[str]] = None
+        # Built on the first fuzzy lookup, dropped when a key appears or goes.
+        self._fuzzy: Optional[FuzzyIndex] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def copy(self) -> "_KeyIndex":
+        """
+        Return a copy sharing its id lists with this index.
+
+        A shared list is copied the first time the copy writes to it, so
+        this index never changes under its readers.
+        """
+        clone = _KeyIndex.__new__(_KeyIndex)
+        clone._ids = dict(self._ids)
+        clone._names = dict(self._names)
+        clone._owned = set()
+        clone._fuzzy = self._fuzzy
+        return clone
+
+    def _writable(self, key: str, ids: List[int]) -> List[int]:
+        if self._owned is None or key in self._owned:
+            return ids
+        ids = self._ids[key] = ids.copy()
+        self._owned.add(key)
+        return ids
+
+    def add(
+        self, value: Optional[str], quote_id: int, keep_sorted: bool = True
+    ) -> None:
+        """
+        Register a quote id under a key.
+
+        Args:
+            value: Raw key value; empty values are not indexed
+            quote_id: ID of the quote holding the value
+            keep_sorted: Insert in order; bulk loads append and call sort() once
+        """
+        if not value:
+            return
+        key = fold_key(value)
+        ids = self._ids.get(key)
+        if ids is None:
+            self._ids[key] = [quote_id]
+            self._names[key] = value
+            self._fuzzy = None
+            if self._owned is not None:
+                self._owned.add(key)
+            return
+        ids = self._writable(key, ids)
+        if not keep_sorted or ids[-1] < quote_id:
+            ids.append(quote_id)
+        else:
+            bisect.insort(ids, quote_id)
+
+    def remove(self, value: Optional[str], quote_id: int) -> None:
+        """Unregister a quote id from a key."""
+        if not value:
+            return
+        key = fold_key(value)
+        ids = self._ids.get(key)
+        if ids is None:
+            return
+        position = bisect.bisect_left(ids, quote_id)
+        if position < len(ids) and ids[position] == quote_id:
+            ids = self._writable(key, ids)
+            del ids[position]
+        if not ids:
+            del self._ids[key]
+            del self._names[key]
+            self._fuzzy = None
+
+    def get(self, value: str) -> List[int]:
+        """Return the sorted ids stored under a key (do not mutate)."""
+        return self._ids.get(fold_key(value), [])
+
+    def names(self) -> List[str]:
+        """Return the display name of every key."""
+        return list(self._names.values())
+
+    def similar(
+        self, value: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """
+        Return the display names closest to a possibly misspelled value.
+
+        The fuzzy index is built on first use and kept, shared with copies,
+        until a key is added or removed: writes that only move quotes
+        between existing keys keep it.
+        """
+        fuzzy = self._fuzzy
+        if fuzzy is None:
+            fuzzy = self._fuzzy = FuzzyIndex(self._names.values())
+        return fuzzy.match(value, limit, min_score)
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of quotes per display name, sorted by name."""
+        return {
+            self._names[key]: len(ids)
+            for key, ids in sorted(
+                self._ids.items(), key=lambda item: self._names[item[0]]
+            )
+        }
+
+    def sort(self) -> None:
+        """Sort every id list after a bulk load."""
+        for ids in self._ids.values():
+            ids.sort()
+
+
+class QuoteStore:
+    """
+    In-memory quote store.
+
+    Quotes are held as compact QuoteRecords in a dict keyed by id; reads
+    return records. Category, author and language
+    are indexed on their case-folded value so that lookups cost O(k) in the
+    number of matching quotes instead of a scan of the whole corpus. Every
+    write keeps the indexes in sync and advances ``version``.
+
+    Writes mutate the store in place. To change a store that is being read
+    concurrently, write to a ``copy()`` and publish it instead.
+    """
+
+    def __init__(self, quotes: Iterable[Union[Quote, QuoteRecord]] = ()):
+        """
+        Initialize the store.
+
+        Args:
+            quotes: Initial quotes; every quote must carry a unique id
+        """
+        self._by_id: Dict[int, QuoteRecord] = {}
+        self._ids: List[int] = []
+        self._categories = _KeyIndex()
+        self._authors = _KeyIndex()
+        self._languages = _KeyIndex()
+        self._stats: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._fingerprint: Optional[int] = None
+        self.version = 0
+        self.load(quotes)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, quote_id: object) -> bool:
+        return quote_id in self._by_id
+
+    def __iter__(self) -> Iterator[QuoteRecord]:
+        """Iterate over quotes in id order."""
+        by_id = self._by_id
+        return (by_id[quote_id] for quote_id in self._ids)
+
+    def copy(self) -> "QuoteStore":
+        """
+        Return a writable copy of the store.
+
+        Records are shared. The id dict and list are copied, as are the
+        key-to-ids maps of the indexes; the id list of a key is only copied
+        when a write to the copy touches it. Writing to the copy never
+        changes this store.
+        """
+        clone = QuoteStore.__new__(QuoteStore)
+        clone._by_id = dict(self._by_id)
+        clone._ids = list(self._ids)
+        clone._categories = self._categories.copy()
+        clone._authors = self._authors.copy()
+        clone._languages = self._languages.copy()
+        clone._stats = self._stats
+        clone._fingerprint = self._fingerprint
+        clone.version = self.version
+        return clone
+
+    def load(self, quotes: Iterable[Union[Quote, QuoteRecord]]) -> None:
+        """
+        Bulk-insert quotes, sorting the indexes once at the end.
+
+        Args:
+            quotes: Quotes, or records of another store (shared, as by
+                ``copy``), to insert; ids must be set and not already stored
+        """
+        for quote in quotes:
+            if quote.id is None:
+                raise ValidationError("Bulk-loaded quotes must have an id", field="id")
+            if quote.id in self._by_id:
+                raise ValidationError("Duplicate quote id", field="id", value=quote.id)
+            if isinstance(quote, QuoteRecord):
+                record = quote
+            else:
+                record = QuoteRecord.from_quote(quote)
+            self._by_id[record.id] = record
+            self._ids.append(record.id)
+            self._index(record, keep_sorted=False)
+            self._toggle_fingerprint(record)
+        self._ids.sort()
+        for index in (self._categories, self._authors, self._languages):
+            index.sort()
+        self.version = next(_versions)
+
+    def get(self, quote_id: int) -> Optional[QuoteRecord]:
+        """Return the quote with the given id, if any."""
+        return self._by_id.get(quote_id)
+
+    def ids(self) -> List[int]:
+        """Return all quote ids in ascending order (do not mutate)."""
+        return self._ids
+
+    def page(
+        self, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[QuoteRecord]:
+        """
+        Return quotes in id order, copying only the requested slice.
+
+        Args:
+            after: Return only quotes with an id greater than this one
+            limit: Maximum number of quotes; no limit when None
+        """
+        return self._resolve(self._ids, after, limit)
+
+    def by_category(
+        self, category: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[QuoteRecord]:
+        """Return the quotes of a category in id order, case-insensitively."""
+        return self._resolve(self._categories.get(category), after, limit)
+
+    def by_author(
+        self, author: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[QuoteRecord]:
+        """Return the quotes of an author in id order, case-insensitively."""
+        return self._resolve(self._authors.get(author), after, limit)
+
+    def by_language(
+        self, language: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[QuoteRecord]:
+        """Return the quotes in a language in id order, case-insensitively."""
+        return self._resolve(self._languages.get(language), after, limit)
+
+    def matching_ids(
+        self,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Return the ascending ids holding every given key (do not mutate).
+
+        With at most one key this is an existing index list, returned in
+        O(1). Several keys are intersected by scanning the smallest list.
+        """
+        filters = [
+            (index, attribute, value)
+            for index, attribute, value in (
+                (self._categories, "category", category),
+                (self._authors, "author", author),
+                (self._languages, "language", language),
+            )
+            if value is not None
+        ]
+        if not filters:
+            return self._ids
+        lists = [index.get(value) for index, _, value in filters]
+        if len(lists) == 1:
+            return lists[0]
+        smallest = min(range(len(lists)), key=lambda position: len(lists[position]))
+        checks = [
+            (attribute, fold_key(value))
+            for position, (_, attribute, value) in enumerate(filters)
+            if position != smallest
+        ]
+        by_id = self._by_id
+        return [
+            quote_id
+            for quote_id in lists[smallest]
+            if all(
+                fold_key(getattr(by_id[quote_id], attribute) or "") == key
+                for attribute, key in checks
+            )
+        ]
+
+    def count_category(self, category: str) -> int:
+        """Return the number of quotes in a category."""
+        return len(self._categories.get(category))
+
+    def count_author(self, author: str) -> int:
+        """Return the number of quotes by an author."""
+        return len(self._authors.get(author))
+
+    def categories(self) -> List[str]:
+        """Return the distinct category names."""
+        return self._categories.names()
+
+    def authors(self) -> List[str]:
+        """Return the distinct author names."""
+        return self._authors.names()
+
+    def languages(self) -> List[str]:
+        """Return the distinct language codes."""
+        return self._languages.names()
+
+    def similar_categories(
+        self, category: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """Return the category names closest to a misspelled one, with their score."""
+        return self._categories.similar(category, limit, min_score)
+
+    def similar_authors(
+        self, author: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """Return the author names closest to a misspelled one, with their score."""
+        return self._authors.similar(author, limit, min_score)
+
+    @property
+    def fingerprint(self) -> int:
+        """
+        Content hash of the corpus, identical in every process holding it.
+
+        It is the XOR of per-quote digests: computed in one pass on first
+        use, then kept current by each write in O(1).
+        """
+        if self._fingerprint is None:
+            fingerprint = 0
+            for quote in self._by_id.values():
+                fingerprint ^= _row_digest(quote)
+            self._fingerprint = fingerprint
+        return self._fingerprint
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return collection statistics.
+
+        The per-key counts are the lengths of the index lists, which every
+        write already maintains; the snapshot is assembled at most once per
+        store version, so repeated reads cost O(1). Do not mutate it.
+        """
+        if self._stats is None or self._stats[0] != self.version:
+            categories = self._categories.counts()
+            authors = self._authors.counts()
+            self._stats = (
+                self.version,
+                {
+                    "total_quotes": len(self._by_id),
+                    "total_categories": len(categories),
+                    "total_authors": len(authors),
+                    "categories": categories,
+                    "authors": authors,
+                    "language_distribution": self._languages.counts(),
+                },
+            )
+        return self._stats[1]
+
+    def next_id(self) -> int:
+        """Return the id the next inserted quote will receive."""
+        return self._ids[-1] + 1 if self._ids else 1
+
+    def add(self, quote: Quote) -> QuoteRecord:
+        """
+        Insert a quote, assigning the next free id when it has none.
+
+        Args:
+            quote: Quote to insert
+
+        Returns:
+            The stored record
+
+        Raises:
+            ValidationError: If a quote with the same id already exists
+        """
+        if quote.id is None:
+            record = QuoteRecord.from_quote(quote, id=self.next_id())
+        elif quote.id in self._by_id:
+            raise ValidationError("Duplicate quote id", field="id", value=quote.id)
+        else:
+            record = QuoteRecord.from_quote(quote)
+
+        self._by_id[record.id] = record
+        if not self._ids or self._ids[-1] < record.id:
+            self._ids.append(record.id)
+        else:
+            bisect.insort(self._ids, record.id)
+        self._index(record)
+        self._toggle_fingerprint(record)
+        self.version = next(_versions)
+        return record
+
+    def update(self, quote: Quote) -> QuoteRecord:
+        """
+        Replace a stored quote, re-indexing the fields that changed.
+
+        Args:
+            quote: New version of the quote; its id selects the row
+
+        Returns:
+            The stored record
+
+        Raises:
+            QuoteNotFoundError: If no quote has this id
+        """
+        previous = self._by_id.get(quote.id) if quote.id is not None else None
+        if previous is None:
+            raise QuoteNotFoundError(quote_id=quote.id)
+
+        record = QuoteRecord.from_quote(quote)
+        self._unindex(previous)
+        self._toggle_fingerprint(previous)
+        self._by_id[record.id] = record
+        self._index(record)
+        self._toggle_fingerprint(record)
+        self.version = next(_versions)
+        return record
+
+    def delete(self, quote_id: int) -> QuoteRecord:
+        """
+        Remove a quote.
+
+        Args:
+            quote_id: ID of the quote to remove
+
+        Returns:
+            The removed record
+
+        Raises:
+            QuoteNotFoundError: If no quote has this id
+        """
+        record = self._by_id.pop(quote_id, None)
+        if record is None:
+            raise QuoteNotFoundError(quote_id=quote_id)
+
+        del self._ids[bisect.bisect_left(self._ids, quote_id)]
+        self._unindex(record)
+        self._toggle_fingerprint(record)
+        self.version = next(_versions)
+        return record
+
+    def _toggle_fingerprint(self, record: QuoteRecord) -> None:
+        # XOR adds a quote to the fingerprint and removes it again.
+        if self._fingerprint is not None:
+            self._fingerprint ^= _row_digest(record)
+
+    def _resolve(
+        self, ids: List[int], after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[QuoteRecord]:
+        start = bisect.bisect_right(ids, after) if after is not None else 0
+        stop = start + limit if limit is not None else None
+        by_id = self._by_id
+        return [by_id[quote_id] for quote_id in ids[start:stop]]
+
+    def _index(self, record: QuoteRecord, keep_sorted: bool = True) -> None:
+        self._categories.add(record.category, record.id, keep_sorted)
+        self._authors.add(record.author, record.id, keep_sorted)
+        self._languages.add(record.language, record.id, keep_sorted)
+
+    def _unindex(self, record: QuoteRecord) -> None:
+        self._categories.remove(record.category, record.id)
+        self._authors.remove(record.author, record.id)
+        self._languages.remove(record.language, record.id)
@@ -0,0 +1,223 @@
+"""
+Random quote selection: filtered pools, weighted draws and no-repeat sessions.
+"""
+
+import random
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from quotes_api.utils.exceptions import ValidationError
+
+#: Weightings accepted by RandomSelector, mapping a pool of ids (ascending)
+#: to one weight per id.
+WEIGHTINGS: Dict[str, Callable[[Sequence[int]], List[float]]] = {
+    # Ids are assigned in insertion order: a higher id is a newer quote.
+    # The newest quote of a pool is drawn len(pool) times as often as the oldest.
+    "recency": lambda ids: [float(rank) for rank in range(1, len(ids) + 1)],
+}
+
+
+class AliasTable:
+    """
+    Walker/Vose alias table: O(n) to build, O(1) per weighted draw.
+
+    Every slot holds a probability and an alias; a draw picks a slot
+    uniformly and keeps it or jumps to its alias with one coin flip.
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        """
+        Build the table.
+
+        Args:
+            weights: Non-negative weights, at least one positive
+
+        Raises:
+            ValidationError: If no weight is positive
+        """
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValidationError(
+                "Weights must contain a positive value", field="weights"
+            )
+
+        scaled = [weight * count / total for weight in weights]
+        self._probability = [1.0] * count
+        self._alias = list(range(count))
+        small = [slot for slot, value in enumerate(scaled) if value < 1.0]
+        large = [slot for slot, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            lesser, greater = small.pop(), large.pop()
+            self._probability[lesser] = scaled[lesser]
+            self._alias[lesser] = greater
+            scaled[greater] -= 1.0 - scaled[lesser]
+            (small if scaled[greater] < 1.0 else large).append(greater)
+        # Leftovers are 1.0 up to rounding error and keep their own slot.
+
+    def __len__(self) -> int:
+        return len(self._alias)
+
+    def sample(self, rng: random.Random) -> int:
+        """Draw a slot with probability proportional to its weight."""
+        slot = rng.randrange(len(self._alias))
+        return slot if rng.random() < self._probability[slot] else self._alias[slot]
+
+
+class ShuffledCursor:
+    """
+    Cursor over a pseudo-random permutation of ``range(size)`` in O(1) memory.
+
+    The permutation is a keyed Feistel network over the smallest even power
+    of two covering ``size``, cycle-walked back into range, so no shuffled
+    array is stored: a session costs a few integers whatever the pool size.
+    """
+
+    __slots__ = ("size", "position", "_keys", "_half_bits", "_mask")
+
+    _ROUNDS = 4
+
+    def __init__(self, size: int, rng: random.Random):
+        """
+        Start a new permutation.
+
+        Args:
+            size: Number of positions to visit
+            rng: Source of the permutation key
+        """
+        self.size = size
+        self.position = 0
+        self._half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._mask = (1 << self._half_bits) - 1
+        self._keys = [rng.getrandbits(32) for _ in range(self._ROUNDS)]
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether every position has been visited."""
+        return self.position >= self.size
+
+    def next(self) -> int:
+        """Return the next position of the permutation."""
+        value = self.position
+        self.position += 1
+        while True:
+            value = self._feistel(value)
+            if value < self.size:
+                return value
+
+    def _feistel(self, value: int) -> int:
+        bits, mask = self._half_bits, self._mask
+        left, right = value >> bits, value & mask
+        for key in self._keys:
+            left, right = right, left ^ (((right * 0x9E3779B1) ^ key) >> 3 & mask)
+        return (left << bits) | right
+
+
+class RandomSelector:
+    """
+    Draws random quote ids from filtered pools.
+
+    A pool is the ascending list of ids matching the filters, as returned
+    by the storage backend; alias tables built from it are cached per pool
+    and corpus version. No-repeat sessions hold a ShuffledCursor per client
+    and pool, so a client sees every quote of a pool once before any repeats.
+    Both caches are bounded LRUs.
+    """
+
+    def __init__(self, max_tables: int = 256, max_sessions: int = 10_000):
+        """
+        Initialize the selector.
+
+        Args:
+            max_tables: Maximum number of cached alias tables
+            max_sessions: Maximum number of tracked no-repeat sessions
+        """
+        self.max_tables = max_tables
+        self.max_sessions = max_sessions
+        self._rng = random.Random()
+        self._tables: "OrderedDict[Hashable, Tuple[int, AliasTable]]" = OrderedDict()
+        self._sessions: "OrderedDict[Hashable, Tuple[int, ShuffledCursor]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def session_count(self) -> int:
+        """Number of tracked no-repeat sessions."""
+        return len(self._sessions)
+
+    def pick(
+        self,
+        pool: Sequence[int],
+        pool_key: Hashable,
+        version: int,
+        weighting: Optional[str] = None,
+        session: Optional[str] = None,
+    ) -> Optional[int]:
+        """
+        Draw an id from a pool.
+
+        Args:
+            pool: Ascending ids of the candidate quotes
+            pool_key: Identifies the filters the pool was built from
+            version: Corpus version the pool was read at
+            weighting: Name of a WEIGHTINGS entry; uniform when None
+            session: Client identifier enabling no-repeat mode
+
+        Returns:
+            The drawn id, or None when the pool is empty
+
+        Raises:
+            ValidationError: On an unknown weighting, or a weighting
+                combined with no-repeat mode
+        """
+        if weighting is not None and weighting not in WEIGHTINGS:
+            raise ValidationError(
+                "Unknown weighting", field="weighting", value=weighting
+            )
+        if weighting is not None and session is not None:
+            raise ValidationError(
+                "Weighting cannot be combined with no-repeat mode", field="weighting"
+            )
+        if not pool:
+            return None
+        with self._lock:
+            if session is not None:
+                return pool[
+                    self._next_in_session((session, pool_key), len(pool), version)
+                ]
+            if weighting is not None:
+                return pool[
+                    self._table(pool, (weighting, pool_key), version, weighting).sample(
+                        self._rng
+                    )
+                ]
+            return pool[self._rng.randrange(len(pool))]
+
+    def _table(
+        self, pool: Sequence[int], key: Hashable, version: int, weighting: str
+    ) -> AliasTable:
+        # Caller holds the lock.
+        cached = self._tables.get(key)
+        if cached is not None and cached[0] == version:
+            self._tables.move_to_end(key)
+            return cached[1]
+        table = AliasTable(WEIGHTINGS[weighting](pool))
+        self._tables[key] = (version, table)
+        self._tables.move_to_end(key)
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def _next_in_session(self, key: Hashable, size: int, version: int) -> int:
+        # Caller holds the lock. A new corpus version starts a new cycle.
+        cached = self._sessions.get(key)
+        cursor = cached[1] if cached is not None and cached[0] == version else None
+        if cursor is None or cursor.size != size or cursor.exhausted:
+            cursor = ShuffledCursor(size, self._rng)
+        self._sessions[key] = (version, cursor)
+        self._sessions.move_to_end(key)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return cursor.next()
@@ -0,0 +1,194 @@
+"""
+Bounded cache of encoded API responses.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class ResponseCache:
+    """
+    LRU cache of encoded response bodies.
+
+    Entries are tagged with the corpus version they were rendered from. When
+    a lookup carries a newer version the whole cache is dropped, so a write
+    to the corpus invalidates every cached response at once. Lookups from
+    an older version (a request still reading a snapshot pinned before the
+    write) are misses and leave the cache alone. Size is bounded both by
+    entry count and by total body bytes.
+
+    An entry may also hold encoded variants of its body (gzip, br), so each
+    is compressed once per corpus version. Variants are counted in the
+    byte budget and evicted with their entry.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._variants: Dict[Hashable, Dict[str, bytes]] = {}
+        self._version: Optional[int] = None
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.variant_hits: Dict[str, int] = {}
+        self.variant_misses: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        """
+        Return the cached body for a key, if rendered from this version.
+
+        Args:
+            key: Route and parameters identifying the response
+            version: Current corpus version
+
+        Returns:
+            Encoded body or None on a miss
+        """
+        with self._lock:
+            body = self._entries.get(key) if self._check_version(version) else None
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Hashable, version: int, body: bytes) -> None:
+        """
+        Store an encoded body, evicting least recently used entries.
+
+        Args:
+            key: Route and parameters identifying the response
+            version: Corpus version the body was rendered from
+            body: Encoded response body
+        """
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                # Rendered from a superseded corpus version.
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = body
+            self._bytes += len(body)
+            self._evict()
+
+    def get_variant(
+        self, key: Hashable, version: int, encoding: str
+    ) -> Optional[bytes]:
+        """
+        Return an encoded variant of a cached body, if stored.
+
+        Args:
+            key: Route and parameters identifying the response
+            version: Current corpus version
+            encoding: Content coding, e.g. "gzip"
+
+        Returns:
+            Encoded variant or None on a miss
+        """
+        with self._lock:
+            variant = None
+            if self._check_version(version):
+                variant = self._variants.get(key, {}).get(encoding)
+            counters = self.variant_misses if variant is None else self.variant_hits
+            counters[encoding] = counters.get(encoding, 0) + 1
+            return variant
+
+    def put_variant(
+        self, key: Hashable, version: int, encoding: str, body: bytes
+    ) -> None:
+        """
+        Store an encoded variant next to the cached body it was derived from.
+
+        Ignored when that body is no longer cached.
+
+        Args:
+            key: Route and parameters identifying the response
+            version: Corpus version the body was rendered from
+            encoding: Content coding, e.g. "gzip"
+            body: Encoded variant
+        """
+        with self._lock:
+            if version != self._version or key not in self._entries:
+                return
+            variants = self._variants.setdefault(key, {})
+            previous = variants.get(encoding)
+            if previous is not None:
+                self._bytes -= len(previous)
+            variants[encoding] = body
+            self._bytes += len(body)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._variants.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "variants": {
+                encoding: {
+                    "hits": self.variant_hits.get(encoding, 0),
+                    "misses": self.variant_misses.get(encoding, 0),
+                }
+                for encoding in sorted({*self.variant_hits, *self.variant_misses})
+            },
+        }
+
+    def _check_version(self, version: int) -> bool:
+        """Drop the cache on a newer version; return whether ``version`` is current."""
+        # Caller holds the lock.
+        if version == self._version:
+            return True
+        if self._version is not None and version < self._version:
+            return False
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._variants.clear()
+        self._bytes = 0
+        self._version = version
+        return True
+
+    def _drop(self, key: Hashable) -> None:
+        # Caller holds the lock.
+        self._bytes -= len(self._entries.pop(key))
+        for variant in self._variants.pop(key, {}).values():
+            self._bytes -= len(variant)
+
+    def _evict(self) -> None:
+        # Caller holds the lock.
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
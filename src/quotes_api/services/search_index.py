@@ -0,0 +1,495 @@
+"""
+Inverted-index full-text search over quotes.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import unicodedata
+from functools import lru_cache
+from typing import (
+    Container,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from quotes_api.models.quote import Quote
+
+_TOKEN_RE = re.compile(r"\w+")
+_LIGATURES = str.maketrans({"œ": "oe", "Œ": "OE", "æ": "ae", "Æ": "AE", "ß": "ss"})
+
+
+def fold_text(text: str) -> str:
+    """
+    Normalize text for matching: case-fold and strip accents.
+
+    "Cœur", "coeur" and "COEUR" all fold to "coeur"; "Succès" folds to "succes".
+    """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.translate(_LIGATURES))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=1 << 16)
+def _fold_token(token: str) -> str:
+    return fold_text(token)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into folded word tokens."""
+    if text.isascii():
+        return _TOKEN_RE.findall(text.lower())
+    # Fold per token rather than per text: the vocabulary is far smaller than
+    # the corpus, so folding is mostly cache hits.
+    return [
+        _fold_token(token)
+        for token in _TOKEN_RE.findall(unicodedata.normalize("NFC", text))
+    ]
+
+
+def expand_token(
+    token: str,
+    prefix: bool,
+    terms: Sequence[str],
+    known: Container[str],
+    max_expansions: int,
+) -> List[str]:
+    """
+    Return the indexed terms a query token matches.
+
+    Args:
+        token: Folded query token
+        prefix: Also match the terms starting with ``token``
+        terms: Every indexed term, sorted
+        known: Membership test over the indexed terms
+        max_expansions: Maximum number of terms a prefix expands to
+    """
+    matched = [token] if token in known else []
+    if not prefix:
+        return matched
+
+    position = bisect.bisect_right(terms, token)
+    while (
+        position < len(terms)
+        and len(matched) < max_expansions
+        and terms[position].startswith(token)
+    ):
+        matched.append(terms[position])
+        position += 1
+    return matched
+
+
+class _Document(Protocol):
+    """Fields the index reads from a stored quote (a Quote or a QuoteRecord)."""
+
+    id: int
+    text: str
+    author: Optional[str]
+    category: Optional[str]
+
+
+def _document_tokens(quote: Union[Quote, _Document]) -> List[str]:
+    tokens = tokenize(quote.text)
+    if quote.author:
+        tokens.extend(tokenize(quote.author))
+    if quote.category:
+        tokens.extend(tokenize(quote.category))
+    return tokens
+
+
+class SearchIndex:
+    """
+    BM25-ranked inverted index over quote text, author and category.
+
+    Every query token must match (AND semantics). The last token is also
+    matched as a prefix so that partial words typed by a user still hit;
+    prefix expansion is capped at ``max_expansions`` terms. The index is
+    built in bulk from an initial corpus and maintained incrementally
+    through ``add``/``remove``, in place or on a ``copy()``.
+    """
+
+    def __init__(
+        self,
+        quotes: Iterable[_Document] = (),
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_expansions: int = 50,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            quotes: Initial corpus
+            k1: BM25 term-frequency saturation
+            b: BM25 length normalization
+            max_expansions: Maximum number of terms a prefix expands to
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_expansions = max_expansions
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._terms: List[str] = []
+        self._ranked_cache: Dict[str, List[int]] = {}
+        # Terms whose postings this index may mutate; None when it owns them all.
+        self._owned: Optional[Set[str]] = None
+        # (document count, total length, document frequencies) of the whole
+        # corpus when this index holds one shard of it.
+        self._shared: Optional[Tuple[int, int, Dict[str, int]]] = None
+
+        for quote in quotes:
+            self._add_postings(quote.id, _document_tokens(quote))
+        self._terms = sorted(self._postings)
+
+    @classmethod
+    def from_tokens(cls, documents: Iterable[Tuple[int, List[str]]]) -> "SearchIndex":
+        """
+        Build an index from already tokenized documents.
+
+        Lets a backend index its rows without materializing quotes.
+
+        Args:
+            documents: (quote id, folded tokens of text, author and category) pairs
+        """
+        index = cls()
+        for quote_id, tokens in documents:
+            index._add_postings(quote_id, tokens)
+        index._terms = sorted(index._postings)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct indexed terms."""
+        return len(self._postings)
+
+    @property
+    def posting_count(self) -> int:
+        """Number of (term, quote) postings."""
+        return sum(len(postings) for postings in self._postings.values())
+
+    def copy(self) -> "SearchIndex":
+        """
+        Return a copy sharing its postings with this index.
+
+        The term map, document lengths and term list are copied; the
+        postings of a term are copied the first time the copy writes to
+        them, so this index never changes under its readers.
+        """
+        clone = SearchIndex.__new__(SearchIndex)
+        clone.k1 = self.k1
+        clone.b = self.b
+        clone.max_expansions = self.max_expansions
+        clone._postings = dict(self._postings)
+        clone._doc_lengths = dict(self._doc_lengths)
+        clone._total_length = self._total_length
+        clone._terms = list(self._terms)
+        clone._ranked_cache = {}
+        clone._owned = set()
+        clone._shared = self._shared
+        return clone
+
+    def corpus_statistics(self) -> Tuple[int, int, Dict[str, int]]:
+        """Return the document count, total length and document frequency per term."""
+        return (
+            len(self._doc_lengths),
+            self._total_length,
+            {term: len(postings) for term, postings in self._postings.items()},
+        )
+
+    def share_statistics(
+        self, doc_count: int, total_length: int, frequencies: Dict[str, int]
+    ) -> None:
+        """
+        Score as one shard of a larger corpus.
+
+        BM25 depends on corpus-wide statistics: with those of the whole
+        corpus (see ``corpus_statistics``), every shard scores a quote
+        exactly as a single index over the corpus would, so their results
+        can be merged by score.
+
+        Args:
+            doc_count: Number of quotes in the corpus
+            total_length: Number of tokens in the corpus
+            frequencies: Document frequency of each term of this shard
+        """
+        self._shared = (doc_count, total_length, frequencies)
+        self._ranked_cache.clear()
+
+    def add(self, quote: _Document) -> None:
+        """Index a quote."""
+        self._ranked_cache.clear()
+        for term in self._add_postings(quote.id, _document_tokens(quote)):
+            bisect.insort(self._terms, term)
+
+    def remove(self, quote: _Document) -> None:
+        """Remove a quote, as it was indexed, from the index."""
+        length = self._doc_lengths.pop(quote.id, None)
+        if length is None:
+            return
+        self._total_length -= length
+        self._ranked_cache.clear()
+        for term in set(_document_tokens(quote)):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings = self._writable(term, postings)
+            postings.pop(quote.id, None)
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank the quotes matching a query.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results; all matches when None
+
+        Returns:
+            (quote_id, score) pairs, best first
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        # Each query token maps to the group of indexed terms it matches.
+        groups = [self._expand(token, prefix=False) for token in tokens[:-1]]
+        groups.append(self._expand(tokens[-1], prefix=True))
+        return self.rank(groups, limit)
+
+    def rank(
+        self, groups: List[List[str]], limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Rank the quotes matching a query already expanded into term groups.
+
+        A quote matches when it holds at least one term of every group;
+        terms this index does not hold are ignored.
+
+        Args:
+            groups: Indexed terms matched by each query token
+            limit: Maximum number of results; all matches when None
+
+        Returns:
+            (quote_id, score) pairs, best first
+        """
+        if not self._doc_lengths:
+            return []
+        postings = self._postings
+        groups = [[term for term in group if term in postings] for group in groups]
+        if not groups or not all(groups):
+            return []
+
+        scorer = _Scorer(self)
+        if limit is None:
+            return self._rank_all(scorer, groups)
+        return self._rank_top(scorer, groups, limit)
+
+    def _rank_all(
+        self, scorer: "_Scorer", groups: List[List[str]]
+    ) -> List[Tuple[int, float]]:
+        """Score every match."""
+        # Every match holds the most selective token: enumerate its quotes.
+        driver = min(
+            groups, key=lambda group: sum(len(self._postings[t]) for t in group)
+        )
+        candidates: Set[int] = set()
+        for term in driver:
+            candidates.update(self._postings[term])
+        results = []
+        for quote_id in candidates:
+            score = scorer.match(groups, quote_id)
+            if score is not None:
+                results.append((quote_id, score))
+        results.sort(key=_rank_key)
+        return results
+
+    def _rank_top(
+        self, scorer: "_Scorer", groups: List[List[str]], limit: int
+    ) -> List[Tuple[int, float]]:
+        """Find the ``limit`` best matches without scoring every match."""
+        # Threshold algorithm: walk every token's quotes in descending score
+        # order in lockstep and stop once the sum of the current scores, the
+        # best any unseen quote could reach, falls below the k-th best result.
+        cursors = [scorer.ranked(group) for group in groups]
+        frontier = [0.0] * len(groups)
+        heap: List[Tuple[float, int]] = []
+        seen = set()
+        while True:
+            for position, cursor in enumerate(cursors):
+                item = next(cursor, None)
+                if item is None:
+                    # A match must appear in every list, so all were seen.
+                    return self._drain(heap)
+                frontier[position], quote_id = item
+                if quote_id in seen:
+                    continue
+                seen.add(quote_id)
+                score = scorer.match(groups, quote_id)
+                if score is None:
+                    continue
+                entry = (score, -quote_id)
+                if len(heap) < limit:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            if len(heap) >= limit and sum(frontier) < heap[0][0]:
+                return self._drain(heap)
+
+    @staticmethod
+    def _drain(heap: List[Tuple[float, int]]) -> List[Tuple[int, float]]:
+        return sorted(((-neg_id, score) for score, neg_id in heap), key=_rank_key)
+
+    def _ranked_ids(self, term: str) -> List[int]:
+        """Return a term's quote ids by descending score, cached until a write."""
+        ranked = self._ranked_cache.get(term)
+        if ranked is None:
+            postings = self._postings[term]
+            scorer = _Scorer(self)
+            ranked = sorted(
+                postings,
+                key=lambda quote_id: (
+                    -scorer.term_score(1.0, postings[quote_id], quote_id),
+                    quote_id,
+                ),
+            )
+            self._ranked_cache[term] = ranked
+        return ranked
+
+    def _add_postings(self, quote_id: int, tokens: List[str]) -> List[str]:
+        """Index a quote's tokens and return the terms that were new."""
+        self._doc_lengths[quote_id] = len(tokens)
+        self._total_length += len(tokens)
+
+        new_terms = []
+        for term in tokens:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                new_terms.append(term)
+                if self._owned is not None:
+                    self._owned.add(term)
+            else:
+                postings = self._writable(term, postings)
+            postings[quote_id] = postings.get(quote_id, 0) + 1
+        return new_terms
+
+    def _writable(self, term: str, postings: Dict[int, int]) -> Dict[int, int]:
+        if self._owned is None or term in self._owned:
+            return postings
+        postings = self._postings[term] = dict(postings)
+        self._owned.add(term)
+        return postings
+
+    def _expand(self, token: str, prefix: bool) -> List[str]:
+        """Return the indexed terms matched by a query token."""
+        return expand_token(
+            token, prefix, self._terms, self._postings, self.max_expansions
+        )
+
+
+def _rank_key(item: Tuple[int, float]) -> Tuple[float, int]:
+    return -item[1], item[0]
+
+
+class _Scorer:
+    """BM25 scoring against a snapshot of the index statistics."""
+
+    def __init__(self, index: SearchIndex):
+        self._index = index
+        self._postings = index._postings
+        self._doc_lengths = index._doc_lengths
+        self._frequencies: Optional[Dict[str, int]] = None
+        if index._shared is None:
+            self._doc_count = len(index._doc_lengths)
+            total_length = index._total_length
+        else:
+            self._doc_count, total_length, self._frequencies = index._shared
+        self._avg_length = total_length / self._doc_count
+        self._k1 = index.k1
+        self._b = index.b
+        self._idfs: Dict[str, float] = {}
+
+    def idf(self, term: str) -> float:
+        idf = self._idfs.get(term)
+        if idf is None:
+            if self._frequencies is None:
+                df = len(self._postings[term])
+            else:
+                df = self._frequencies[term]
+            idf = self._idfs[term] = math.log(
+                1 + (self._doc_count - df + 0.5) / (df + 0.5)
+            )
+        return idf
+
+    def term_score(self, idf: float, tf: int, quote_id: int) -> float:
+        k1 = self._k1
+        norm = k1 * (
+            1 - self._b + self._b * self._doc_lengths[quote_id] / self._avg_length
+        )
+        return idf * tf * (k1 + 1) / (tf + norm)
+
+    def group_score(self, group: List[str], quote_id: int) -> Optional[float]:
+        """Best score of a quote over the terms a query token matched."""
+        best = None
+        for term in group:
+            tf = self._postings[term].get(quote_id)
+            if tf is not None:
+                score = self.term_score(self.idf(term), tf, quote_id)
+                if best is None or score > best:
+                    best = score
+        return best
+
+    def match(self, groups: List[List[str]], quote_id: int) -> Optional[float]:
+        """Total score of a quote, or None unless every group matches it."""
+        total = 0.0
+        for group in groups:
+            score = self.group_score(group, quote_id)
+            if score is None:
+                return None
+            total += score
+        return total
+
+    def ranked(self, group: List[str]) -> Iterator[Tuple[float, int]]:
+        """(score, quote_id) pairs over a group, by descending score."""
+        if len(group) == 1:
+            return iter(self._scored(group[0]))
+        return heapq.merge(
+            *(self._scored(term) for term in group),
+            key=lambda item: item[0],
+            reverse=True,
+        )
+
+    def _scored(self, term: str) -> "_ScoredView":
+        return _ScoredView(self, term)
+
+
+class _ScoredView:
+    """(score, quote_id) pairs computed lazily from the cached ranking of a term."""
+
+    def __init__(self, scorer: _Scorer, term: str):
+        self._scorer = scorer
+        self._postings = scorer._postings[term]
+        self._ids = scorer._index._ranked_ids(term)
+        self._idf = scorer.idf(term)
+
+    def __iter__(self) -> Iterator[Tuple[float, int]]:
+        term_score, idf, postings = self._scorer.term_score, self._idf, self._postings
+        for quote_id in self._ids:
+            yield term_score(idf, postings[quote_id], quote_id), quote_id
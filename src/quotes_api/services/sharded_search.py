@@ -0,0 +1,513 @@
+"""
+Full-text search sharded across worker processes.
+
+The corpus is split into N shards by quote id, each indexed by a
+SearchIndex in its own process, so that one query keeps up to N cores
+busy. The coordinator holds the corpus-wide vocabulary: it expands a query
+into term groups exactly as a single index would, and every shard scores
+with the statistics of the whole corpus (see
+SearchIndex.share_statistics). Each shard returns its best ``limit``
+matches and the coordinator merges them by score, so results are the same
+as those of one SearchIndex over the corpus.
+
+Where the platform forks, workers inherit the parent's corpus
+copy-on-write (the pages of an in-memory store, or the mapped file of a
+snapshot) and read their shard from that shared memory: the corpus is
+never serialized. Elsewhere each worker is sent its shard.
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import signal
+import threading
+import time
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from quotes_api.services.quote_store import QuoteRecord
+from quotes_api.services.search_index import (
+    SearchIndex,
+    _rank_key,
+    expand_token,
+    tokenize,
+)
+from quotes_api.services.storage import InMemoryBackend, QuoteBackend
+from quotes_api.utils.exceptions import ServiceUnavailableError
+from quotes_api.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Ranked = List[Tuple[int, float]]
+# What a shard process indexes: the backend itself (fork) or its records.
+_Source = Union[QuoteBackend, List[QuoteRecord]]
+
+
+class _Retired(Exception):
+    """Raised by a search that reached shards being replaced or closed."""
+
+
+def _documents(backend: QuoteBackend) -> Iterable[QuoteRecord]:
+    """Return what a backend's search indexes, as store records."""
+    if isinstance(backend, InMemoryBackend):
+        return backend.store
+    return (QuoteRecord.from_quote(quote) for quote in backend.page())
+
+
+def _context() -> Any:
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+def _serve_shard(
+    connection: Connection, source: _Source, shard: int, shards: int
+) -> None:
+    """Worker process: index one shard, then answer queries until told to stop."""
+    # Shutdown is driven by the parent, which stops its workers explicitly.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    try:
+        documents = _documents(source) if isinstance(source, QuoteBackend) else source
+        index = SearchIndex(
+            document for document in documents if document.id % shards == shard
+        )
+        connection.send((True, index.corpus_statistics()))
+        index.share_statistics(*connection.recv())
+    except Exception as exc:
+        connection.send((False, f"{type(exc).__name__}: {exc}"))
+        return
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        reply: Tuple[bool, Any]
+        try:
+            reply = (True, index.rank(*request))
+        except Exception as exc:
+            reply = (False, f"{type(exc).__name__}: {exc}")
+        connection.send(reply)
+
+
+class _Worker:
+    """One shard process and the parent's end of its pipe."""
+
+    def __init__(self, context: Any, source: _Source, shard: int, shards: int):
+        self.shard = shard
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_serve_shard,
+            args=(child, source, shard, shards),
+            name=f"quotes-search-shard-{shard}",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        # Serializes the requests of concurrent searches on the pipe.
+        self.lock = threading.Lock()
+
+    def receive(self, timeout: Optional[float]) -> Any:
+        """
+        Return the next reply of the worker.
+
+        Raises:
+            ServiceUnavailableError: If the worker failed, died or timed out
+        """
+        try:
+            if timeout is not None and not self.connection.poll(timeout):
+                raise ServiceUnavailableError(
+                    "search shard", {"shard": self.shard, "error": "timeout"}
+                )
+            ok, payload = self.connection.recv()
+        except (EOFError, OSError) as exc:
+            raise ServiceUnavailableError(
+                "search shard", {"shard": self.shard, "error": type(exc).__name__}
+            ) from exc
+        if not ok:
+            raise ServiceUnavailableError(
+                "search shard", {"shard": self.shard, "error": payload}
+            )
+        return payload
+
+    def stop(self, timeout: float, wait: float) -> None:
+        """
+        Ask the process to exit and reap it, killing it if it does not.
+
+        Args:
+            timeout: Seconds the process may take to exit
+            wait: Seconds to wait for the query in progress, if any
+        """
+        # Holding the lock lets the search in progress read its reply.
+        locked = self.lock.acquire(timeout=wait)
+        try:
+            try:
+                self.connection.send(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.connection.close()
+        finally:
+            if locked:
+                self.lock.release()
+
+
+class SearchShards:
+    """
+    Worker processes indexing one version of a corpus, one per shard.
+
+    Searches may run from several threads: each sends its query to every
+    shard before collecting the replies, so the shards work in parallel,
+    and a shard answers the queries of concurrent searches in turn. Any
+    failure of a worker breaks the whole set. Closing the set lets the
+    searches in progress finish; later ones raise _Retired.
+    """
+
+    def __init__(
+        self,
+        backend: QuoteBackend,
+        shards: int,
+        max_expansions: int = 50,
+        timeout: float = 30.0,
+    ):
+        """
+        Start the workers and wait until every shard is indexed.
+
+        Args:
+            backend: Backend whose current corpus is indexed
+            shards: Number of shards, and of worker processes
+            max_expansions: Maximum number of terms a prefix expands to
+            timeout: Seconds a shard may take to answer a query
+
+        Raises:
+            ServiceUnavailableError: If a worker fails to build its shard
+        """
+        self.version = backend.version
+        self.shards = max(1, shards)
+        self.max_expansions = max_expansions
+        self.timeout = timeout
+        self.broken = False
+        self.closed = False
+        self._workers: List[_Worker] = []
+        context = _context()
+        try:
+            for shard in range(self.shards):
+                if context.get_start_method() == "fork":
+                    source: _Source = backend
+                else:
+                    source = [
+                        d for d in _documents(backend) if d.id % self.shards == shard
+                    ]
+                self._workers.append(_Worker(context, source, shard, self.shards))
+
+            doc_count = total_length = 0
+            frequencies: Dict[str, int] = {}
+            shard_terms = []
+            for worker in self._workers:
+                count, length, shard_frequencies = worker.receive(None)
+                doc_count += count
+                total_length += length
+                for term, frequency in shard_frequencies.items():
+                    frequencies[term] = frequencies.get(term, 0) + frequency
+                shard_terms.append(shard_frequencies)
+            for worker, terms in zip(self._workers, shard_terms):
+                worker.connection.send(
+                    (
+                        doc_count,
+                        total_length,
+                        {term: frequencies[term] for term in terms},
+                    )
+                )
+        except BaseException:
+            self.close()
+            raise
+        self.doc_count = doc_count
+        self._frequencies = frequencies
+        self._terms = sorted(frequencies)
+
+    def search(self, query: str, limit: Optional[int] = None) -> Ranked:
+        """
+        Rank the quotes matching a query, as SearchIndex.search does.
+
+        Raises:
+            ServiceUnavailableError: If a worker failed; the set is then broken
+            _Retired: If the set was closed
+        """
+        if self.closed:
+            raise _Retired()
+        if self.broken:
+            raise ServiceUnavailableError("search shards", {"error": "broken"})
+        groups = self._groups(query)
+        if not groups:
+            return []
+        merged = heapq.merge(*self._gather(groups, limit), key=_rank_key)
+        return list(merged if limit is None else itertools.islice(merged, limit))
+
+    def _groups(self, query: str) -> List[List[str]]:
+        """Expand the query tokens into term groups; empty if one matches nothing."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        terms, frequencies, expansions = (
+            self._terms,
+            self._frequencies,
+            self.max_expansions,
+        )
+        groups = [
+            expand_token(token, False, terms, frequencies, expansions)
+            for token in tokens[:-1]
+        ]
+        groups.append(expand_token(tokens[-1], True, terms, frequencies, expansions))
+        return groups if all(groups) else []
+
+    def _gather(self, groups: List[List[str]], limit: Optional[int]) -> List[Ranked]:
+        """Send a query to every shard and collect their rankings."""
+        # Locks are taken in shard order, so concurrent searches cannot
+        # deadlock; each is released as soon as its shard has replied.
+        locked: List[_Worker] = []
+        results: List[Ranked] = []
+        try:
+            for worker in self._workers:
+                worker.lock.acquire()
+                locked.append(worker)
+                # close() stops a worker under its lock, after setting closed.
+                if self.closed:
+                    raise _Retired()
+                worker.connection.send((groups, limit))
+            while locked:
+                worker = locked[0]
+                results.append(worker.receive(self.timeout))
+                locked.pop(0).lock.release()
+        except (OSError, ValueError) as exc:
+            self.broken = True
+            raise ServiceUnavailableError(
+                "search shards", {"error": type(exc).__name__}
+            ) from exc
+        except _Retired:
+            raise
+        except BaseException:
+            self.broken = True
+            raise
+        finally:
+            for worker in locked:
+                worker.lock.release()
+        return results
+
+    def close(self) -> None:
+        """Stop the worker processes once the searches in progress are answered."""
+        self.closed = True
+        for worker in self._workers:
+            worker.stop(timeout=5.0, wait=self.timeout)
+        self._workers = []
+
+
+class ShardedSearch:
+    """
+    Keep SearchShards in step with the corpus a QuoteService publishes.
+
+    Shards index one corpus version. Searches of that version run on them;
+    searches of any other (a version whose shards are still being built,
+    or a snapshot pinned earlier) return None, and the caller falls back
+    to the backend's own index. A newer version is indexed by new workers
+    in a background thread once the corpus has not changed for
+    ``rebuild_delay`` seconds, so a burst of writes costs one rebuild; the
+    previous workers keep serving their version meanwhile.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        rebuild_delay: float = 1.0,
+        timeout: float = 30.0,
+        max_expansions: int = 50,
+    ):
+        """
+        Initialize the sharded search; no worker starts before ``follow``.
+
+        Args:
+            shards: Number of shards, and of worker processes
+            rebuild_delay: Seconds the corpus must stay unchanged before
+                its shards are rebuilt
+            timeout: Seconds a shard may take to answer a query
+            max_expansions: Maximum number of terms a prefix expands to
+        """
+        self.shards = max(1, shards)
+        self.rebuild_delay = rebuild_delay
+        self.timeout = timeout
+        self.max_expansions = max_expansions
+        self._current: Optional[SearchShards] = None
+        # Latest backend to index, and the highest version scheduled so far.
+        self._latest: Optional[QuoteBackend] = None
+        self._target = -1
+        self._builder: Optional[threading.Thread] = None
+        self._changed = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.builds = 0
+        self.failures = 0
+        self.searches = 0
+        self.fallbacks = 0
+        self.last_error: Optional[str] = None
+        self.last_build_ms: Optional[float] = None
+
+    @property
+    def version(self) -> Optional[int]:
+        """Corpus version the shards serve, None until they are built."""
+        current = self._current
+        return current.version if current is not None else None
+
+    def search(
+        self, backend: QuoteBackend, query: str, limit: Optional[int] = None
+    ) -> Optional[Ranked]:
+        """
+        Rank the quotes of a backend matching a query on the shards.
+
+        Returns:
+            (quote_id, score) pairs, best first, or None when the shards do
+            not serve this backend's version (a rebuild is then scheduled)
+        """
+        # A second attempt runs on the shards that replaced retired ones.
+        for _ in range(2):
+            current = self._current
+            if current is None or current.version != backend.version or current.broken:
+                break
+            try:
+                ranked = current.search(query, limit)
+            except _Retired:
+                continue
+            except ServiceUnavailableError as exc:
+                self._failed(exc)
+                with self._lock:
+                    if self._current is current:
+                        # Rebuild this very version.
+                        self._current = None
+                        self._target = -1
+                current.close()
+                break
+            with self._lock:
+                self.searches += 1
+            return ranked
+        self._fall_back(backend)
+        return None
+
+    def follow(self, backend: QuoteBackend) -> None:
+        """Schedule a background build of the shards of a newer backend."""
+        with self._lock:
+            if self._closed or backend.version <= self._target:
+                return
+            self._target = backend.version
+            self._latest = backend
+            self._changed.set()
+            if self._builder is None:
+                self._builder = threading.Thread(
+                    target=self._run, name="quotes-search-shards", daemon=True
+                )
+                self._builder.start()
+
+    def build(self, backend: QuoteBackend) -> bool:
+        """
+        Index a backend's corpus in new workers now and switch searches to them.
+
+        Returns:
+            Whether the new shards were published
+        """
+        start = time.perf_counter()
+        try:
+            shards = SearchShards(
+                backend, self.shards, self.max_expansions, self.timeout
+            )
+        except Exception as exc:
+            self._failed(exc)
+            return False
+        previous: Optional[SearchShards]
+        with self._lock:
+            if self._closed:
+                previous = shards
+            else:
+                previous, self._current = self._current, shards
+                self._target = max(self._target, shards.version)
+            self.builds += 1
+            self.last_build_ms = (time.perf_counter() - start) * 1e3
+        if previous is not None:
+            previous.close()
+        logger.info(
+            "Search shards built",
+            shards=self.shards,
+            version=shards.version,
+            quotes=shards.doc_count,
+            duration_ms=round(self.last_build_ms, 2),
+        )
+        return True
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no build is pending; return whether shards are being served."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                builder = self._builder
+            if builder is None:
+                return self._current is not None
+            builder.join(
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the served version, build outcome and search counters."""
+        return {
+            "shards": self.shards,
+            "version": self.version,
+            "building": self._builder is not None,
+            "builds": self.builds,
+            "failures": self.failures,
+            "searches": self.searches,
+            "fallbacks": self.fallbacks,
+            "last_error": self.last_error,
+            "last_build_ms": (
+                round(self.last_build_ms, 2) if self.last_build_ms is not None else None
+            ),
+        }
+
+    def close(self) -> None:
+        """Stop the builder and the worker processes."""
+        with self._lock:
+            self._closed = True
+            current, self._current = self._current, None
+            builder = self._builder
+            self._changed.set()
+        if builder is not None:
+            builder.join()
+        if current is not None:
+            current.close()
+
+    def _run(self) -> None:
+        while True:
+            # Build once no newer version has shown up for rebuild_delay.
+            while self._changed.wait(self.rebuild_delay):
+                self._changed.clear()
+                if self._closed:
+                    break
+            with self._lock:
+                backend, self._latest = self._latest, None
+                if backend is None or self._closed:
+                    self._builder = None
+                    return
+            self.build(backend)
+
+    def _fall_back(self, backend: QuoteBackend) -> None:
+        with self._lock:
+            self.fallbacks += 1
+        self.follow(backend)
+
+    def _failed(self, exc: Exception) -> None:
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(exc).__name__}: {exc}"
+        logger.error("Sharded search failed", shards=self.shards, exc_info=exc)
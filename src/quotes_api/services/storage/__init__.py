@@ -0,0 +1,16 @@
+"""
+Storage backends for quotes.
+"""
+
+from .base import QuoteBackend
+from .memory import InMemoryBackend
+from .snapshot import SnapshotBackend, build_snapshot
+from .sqlite import SQLiteBackend
+
+__all__ = [
+    "QuoteBackend",
+    "InMemoryBackend",
+    "SQLiteBackend",
+    "SnapshotBackend",
+    "build_snapshot",
+]
@@ -0,0 +1,198 @@
+"""
+Storage backend interface.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.fuzzy_index import FuzzyIndex
+
+
+class QuoteBackend(ABC):
+    """
+    Storage behind QuoteService.
+
+    Backends own the corpus and every index over it. Paged methods return
+    quotes in id order after ``after`` (exclusive), up to ``limit`` quotes.
+    """
+
+    #: Whether calls do blocking I/O and must run off the event loop.
+    blocking: bool = False
+
+    # (version, FuzzyIndex) of the category and author names, by kind.
+    _fuzzy_indexes: Optional[Dict[str, Tuple[int, FuzzyIndex]]] = None
+
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Corpus version; changes on every write."""
+
+    @property
+    @abstractmethod
+    def fingerprint(self) -> int:
+        """Content hash of the corpus, stable across processes."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Return the number of quotes."""
+
+    @abstractmethod
+    def get(self, quote_id: int) -> Optional[Quote]:
+        """Return the quote with the given id, if any."""
+
+    def get_many(self, quote_ids: Sequence[int]) -> List[Optional[Quote]]:
+        """Return the quote of every id, None where it does not exist, in order."""
+        return [self.get(quote_id) for quote_id in quote_ids]
+
+    @abstractmethod
+    def random(self) -> Optional[Quote]:
+        """Return a random quote, or None when empty."""
+
+    @abstractmethod
+    def random_pool(
+        self,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Sequence[int]:
+        """
+        Return the ascending ids of the quotes matching every given filter.
+
+        The result may be a live view of an index: do not mutate it.
+        """
+
+    @abstractmethod
+    def page(
+        self, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        """Return quotes in id order."""
+
+    @abstractmethod
+    def by_category(
+        self, category: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        """Return the quotes of a category, case-insensitively."""
+
+    @abstractmethod
+    def by_author(
+        self, author: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        """Return the quotes of an author, case-insensitively."""
+
+    @abstractmethod
+    def by_language(
+        self, language: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        """Return the quotes in a language, case-insensitively."""
+
+    @abstractmethod
+    def count_category(self, category: str) -> int:
+        """Return the number of quotes in a category."""
+
+    @abstractmethod
+    def count_author(self, author: str) -> int:
+        """Return the number of quotes by an author."""
+
+    @abstractmethod
+    def categories(self) -> List[str]:
+        """Return the distinct category names."""
+
+    @abstractmethod
+    def authors(self) -> List[str]:
+        """Return the distinct author names."""
+
+    def similar_categories(
+        self, category: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """
+        Return the category names closest to a possibly misspelled one.
+
+        Returns:
+            (name, score) pairs, best first (see FuzzyIndex.match)
+        """
+        return self._fuzzy_index("categories", self.categories).match(
+            category, limit, min_score
+        )
+
+    def similar_authors(
+        self, author: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        """
+        Return the author names closest to a possibly misspelled one.
+
+        Returns:
+            (name, score) pairs, best first (see FuzzyIndex.match)
+        """
+        return self._fuzzy_index("authors", self.authors).match(
+            author, limit, min_score
+        )
+
+    def _fuzzy_index(self, kind: str, names: Callable[[], List[str]]) -> FuzzyIndex:
+        """Return the fuzzy index of a kind of names, rebuilt once per version."""
+        if self._fuzzy_indexes is None:
+            self._fuzzy_indexes = {}
+        version = self.version
+        cached = self._fuzzy_indexes.get(kind)
+        if cached is None or cached[0] != version:
+            cached = self._fuzzy_indexes[kind] = (version, FuzzyIndex(names()))
+        return cached[1]
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Return collection statistics (see QuoteStore.stats)."""
+
+    @abstractmethod
+    def search(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Quote]:
+        """Return quotes matching a full-text query, best first."""
+
+    @abstractmethod
+    def add(self, quote: Quote) -> Quote:
+        """Insert a quote, assigning the next free id when it has none."""
+
+    @abstractmethod
+    def update(self, quote: Quote) -> Quote:
+        """Replace a stored quote."""
+
+    @abstractmethod
+    def delete(self, quote_id: int) -> Quote:
+        """Remove a quote and return it."""
+
+    def begin_write(self) -> "QuoteBackend":
+        """
+        Return the backend a batch of writes is applied to.
+
+        Backends whose readers are isolated from writes by their storage
+        (e.g. transactions) return ``self``. The others return a private
+        copy that the caller publishes once every write of the batch is
+        applied, so readers see all of them or none.
+        """
+        return self
+
+    @abstractmethod
+    def bulk_load(
+        self, quotes: Iterable[Quote], replace: bool = False
+    ) -> "QuoteBackend":
+        """
+        Load many quotes at once, building the indexes in one pass.
+
+        Readers never observe a partially loaded corpus: the backend either
+        commits the whole load at once, or builds a new backend that the
+        caller swaps in.
+
+        Args:
+            quotes: Quotes to insert; ids must be set and not already stored
+            replace: Drop the current corpus instead of appending to it
+
+        Returns:
+            The backend holding the new corpus, possibly ``self``
+        """
+
+    def index_stats(self) -> Dict[str, int]:
+        """Return sizes of backend-specific indexes, for metrics."""
+        return {}
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
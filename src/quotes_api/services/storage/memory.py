@@ -0,0 +1,190 @@
+"""
+In-memory storage backend.
+"""
+
+import itertools
+import random
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_store import QuoteRecord, QuoteStore
+from quotes_api.services.search_index import SearchIndex
+from quotes_api.services.storage.base import QuoteBackend
+
+
+def _quotes(records: List[QuoteRecord]) -> List[Quote]:
+    return [record.to_quote() for record in records]
+
+
+class InMemoryBackend(QuoteBackend):
+    """
+    Backend keeping the corpus in an indexed QuoteStore and a SearchIndex.
+
+    The store holds compact records; they are turned into Quote models
+    only for the rows a call returns. Writes mutate the backend in place:
+    QuoteService applies them to a ``begin_write`` copy instead, so the
+    published backend never changes while it is being read.
+    """
+
+    def __init__(self, quotes: Iterable[Union[Quote, QuoteRecord]] = ()):
+        """
+        Initialize the backend.
+
+        Args:
+            quotes: Initial corpus; every quote must carry a unique id
+        """
+        self._store: QuoteStore = QuoteStore(quotes)
+        self._search_index: SearchIndex = SearchIndex(self._store)
+
+    @classmethod
+    def _from_parts(
+        cls, store: QuoteStore, search_index: SearchIndex
+    ) -> "InMemoryBackend":
+        backend = cls.__new__(cls)
+        backend._store = store
+        backend._search_index = search_index
+        return backend
+
+    @property
+    def store(self) -> QuoteStore:
+        """Underlying indexed store."""
+        return self._store
+
+    @property
+    def search_index(self) -> SearchIndex:
+        """Full-text index used by search."""
+        return self._search_index
+
+    @property
+    def version(self) -> int:
+        return self._store.version
+
+    @property
+    def fingerprint(self) -> int:
+        return self._store.fingerprint
+
+    def count(self) -> int:
+        return len(self._store)
+
+    def get(self, quote_id: int) -> Optional[Quote]:
+        record = self._store.get(quote_id)
+        return record.to_quote() if record is not None else None
+
+    def get_many(self, quote_ids: Sequence[int]) -> List[Optional[Quote]]:
+        get = self._store.get
+        records = [get(quote_id) for quote_id in quote_ids]
+        return [record.to_quote() if record is not None else None for record in records]
+
+    def random(self) -> Optional[Quote]:
+        ids = self._store.ids()
+        return self.get(random.choice(ids)) if ids else None
+
+    def random_pool(
+        self,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Sequence[int]:
+        return self._store.matching_ids(category, author, language)
+
+    def page(
+        self, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return _quotes(self._store.page(after, limit))
+
+    def by_category(
+        self, category: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return _quotes(self._store.by_category(category, after, limit))
+
+    def by_author(
+        self, author: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return _quotes(self._store.by_author(author, after, limit))
+
+    def by_language(
+        self, language: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return _quotes(self._store.by_language(language, after, limit))
+
+    def count_category(self, category: str) -> int:
+        return self._store.count_category(category)
+
+    def count_author(self, author: str) -> int:
+        return self._store.count_author(author)
+
+    def categories(self) -> List[str]:
+        return self._store.categories()
+
+    def authors(self) -> List[str]:
+        return self._store.authors()
+
+    def similar_categories(
+        self, category: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        return self._store.similar_categories(category, limit, min_score)
+
+    def similar_authors(
+        self, author: str, limit: int = 5, min_score: float = 0.7
+    ) -> List[Tuple[str, float]]:
+        return self._store.similar_authors(author, limit, min_score)
+
+    def stats(self) -> Dict[str, Any]:
+        return self._store.stats()
+
+    def search(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Quote]:
+        if limit is not None:
+            limit += offset
+        get = self._store.get
+        ranked = self._search_index.search(query, limit)
+        records = [get(quote_id) for quote_id, _ in ranked[offset:]]
+        return [record.to_quote() for record in records if record is not None]
+
+    def begin_write(self) -> "InMemoryBackend":
+        """
+        Return a copy-on-write copy of this backend.
+
+        Copying costs one pass over the id and term maps; index lists and
+        postings are only copied when a write touches them.
+        """
+        return self._from_parts(self._store.copy(), self._search_index.copy())
+
+    def bulk_load(
+        self, quotes: Iterable[Quote], replace: bool = False
+    ) -> "InMemoryBackend":
+        """
+        Build a new backend holding this corpus (unless replaced) and ``quotes``.
+
+        The current backend is left untouched and keeps serving reads until
+        the caller swaps the new one in.
+        """
+        if replace:
+            return InMemoryBackend(quotes)
+        # The new store shares the existing records: no model round trip.
+        return InMemoryBackend(itertools.chain(self._store, quotes))
+
+    def index_stats(self) -> Dict[str, int]:
+        return {
+            "search_terms": self._search_index.term_count,
+            "search_postings": self._search_index.posting_count,
+        }
+
+    def add(self, quote: Quote) -> Quote:
+        stored = self._store.add(quote)
+        self._search_index.add(stored)
+        return stored.to_quote()
+
+    def update(self, quote: Quote) -> Quote:
+        previous = self._store.get(quote.id) if quote.id is not None else None
+        stored = self._store.update(quote)
+        if previous is not None:
+            self._search_index.remove(previous)
+        self._search_index.add(stored)
+        return stored.to_quote()
+
+    def delete(self, quote_id: int) -> Quote:
+        removed = self._store.delete(quote_id)
+        self._search_index.remove(removed)
+        return removed.to_quote()
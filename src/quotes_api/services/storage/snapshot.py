@@ -0,0 +1,497 @@
+"""
+Memory-mapped columnar corpus snapshots.
+
+Snapshots are built offline (``python -m quotes_api.cli snapshot``) and
+opened read-only with mmap.
+"""
+
+import bisect
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_store import _row_digest, _versions, fold_key
+from quotes_api.services.search_index import SearchIndex, tokenize
+from quotes_api.services.storage.base import QuoteBackend
+from quotes_api.utils.exceptions import ReadOnlyStorageError, ValidationError
+
+# The last byte is the format version; arrays are stored in native order.
+_MAGIC = b"QSNAP" + (b"L" if sys.byteorder == "little" else b"B") + b"\x00\x01"
+_HEADER = struct.Struct("<8sQQI")
+_SECTION = struct.Struct("<QQ")
+_KEYS = ("author", "category", "language")
+
+# Section layout, in file order, with the array typecode of each section
+# ("B" for UTF-8 blobs).
+_Typecode = Literal["q", "Q", "B", "i", "I"]
+_SECTIONS: List[Tuple[str, _Typecode]] = [
+    ("ids", "q"),
+    ("text_offsets", "Q"),
+    ("text", "B"),
+    ("created_offsets", "Q"),
+    ("created", "B"),
+    ("updated_offsets", "Q"),
+    ("updated", "B"),
+]
+for _key in _KEYS:
+    _SECTIONS += [
+        (f"{_key}_refs", "i"),
+        (f"{_key}_name_offsets", "Q"),
+        (f"{_key}_names", "B"),
+        (f"{_key}_fold_offsets", "Q"),
+        (f"{_key}_folds", "B"),
+        (f"{_key}_index_offsets", "Q"),
+        (f"{_key}_index", "I"),
+    ]
+
+
+def _encode_strings(values: Iterable[str]) -> Tuple[array, bytes]:
+    """Encode strings as an offset array and a UTF-8 blob."""
+    offsets = array("Q", [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def build_snapshot(quotes: Iterable[Quote], path: str) -> int:
+    """
+    Compile a corpus into a snapshot file.
+
+    Rows are stored in id order. Author, category and language values are
+    interned into per-key tables sorted by their case-folded key; each
+    table entry owns a sorted list of row positions (the prebuilt index).
+    The file is written next to ``path`` and renamed over it, so readers
+    never see a partial snapshot.
+
+    Args:
+        quotes: Corpus; every quote must carry a unique id
+        path: Output file
+
+    Returns:
+        Number of quotes written
+
+    Raises:
+        ValidationError: If a quote has no id or a duplicate one
+    """
+    rows = sorted(quotes, key=lambda quote: -1 if quote.id is None else quote.id)
+    if rows and rows[0].id is None:
+        raise ValidationError("Snapshot quotes must have an id", field="id")
+    for previous, quote in zip(rows, rows[1:]):
+        if previous.id == quote.id:
+            raise ValidationError("Duplicate quote id", field="id", value=quote.id)
+
+    sections: Dict[str, Any] = {"ids": array("q", (quote.id for quote in rows))}
+    sections["text_offsets"], sections["text"] = _encode_strings(q.text for q in rows)
+    sections["created_offsets"], sections["created"] = _encode_strings(
+        q.created_at.isoformat() if q.created_at else "" for q in rows
+    )
+    sections["updated_offsets"], sections["updated"] = _encode_strings(
+        q.updated_at.isoformat() if q.updated_at else "" for q in rows
+    )
+
+    fingerprint = 0
+    for quote in rows:
+        fingerprint ^= _row_digest(quote)
+
+    for key in _KEYS:
+        sections.update(_key_sections(rows, key))
+    _write_sections(path, sections, len(rows), fingerprint)
+    return len(rows)
+
+
+def _key_sections(rows: List[Quote], key: str) -> Dict[str, Any]:
+    """Build the name table and prebuilt index of one author/category/language key."""
+    # The first spelling seen for a folded key is its display name.
+    names: Dict[str, str] = {}
+    for quote in rows:
+        value = getattr(quote, key)
+        if value:
+            names.setdefault(fold_key(value), value)
+    folds = sorted(names)
+    positions = {folded: position for position, folded in enumerate(folds)}
+    postings: List[List[int]] = [[] for _ in folds]
+    refs = array("i")
+    for row, quote in enumerate(rows):
+        value = getattr(quote, key)
+        ref = positions[fold_key(value)] if value else -1
+        refs.append(ref)
+        if ref >= 0:
+            postings[ref].append(row)
+
+    sections: Dict[str, Any] = {f"{key}_refs": refs}
+    sections[f"{key}_name_offsets"], sections[f"{key}_names"] = _encode_strings(
+        names[folded] for folded in folds
+    )
+    sections[f"{key}_fold_offsets"], sections[f"{key}_folds"] = _encode_strings(folds)
+    index_offsets, index = array("Q", [0]), array("I")
+    for rows_of_key in postings:
+        index.extend(rows_of_key)
+        index_offsets.append(len(index))
+    sections[f"{key}_index_offsets"], sections[f"{key}_index"] = index_offsets, index
+    return sections
+
+
+def _write_sections(
+    path: str, sections: Dict[str, Any], count: int, fingerprint: int
+) -> None:
+    """Write the header, section table and sections, then rename over ``path``."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as output:
+        position = _HEADER.size + _SECTION.size * len(_SECTIONS)
+        table = []
+        payloads = []
+        for name, _ in _SECTIONS:
+            payload = sections[name]
+            data = payload.tobytes() if isinstance(payload, array) else payload
+            # Align every section on 8 bytes so it can be cast in place.
+            position += -position % 8
+            table.append(_SECTION.pack(position, len(data)))
+            payloads.append((position, data))
+            position += len(data)
+        output.write(_HEADER.pack(_MAGIC, count, fingerprint, len(_SECTIONS)))
+        output.write(b"".join(table))
+        for offset, data in payloads:
+            output.write(b"\x00" * (offset - output.tell()))
+            output.write(data)
+        output.flush()
+        os.fsync(output.fileno())
+    os.replace(temporary, path)
+
+
+class _Strings(Sequence[str]):
+    """String column decoded on access from an offset array and a UTF-8 blob."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:  # type: ignore[override]
+        return str(
+            self._blob[self._offsets[position] : self._offsets[position + 1]], "utf-8"
+        )
+
+
+class _RowIds(Sequence[int]):
+    """Ids of a list of row positions, resolved on access."""
+
+    def __init__(self, rows: Sequence[int], ids: memoryview):
+        self._rows = rows
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, position: int) -> int:  # type: ignore[override]
+        return self._ids[self._rows[position]]
+
+
+class _KeyTable:
+    """Interned values of one key with their prebuilt row index."""
+
+    def __init__(self, sections: Dict[str, memoryview], key: str):
+        self.refs = sections[f"{key}_refs"]
+        self._names = _Strings(
+            sections[f"{key}_name_offsets"], sections[f"{key}_names"]
+        )
+        self._folds = _Strings(
+            sections[f"{key}_fold_offsets"], sections[f"{key}_folds"]
+        )
+        self._index_offsets = sections[f"{key}_index_offsets"]
+        self._index = sections[f"{key}_index"]
+        self._decoded: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def name(self, ref: int) -> Optional[str]:
+        """Return the display name of a table entry, decoding it once."""
+        if ref < 0:
+            return None
+        name = self._decoded.get(ref)
+        if name is None:
+            name = self._decoded[ref] = sys.intern(self._names[ref])
+        return name
+
+    def names(self) -> List[str]:
+        return [name for name in map(self.name, range(len(self))) if name is not None]
+
+    def tokens(self) -> List[List[str]]:
+        """Return the search tokens of every table entry."""
+        return [tokenize(self._names[ref]) for ref in range(len(self))]
+
+    def find(self, value: str) -> int:
+        """Return the entry of a value, by binary search on its folded key, or -1."""
+        folded = fold_key(value)
+        position = bisect.bisect_left(self._folds, folded)
+        if position < len(self._folds) and self._folds[position] == folded:
+            return position
+        return -1
+
+    def rows(self, ref: int) -> memoryview:
+        """Return the sorted row positions of an entry."""
+        if ref < 0:
+            return self._index[0:0]
+        return self._index[self._index_offsets[ref] : self._index_offsets[ref + 1]]
+
+    def counts(self) -> Dict[str, int]:
+        offsets = self._index_offsets
+        counts: Dict[str, int] = {}
+        for ref in range(len(self)):
+            name = self.name(ref)
+            if name is not None:
+                counts[name] = offsets[ref + 1] - offsets[ref]
+        return dict(sorted(counts.items()))
+
+
+class SnapshotBackend(QuoteBackend):
+    """
+    Read-only backend serving a memory-mapped snapshot.
+
+    Opening a snapshot maps the file and reads its header; nothing is
+    decoded up front, so cold start and resident memory barely depend on
+    the corpus size, and every worker mapping the same file shares its
+    pages through the OS page cache. Quotes are materialized on access.
+    The full-text index is not stored in the snapshot: it is built from
+    the mapped rows on the first search.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a snapshot.
+
+        Args:
+            path: Snapshot file written by build_snapshot
+
+        Raises:
+            ValidationError: If the file is not a snapshot of this format
+        """
+        self.path = path
+        with open(path, "rb") as source:
+            self._mmap = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, count, fingerprint, section_count = _HEADER.unpack_from(view)
+        if magic != _MAGIC or section_count != len(_SECTIONS):
+            view.release()
+            self._mmap.close()
+            raise ValidationError("Unsupported snapshot file", field="path", value=path)
+
+        self._views = [view]
+        sections: Dict[str, memoryview] = {}
+        for position, (name, typecode) in enumerate(_SECTIONS):
+            offset, size = _SECTION.unpack_from(
+                view, _HEADER.size + position * _SECTION.size
+            )
+            section = view[offset : offset + size].cast(typecode)
+            self._views.append(section)
+            sections[name] = section
+
+        self._count = int(count)
+        self._fingerprint = int(fingerprint)
+        self._version: int = next(_versions)
+        self._ids = sections["ids"]
+        self._text = _Strings(sections["text_offsets"], sections["text"])
+        self._created = _Strings(sections["created_offsets"], sections["created"])
+        self._updated = _Strings(sections["updated_offsets"], sections["updated"])
+        self._tables = {key: _KeyTable(sections, key) for key in _KEYS}
+        self._stats: Optional[Dict[str, Any]] = None
+        self._search_index: Optional[SearchIndex] = None
+        self._search_lock = threading.Lock()
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            table._decoded.clear()
+        self._tables = {}
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def fingerprint(self) -> int:
+        return self._fingerprint
+
+    def count(self) -> int:
+        return self._count
+
+    def get(self, quote_id: int) -> Optional[Quote]:
+        row = bisect.bisect_left(self._ids, quote_id)
+        if row < self._count and self._ids[row] == quote_id:
+            return self._quote(row)
+        return None
+
+    def random(self) -> Optional[Quote]:
+        return self._quote(random.randrange(self._count)) if self._count else None
+
+    def random_pool(
+        self,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Sequence[int]:
+        filters = [
+            (table, table.find(value))
+            for table, value in (
+                (self._tables["category"], category),
+                (self._tables["author"], author),
+                (self._tables["language"], language),
+            )
+            if value is not None
+        ]
+        if not filters:
+            return self._ids
+        # Scan the smallest row list and check the other keys' refs.
+        filters.sort(key=lambda item: len(item[0].rows(item[1])))
+        (table, ref), others = filters[0], filters[1:]
+        rows: Sequence[int] = table.rows(ref)
+        if others:
+            rows = [
+                row for row in rows if all(other.refs[row] == r for other, r in others)
+            ]
+        return _RowIds(rows, self._ids)
+
+    def page(
+        self, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        start = self._first_row_after(after)
+        stop = self._count if limit is None else min(self._count, start + limit)
+        return [self._quote(row) for row in range(start, stop)]
+
+    def by_category(
+        self, category: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed("category", category, after, limit)
+
+    def by_author(
+        self, author: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed("author", author, after, limit)
+
+    def by_language(
+        self, language: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed("language", language, after, limit)
+
+    def count_category(self, category: str) -> int:
+        table = self._tables["category"]
+        return len(table.rows(table.find(category)))
+
+    def count_author(self, author: str) -> int:
+        table = self._tables["author"]
+        return len(table.rows(table.find(author)))
+
+    def categories(self) -> List[str]:
+        return self._tables["category"].names()
+
+    def authors(self) -> List[str]:
+        return self._tables["author"].names()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return collection statistics, computed once: the snapshot never changes."""
+        if self._stats is None:
+            categories = self._tables["category"].counts()
+            authors = self._tables["author"].counts()
+            self._stats = {
+                "total_quotes": self._count,
+                "total_categories": len(categories),
+                "total_authors": len(authors),
+                "categories": categories,
+                "authors": authors,
+                "language_distribution": self._tables["language"].counts(),
+            }
+        return self._stats
+
+    def search(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Quote]:
+        index = self._search_index
+        if index is None:
+            with self._search_lock:
+                if self._search_index is None:
+                    self._search_index = SearchIndex.from_tokens(self._documents())
+                index = self._search_index
+        if limit is not None:
+            limit += offset
+        quotes = [
+            self.get(quote_id) for quote_id, _ in index.search(query, limit)[offset:]
+        ]
+        return [quote for quote in quotes if quote is not None]
+
+    def add(self, quote: Quote) -> Quote:
+        raise ReadOnlyStorageError("snapshot")
+
+    def update(self, quote: Quote) -> Quote:
+        raise ReadOnlyStorageError("snapshot")
+
+    def delete(self, quote_id: int) -> Quote:
+        raise ReadOnlyStorageError("snapshot")
+
+    def bulk_load(
+        self, quotes: Iterable[Quote], replace: bool = False
+    ) -> "SnapshotBackend":
+        raise ReadOnlyStorageError("snapshot")
+
+    def _quote(self, row: int) -> Quote:
+        tables = self._tables
+        created, updated = self._created[row], self._updated[row]
+        # Rows were validated when the snapshot was built.
+        return Quote.model_construct(
+            id=self._ids[row],
+            text=self._text[row],
+            author=tables["author"].name(tables["author"].refs[row]),
+            category=tables["category"].name(tables["category"].refs[row]),
+            language=cast(str, tables["language"].name(tables["language"].refs[row])),
+            created_at=datetime.fromisoformat(created) if created else None,
+            updated_at=datetime.fromisoformat(updated) if updated else None,
+        )
+
+    def _documents(self) -> Iterator[Tuple[int, List[str]]]:
+        """Tokenize the mapped rows, each author and category only once."""
+        authors, categories = self._tables["author"], self._tables["category"]
+        author_tokens, category_tokens = authors.tokens(), categories.tokens()
+        for row in range(self._count):
+            tokens = tokenize(self._text[row])
+            if authors.refs[row] >= 0:
+                tokens.extend(author_tokens[authors.refs[row]])
+            if categories.refs[row] >= 0:
+                tokens.extend(category_tokens[categories.refs[row]])
+            yield self._ids[row], tokens
+
+    def _first_row_after(self, after: Optional[int]) -> int:
+        return 0 if after is None else bisect.bisect_right(self._ids, after)
+
+    def _keyed(
+        self, key: str, value: str, after: Optional[int], limit: Optional[int]
+    ) -> List[Quote]:
+        table = self._tables[key]
+        rows = table.rows(table.find(value))
+        # Row positions follow id order, so an id cursor maps to a row cursor.
+        start = bisect.bisect_left(rows, self._first_row_after(after))
+        stop = None if limit is None else start + limit
+        return [self._quote(row) for row in rows[start:stop]]
@@ -0,0 +1,577 @@
+"""
+SQLite storage backend.
+"""
+
+import itertools
+import queue
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_store import _row_digest, fold_key
+from quotes_api.services.search_index import _document_tokens, tokenize
+from quotes_api.services.storage.base import QuoteBackend
+from quotes_api.utils.exceptions import QuoteNotFoundError, ValidationError
+
+_COLUMNS = "id, text, author, category, language, created_at, updated_at"
+
+# Secondary indexes, dropped and rebuilt in one pass by bulk loads.
+_INDEXES = {
+    "quotes_by_category": "quotes (category_key, id)",
+    "quotes_by_author": "quotes (author_key, id)",
+    "quotes_by_language": "quotes (language_key, id)",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quotes (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL,
+    author TEXT,
+    category TEXT,
+    language TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    author_key TEXT,
+    category_key TEXT,
+    language_key TEXT NOT NULL
+);
+{indexes};
+CREATE VIRTUAL TABLE IF NOT EXISTS quotes_fts USING fts5 (body, content='');
+CREATE TABLE IF NOT EXISTS corpus_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+""".format(
+    indexes=";\n".join(
+        f"CREATE INDEX IF NOT EXISTS {name} ON {columns}"
+        for name, columns in _INDEXES.items()
+    )
+)
+
+# Filtered id pools cached for random draws, per (filters, version).
+_MAX_POOLS = 256
+
+_INSERT = (
+    "INSERT INTO quotes (id, text, author, category, language, created_at, updated_at, "
+    "author_key, category_key, language_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _to_signed(value: int) -> int:
+    # SQLite integers are signed 64-bit.
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _row(quote: Quote) -> Tuple[Any, ...]:
+    return (
+        quote.id,
+        quote.text,
+        quote.author,
+        quote.category,
+        quote.language,
+        _timestamp(quote.created_at),
+        _timestamp(quote.updated_at),
+        fold_key(quote.author) if quote.author else None,
+        fold_key(quote.category) if quote.category else None,
+        fold_key(quote.language),
+    )
+
+
+def _quote(row: Sequence[Any]) -> Quote:
+    # Rows were validated on the way in; skip validation on the way out.
+    return Quote.model_construct(
+        id=row[0],
+        text=row[1],
+        author=row[2],
+        category=row[3],
+        language=row[4],
+        created_at=datetime.fromisoformat(row[5]) if row[5] is not None else None,
+        updated_at=datetime.fromisoformat(row[6]) if row[6] is not None else None,
+    )
+
+
+def _document(quote: Quote) -> str:
+    """FTS body: the tokens the in-memory index would see, already folded."""
+    return " ".join(_document_tokens(quote))
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """FTS5 query with AND semantics, the last token matched as a prefix."""
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    # Tokens are \w+ runs, so they never contain a double quote.
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class _ConnectionPool:
+    """Fixed-size pool of connections shared between threads."""
+
+    def __init__(self, path: str, size: int):
+        self._connections: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(size):
+            connection = sqlite3.connect(
+                path, check_same_thread=False, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._all.append(connection)
+            self._connections.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, waiting until one is free."""
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        for connection in self._all:
+            connection.close()
+
+
+class SQLiteBackend(QuoteBackend):
+    """
+    Backend storing quotes in a SQLite database.
+
+    Category, author and language are stored with their case-folded key
+    next to the display value and indexed on (key, id), so lookups and
+    keyset pagination are index range scans. Full-text search uses an FTS5
+    table over the same folded tokens as the in-memory index. The database
+    runs in WAL mode: readers never wait for the single writer.
+
+    Every call does blocking I/O, so QuoteService runs them in a thread
+    pool. Each thread borrows a connection from a bounded pool; the pool
+    size caps the number of concurrent queries.
+    """
+
+    blocking = True
+
+    def __init__(
+        self, path: str, quotes: Optional[Iterable[Quote]] = None, pool_size: int = 4
+    ):
+        """
+        Initialize the backend, creating the schema if needed.
+
+        Args:
+            path: Database file
+            quotes: Corpus loaded when the database is empty
+            pool_size: Number of pooled connections
+        """
+        self.path = path
+        self._pool = _ConnectionPool(path, max(1, pool_size))
+        self._write_lock = threading.Lock()
+        self._stats: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._count: Optional[Tuple[int, int]] = None
+        self._pools: "OrderedDict[Tuple[Optional[str], ...], Tuple[int, List[int]]]" = (
+            OrderedDict()
+        )
+        self._pools_lock = threading.Lock()
+        with self._pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+            empty = (
+                connection.execute("SELECT 1 FROM quotes LIMIT 1").fetchone() is None
+            )
+        if empty and quotes is not None:
+            self.load(quotes)
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def load(self, quotes: Iterable[Quote]) -> None:
+        """
+        Bulk-insert quotes in a single transaction.
+
+        Args:
+            quotes: Quotes to insert; ids must be set and not already stored
+
+        Raises:
+            ValidationError: If a quote has no id or a duplicate one
+        """
+        self.bulk_load(quotes)
+
+    def bulk_load(
+        self, quotes: Iterable[Quote], replace: bool = False, batch_size: int = 1000
+    ) -> "SQLiteBackend":
+        """
+        Insert quotes in bulk, in one write transaction.
+
+        The secondary indexes are dropped first and rebuilt in one pass at
+        the end, and rows go in with executemany. WAL readers keep seeing
+        the previous corpus until the commit; a failure rolls everything back.
+
+        Args:
+            quotes: Quotes to insert; ids must be set and not already stored
+            replace: Delete the current corpus first
+            batch_size: Rows per executemany call
+
+        Returns:
+            This backend, holding the new corpus
+
+        Raises:
+            ValidationError: If a quote has no id or a duplicate one
+        """
+        with self._transaction() as connection:
+            if replace:
+                connection.execute("DELETE FROM quotes")
+                connection.execute(
+                    "INSERT INTO quotes_fts (quotes_fts) VALUES ('delete-all')"
+                )
+                fingerprint = 0
+            else:
+                row = connection.execute(
+                    "SELECT value FROM corpus_meta WHERE key = 'fingerprint'"
+                ).fetchone()
+                fingerprint = _to_unsigned(row[0]) if row else 0
+            for name in _INDEXES:
+                connection.execute(f"DROP INDEX IF EXISTS {name}")
+
+            iterator = iter(quotes)
+            while True:
+                batch = list(itertools.islice(iterator, batch_size))
+                if not batch:
+                    break
+                for quote in batch:
+                    if quote.id is None:
+                        raise ValidationError(
+                            "Bulk-loaded quotes must have an id", field="id"
+                        )
+                    fingerprint ^= _row_digest(quote)
+                try:
+                    connection.executemany(_INSERT, [_row(quote) for quote in batch])
+                except sqlite3.IntegrityError as exc:
+                    raise ValidationError(
+                        "Duplicate quote id", field="id", value=str(exc)
+                    )
+                connection.executemany(
+                    "INSERT INTO quotes_fts (rowid, body) VALUES (?, ?)",
+                    [(quote.id, _document(quote)) for quote in batch],
+                )
+
+            for name, columns in _INDEXES.items():
+                connection.execute(f"CREATE INDEX {name} ON {columns}")
+            connection.execute(
+                "INSERT INTO quotes_fts (quotes_fts) VALUES ('optimize')"
+            )
+            self._set_meta(connection, fingerprint)
+        return self
+
+    @property
+    def version(self) -> int:
+        return self._meta("version")
+
+    @property
+    def fingerprint(self) -> int:
+        return _to_unsigned(self._meta("fingerprint"))
+
+    def count(self) -> int:
+        # COUNT(*) scans an index: cache it per version like the stats.
+        version = self.version
+        cached = self._count
+        if cached is None or cached[0] != version:
+            cached = self._count = (
+                version,
+                self._scalar("SELECT COUNT(*) FROM quotes"),
+            )
+        return cached[1]
+
+    def get(self, quote_id: int) -> Optional[Quote]:
+        rows = self._query(f"SELECT {_COLUMNS} FROM quotes WHERE id = ?", (quote_id,))
+        return _quote(rows[0]) if rows else None
+
+    def get_many(self, quote_ids: Sequence[int]) -> List[Optional[Quote]]:
+        # One query for the whole batch.
+        found = {
+            quote.id: quote for quote in self._fetch(list(dict.fromkeys(quote_ids)))
+        }
+        return [found.get(quote_id) for quote_id in quote_ids]
+
+    def random(self) -> Optional[Quote]:
+        # Seek a random point of the id range: two b-tree descents instead of
+        # an OFFSET scan. Uniform while ids are dense; a quote following a
+        # gap is proportionally more likely.
+        with self._pool.connection() as connection:
+            low, high = connection.execute(
+                "SELECT (SELECT MIN(id) FROM quotes), (SELECT MAX(id) FROM quotes)"
+            ).fetchone()
+            if low is None:
+                return None
+            row = connection.execute(
+                f"SELECT {_COLUMNS} FROM quotes WHERE id >= ? ORDER BY id LIMIT 1",
+                (random.randint(low, high),),
+            ).fetchone()
+        return _quote(row)
+
+    def random_pool(
+        self,
+        category: Optional[str] = None,
+        author: Optional[str] = None,
+        language: Optional[str] = None,
+    ) -> Sequence[int]:
+        # Selecting the ids is O(N): cache each pool until the next write,
+        # so that repeated draws cost one version lookup.
+        key = tuple(
+            None if value is None else fold_key(value)
+            for value in (category, author, language)
+        )
+        version = self.version
+        with self._pools_lock:
+            cached = self._pools.get(key)
+            if cached is not None and cached[0] == version:
+                self._pools.move_to_end(key)
+                return cached[1]
+        version, pool = self._read_pool(key)
+        with self._pools_lock:
+            self._pools[key] = (version, pool)
+            self._pools.move_to_end(key)
+            while len(self._pools) > _MAX_POOLS:
+                self._pools.popitem(last=False)
+        return pool
+
+    def page(
+        self, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed(None, None, after, limit)
+
+    def by_category(
+        self, category: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed("category_key", category, after, limit)
+
+    def by_author(
+        self, author: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed("author_key", author, after, limit)
+
+    def by_language(
+        self, language: str, after: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Quote]:
+        return self._keyed("language_key", language, after, limit)
+
+    def count_category(self, category: str) -> int:
+        return self._scalar(
+            "SELECT COUNT(*) FROM quotes WHERE category_key = ?", (fold_key(category),)
+        )
+
+    def count_author(self, author: str) -> int:
+        return self._scalar(
+            "SELECT COUNT(*) FROM quotes WHERE author_key = ?", (fold_key(author),)
+        )
+
+    def categories(self) -> List[str]:
+        return list(self.stats()["categories"])
+
+    def authors(self) -> List[str]:
+        return list(self.stats()["authors"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return collection statistics, aggregated at most once per version."""
+        version = self.version
+        cached = self._stats
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        categories = self._counts("category")
+        authors = self._counts("author")
+        stats = {
+            "total_quotes": self.count(),
+            "total_categories": len(categories),
+            "total_authors": len(authors),
+            "categories": categories,
+            "authors": authors,
+            "language_distribution": self._counts("language"),
+        }
+        self._stats = (version, stats)
+        return stats
+
+    def search(
+        self, query: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Quote]:
+        expression = _match_expression(query)
+        if expression is None:
+            return []
+        rows = self._query(
+            "SELECT rowid FROM quotes_fts WHERE quotes_fts MATCH ? "
+            "ORDER BY rank, rowid LIMIT ? OFFSET ?",
+            (expression, -1 if limit is None else limit, offset),
+        )
+        return self._fetch([row[0] for row in rows])
+
+    def add(self, quote: Quote) -> Quote:
+        with self._transaction() as connection:
+            if quote.id is None:
+                next_id = connection.execute(
+                    "SELECT COALESCE(MAX(id), 0) + 1 FROM quotes"
+                )
+                quote = quote.model_copy(update={"id": next_id.fetchone()[0]})
+            self._insert(connection, quote)
+            self._bump(connection, _row_digest(quote))
+        return quote
+
+    def update(self, quote: Quote) -> Quote:
+        with self._transaction() as connection:
+            previous = self._get(connection, quote.id) if quote.id is not None else None
+            if previous is None:
+                raise QuoteNotFoundError(quote_id=quote.id)
+            self._remove(connection, previous)
+            self._insert(connection, quote)
+            self._bump(connection, _row_digest(previous) ^ _row_digest(quote))
+        return quote
+
+    def delete(self, quote_id: int) -> Quote:
+        with self._transaction() as connection:
+            quote = self._get(connection, quote_id)
+            if quote is None:
+                raise QuoteNotFoundError(quote_id=quote_id)
+            self._remove(connection, quote)
+            self._bump(connection, _row_digest(quote))
+        return quote
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a write transaction; writes are serialized across threads."""
+        with self._write_lock, self._pool.connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _insert(self, connection: sqlite3.Connection, quote: Quote) -> None:
+        try:
+            connection.execute(_INSERT, _row(quote))
+        except sqlite3.IntegrityError:
+            raise ValidationError("Duplicate quote id", field="id", value=quote.id)
+        connection.execute(
+            "INSERT INTO quotes_fts (rowid, body) VALUES (?, ?)",
+            (quote.id, _document(quote)),
+        )
+
+    def _remove(self, connection: sqlite3.Connection, quote: Quote) -> None:
+        connection.execute("DELETE FROM quotes WHERE id = ?", (quote.id,))
+        # Contentless FTS tables delete a row by replaying its indexed body.
+        connection.execute(
+            "INSERT INTO quotes_fts (quotes_fts, rowid, body) VALUES ('delete', ?, ?)",
+            (quote.id, _document(quote)),
+        )
+
+    def _bump(self, connection: sqlite3.Connection, digest: int) -> None:
+        """Advance the version and fold a digest into the fingerprint."""
+        row = connection.execute(
+            "SELECT value FROM corpus_meta WHERE key = 'fingerprint'"
+        ).fetchone()
+        self._set_meta(connection, (_to_unsigned(row[0]) if row else 0) ^ digest)
+
+    def _set_meta(self, connection: sqlite3.Connection, fingerprint: int) -> None:
+        """Store a new fingerprint under a fresh version."""
+        connection.execute(
+            "INSERT OR REPLACE INTO corpus_meta (key, value) VALUES ('fingerprint', ?)",
+            (_to_signed(fingerprint),),
+        )
+        # The version is advanced inside the write transaction, not drawn from
+        # a process-local counter: every process sharing the file sees it
+        # increase with each commit.
+        connection.execute(
+            "INSERT INTO corpus_meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+
+    def _meta(self, key: str) -> int:
+        row = self._query("SELECT value FROM corpus_meta WHERE key = ?", (key,))
+        return row[0][0] if row else 0
+
+    def _get(self, connection: sqlite3.Connection, quote_id: int) -> Optional[Quote]:
+        row = connection.execute(
+            f"SELECT {_COLUMNS} FROM quotes WHERE id = ?", (quote_id,)
+        ).fetchone()
+        return _quote(row) if row else None
+
+    def _keyed(
+        self,
+        column: Optional[str],
+        value: Optional[str],
+        after: Optional[int],
+        limit: Optional[int],
+    ) -> List[Quote]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if column is not None and value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(fold_key(value))
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        params.append(-1 if limit is None else limit)
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM quotes {where}ORDER BY id LIMIT ?", params
+        )
+        return [_quote(row) for row in rows]
+
+    def _read_pool(self, key: Tuple[Optional[str], ...]) -> Tuple[int, List[int]]:
+        """Read the version and the ids matching folded filters in one transaction."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in zip(("category_key", "author_key", "language_key"), key):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._pool.connection() as connection:
+            connection.execute("BEGIN")
+            try:
+                row = connection.execute(
+                    "SELECT value FROM corpus_meta WHERE key = 'version'"
+                ).fetchone()
+                rows = connection.execute(
+                    f"SELECT id FROM quotes{where} ORDER BY id", params
+                )
+                pool = [id_ for (id_,) in rows]
+            finally:
+                connection.execute("COMMIT")
+        return (row[0] if row else 0), pool
+
+    def _fetch(self, ids: List[int]) -> List[Quote]:
+        """Load quotes by id, preserving the order of ``ids``."""
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM quotes WHERE id IN ({placeholders})", ids
+        )
+        by_id = {row[0]: _quote(row) for row in rows}
+        return [by_id[quote_id] for quote_id in ids if quote_id in by_id]
+
+    def _counts(self, column: str) -> Dict[str, int]:
+        rows = self._query(
+            f"SELECT MIN({column}), COUNT(*) FROM quotes "
+            f"WHERE {column}_key IS NOT NULL GROUP BY {column}_key"
+        )
+        return dict(sorted(rows))
+
+    def _scalar(self, sql: str, params: Sequence[Any] = ()) -> int:
+        return int(self._query(sql, params)[0][0])
+
+    def _query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        with self._pool.connection() as connection:
+            return connection.execute(sql, params).fetchall()
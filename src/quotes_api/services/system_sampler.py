@@ -0,0 +1,134 @@
+"""
+Background sampler of system and process health metrics.
+"""
+
+import asyncio
+import os
+import platform
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil is optional
+    psutil = None
+
+from quotes_api.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SystemSampler:
+    """
+    Periodically samples CPU, memory, event-loop lag and process stats.
+
+    Samples are taken by an asyncio task every ``interval`` seconds and kept
+    in a ring buffer of ``history_size`` entries, so health endpoints read
+    the latest snapshot instead of measuring inline. psutil is used when
+    installed; without it only event-loop lag is reported.
+    """
+
+    def __init__(self, interval: float = 5.0, history_size: int = 60):
+        """
+        Initialize the sampler.
+
+        Args:
+            interval: Seconds between samples
+            history_size: Number of samples kept in the ring buffer
+        """
+        self.interval = interval
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._task: Optional[asyncio.Task] = None
+        self._process = psutil.Process(os.getpid()) if psutil else None
+        self.platform = {
+            "platform": platform.platform(),
+            "python_version": sys.version,
+        }
+        if self._process is not None:
+            # Prime the counters: the first cpu_percent(None) call returns 0.
+            psutil.cpu_percent(interval=None)
+            self._process.cpu_percent(interval=None)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sampling on the running event loop."""
+        if not self.running:
+            self._history.append(self.sample())
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def latest(self) -> Dict[str, Any]:
+        """Return the most recent sample, taking one if none exists yet."""
+        if not self._history:
+            self._history.append(self.sample())
+        return self._history[-1]
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Return the buffered samples, oldest first."""
+        return list(self._history)
+
+    def sample(self, event_loop_lag: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Take a sample without blocking.
+
+        Args:
+            event_loop_lag: Measured scheduling delay in seconds, if known
+
+        Returns:
+            Sample dictionary
+        """
+        sample: Dict[str, Any] = {
+            "timestamp": time.time(),
+            "event_loop_lag_ms": (
+                round(event_loop_lag * 1000, 3) if event_loop_lag is not None else None
+            ),
+        }
+        if self._process is None:
+            return sample
+
+        memory = psutil.virtual_memory()
+        process = self._process
+        with process.oneshot():
+            process_memory = process.memory_info()
+            sample["process"] = {
+                "pid": process.pid,
+                "cpu_percent": process.cpu_percent(interval=None),
+                "rss": process_memory.rss,
+                "vms": process_memory.vms,
+                "num_threads": process.num_threads(),
+            }
+        sample["cpu_percent"] = psutil.cpu_percent(interval=None)
+        sample["memory"] = {
+            "total": memory.total,
+            "available": memory.available,
+            "percent": memory.percent,
+        }
+        return sample
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            # Oversleeping means something held the event loop.
+            lag = max(0.0, loop.time() - expected)
+            try:
+                self._history.append(self.sample(event_loop_lag=lag))
+            except Exception as exc:  # pragma: no cover - keep sampling
+                logger.warning("System sampling failed", error=str(exc))
@@ -2,13 +2,14 @@
 Utility modules for Quotes API.
 """
 
-from .logger import get_logger, setup_logging
 from .exceptions import (
-    QuotesAPIException,
+    ConfigurationError,
     QuoteNotFoundError,
+    QuotesAPIException,
+    ReadOnlyStorageError,
     ValidationError,
-    ConfigurationError
 )
+from .logger import get_logger, setup_logging
 
 __all__ = [
     "get_logger",
@@ -16,5 +17,6 @@ __all__ = [
     "QuotesAPIException",
     "QuoteNotFoundError",
     "ValidationError",
-    "ConfigurationError"
-]
\ No newline at end of file
+    "ConfigurationError",
+    "ReadOnlyStorageError",
+]
@@ -100,6 +100,22 @@ class ConfigurationError(QuotesAPIException):
         super().__init__(message, error_code="CONFIGURATION_ERROR", details=details)
 
 
+class ReadOnlyStorageError(QuotesAPIException):
+    """Exception raised when writing to a read-only storage backend."""
+
+    def __init__(self, backend: str):
+        """
+        Initialize the exception.
+
+        Args:
+            backend: Name of the read-only backend
+        """
+        message = f"Storage backend {backend} is read-only"
+        super().__init__(
+            message, error_code="READ_ONLY_STORAGE", details={"backend": backend}
+        )
+
+
 class ServiceUnavailableError(QuotesAPIException):
     """Exception raised when external services are unavailable."""
 
@@ -138,4 +154,4 @@ class RateLimitExceededError(QuotesAPIException):
             "reset_time": reset_time
         }
 
-        super().__init__(message, error_code="RATE_LIMIT_EXCEEDED", details=details)
\ No newline at end of file
+        super().__init__(message, error_code="RATE_LIMIT_EXCEEDED", details=details)
@@ -1,32 +1,202 @@
 """
 Logging configuration and utilities.
+
+Log calls only build the event dict on the calling thread. Timestamping,
+rendering and the write to stdout happen in ProcessorFormatter, which runs
+on a background QueueListener thread when LOG_ASYNC is enabled, so a slow
+or back-pressured stdout never stalls the event loop.
 """
 
+import atexit
 import logging
+import os
+import queue
+import random
 import sys
-from typing import Any, Dict
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, TextIO
 
 import structlog
-from structlog.stdlib import LoggerFactory
+from structlog.stdlib import LoggerFactory, ProcessorFormatter
+from structlog.typing import EventDict
 
 from quotes_api.config import settings
 
+#: Accepted values for LOG_QUEUE_POLICY.
+QUEUE_POLICIES = ("drop", "block")
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without formatting them.
+
+    Unlike QueueHandler, records are enqueued as they are: formatting is
+    left to the listener thread. When the queue is full, the "drop" policy
+    discards the record and counts it; "block" waits for room, trading
+    request latency for lossless logs.
+    """
+
+    def __init__(
+        self, log_queue: "queue.Queue[logging.LogRecord]", policy: str = "drop"
+    ):
+        """
+        Initialize the handler.
+
+        Args:
+            log_queue: Bounded queue drained by a LogQueueListener
+            policy: "drop" or "block"
+
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown log queue policy: {policy!r}")
+        super().__init__(log_queue)
+        self.queue: "queue.Queue[logging.LogRecord]" = log_queue
+        self.policy = policy
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return the record unchanged; the listener formats it."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue according to the policy."""
+        if self.policy == "block":
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class LogQueueListener(QueueListener):
+    """QueueListener whose stop sentinel waits for room in a full queue."""
+
+    queue: "queue.Queue[Any]"
+    _sentinel = None  # as in QueueListener, which the stubs leave out
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class PathSampler:
+    """
+    Keeps a fraction of the request logs of high-volume paths.
+
+    Paths without a rate, and rates of 1 or more, are always logged.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            rates: Fraction of requests to log, per exact request path
+            rng: Random source (a new one when None)
+        """
+        self.rates = dict(rates or {})
+        self.sampled_out = 0
+        self._random = (rng or random.Random()).random
+
+    def keep(self, path: str) -> bool:
+        """
+        Decide whether to log a request.
+
+        Args:
+            path: Request path
+
+        Returns:
+            True if the request should be logged
+        """
+        rate = self.rates.get(path)
+        if rate is None or rate >= 1.0 or self._random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+_sampler = PathSampler()
+_queue_handler: Optional[LogQueueHandler] = None
+_listener: Optional[LogQueueListener] = None
+_root_handler: Optional[logging.Handler] = None
+
+
+def _add_timestamp(logger: Any, method_name: str, event_dict: EventDict) -> EventDict:
+    """Stamp the event with the time it was logged, not the time it is rendered."""
+    record = event_dict.get("_record")
+    created = record.created if record is not None else None
+    moment = (
+        datetime.fromtimestamp(created, timezone.utc)
+        if created
+        else datetime.now(timezone.utc)
+    )
+    event_dict["timestamp"] = moment.isoformat().replace("+00:00", "Z")
+    return event_dict
+
+
+def build_formatter() -> ProcessorFormatter:
+    """
+    Build the formatter rendering structlog and standard library records.
+
+    Returns:
+        Formatter producing JSON or console lines depending on LOG_FORMAT
+    """
+    return ProcessorFormatter(
+        foreign_pre_chain=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+        ],
+        processors=[
+            _add_timestamp,
+            ProcessorFormatter.remove_processors_meta,
+            structlog.processors.UnicodeDecoder(),
+            structlog.processors.JSONRenderer()
+            if settings.log_format == "json"
+            else structlog.dev.ConsoleRenderer(),
+        ],
+    )
+
 
-def setup_logging() -> None:
-    """Configure structured logging for the application."""
-    # Configure structlog
+def stop_logging() -> None:
+    """Flush queued records and stop the background writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(stream: Optional[TextIO] = None) -> None:
+    """
+    Configure structured logging for the application.
+
+    Safe to call again: the previous handler and writer thread are replaced.
+
+    Args:
+        stream: Destination of the rendered lines (stdout when None)
+    """
+    global _sampler, _queue_handler, _listener, _root_handler
+
+    # Configure structlog: only cheap processors run on the calling thread
     structlog.configure(
         processors=[
             structlog.stdlib.filter_by_level,
             structlog.stdlib.add_logger_name,
             structlog.stdlib.add_log_level,
             structlog.stdlib.PositionalArgumentsFormatter(),
-            structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
+            # Tracebacks must be captured before the record changes thread
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer() if settings.log_format == "json"
-            else structlog.dev.ConsoleRenderer(),
+            ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=LoggerFactory(),
@@ -35,11 +205,69 @@ def setup_logging() -> None:
     )
 
     # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, settings.log_level.upper()),
-    )
+    stop_logging()
+    root = logging.getLogger()
+    if _root_handler is not None:
+        root.removeHandler(_root_handler)
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    writer.setFormatter(build_formatter())
+    if settings.log_async:
+        _queue_handler = LogQueueHandler(
+            queue.Queue(maxsize=settings.log_queue_size),
+            policy=settings.log_queue_policy,
+        )
+        _listener = LogQueueListener(_queue_handler.queue, writer)
+        _listener.start()
+        _root_handler = _queue_handler
+    else:
+        _queue_handler = None
+        _root_handler = writer
+    root.addHandler(_root_handler)
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+
+    _sampler = PathSampler(settings.log_sample_rates)
+
+
+def get_log_stats() -> Dict[str, Any]:
+    """
+    Get logging pipeline statistics.
+
+    Returns:
+        Mode, queue depth and capacity, and dropped and sampled-out counts
+    """
+    stats: Dict[str, Any] = {
+        "mode": "async" if _queue_handler is not None else "sync",
+        "sampled_out": _sampler.sampled_out,
+    }
+    if _queue_handler is not None:
+        stats.update(
+            policy=_queue_handler.policy,
+            queued=_queue_handler.queue.qsize(),
+            capacity=_queue_handler.queue.maxsize,
+            dropped=_queue_handler.dropped,
+        )
+    return stats
+
+
+def _restart_after_fork() -> None:
+    """Give a forked process its own queue and writer thread."""
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    # Threads do not survive fork(): without a listener of its own, a
+    # preloaded worker would queue records that are never written (or
+    # block forever under the "block" policy). The inherited queue may
+    # hold the parent's records and locks, so it is replaced too.
+    _queue_handler.queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _queue_handler._dropped_lock = threading.Lock()
+    _listener = LogQueueListener(_queue_handler.queue, *_listener.handlers)
+    _listener.start()
+
+
+atexit.register(stop_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
 
 
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
@@ -68,13 +296,16 @@ def log_request_response(
     logger: structlog.stdlib.BoundLogger,
     method: str,
     path: str,
-    status_code: int = None,
-    duration: float = None,
-    **kwargs: Any
+    status_code: Optional[int] = None,
+    duration: Optional[float] = None,
+    **kwargs: Any,
 ) -> None:
     """
     Log HTTP request/response information.
 
+    Successful requests to paths listed in LOG_SAMPLE_RATES_RAW are
+    sampled; errors are always logged.
+
     Args:
         logger: Logger instance
         method: HTTP method
@@ -83,6 +314,9 @@ def log_request_response(
         duration: Request duration in seconds (optional)
         **kwargs: Additional log fields
     """
+    if not (status_code and status_code >= 400) and not _sampler.keep(path):
+        return
+
     log_data: Dict[str, Any] = {
         "method": method,
         "path": path,
@@ -98,4 +332,4 @@ def log_request_response(
     if status_code and status_code >= 400:
         logger.error("HTTP request error", **log_data)
     else:
-        logger.info("HTTP request", **log_data)
\ No newline at end of file
+        logger.info("HTTP request", **log_data)
@@ -4,7 +4,7 @@ Integration tests for the API endpoints.
 
 import pytest
 
-from arbah.models.quote import Quote
+from quotes_api.models.quote import Quote
 
 
 class TestQuotesAPI:
@@ -116,6 +116,502 @@ class TestQuotesAPI:
         assert response.status_code == 422  # Validation error
 
 
+class TestPagination:
+    """Integration tests for cursor pagination and field projection."""
+
+    def test_cursor_walks_all_quotes(self, client):
+        """Test that following next_cursor visits every quote once, in id order."""
+        ids, cursor = [], None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            data = client.get("/api/v1/quotes/", params=params).json()
+            ids.extend(quote["id"] for quote in data["data"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+        assert ids == sorted(ids)
+        assert len(ids) == data["total"]
+
+    def test_fields_projection(self, client):
+        """Test that only requested fields are returned."""
+        data = client.get("/api/v1/quotes/?limit=2&fields=id,text").json()
+        assert all(set(quote) == {"id", "text"} for quote in data["data"])
+
+    def test_search_pagination(self, client):
+        """Test that search pages do not overlap."""
+        first = client.get("/api/v1/quotes/search/?q=la&limit=2").json()
+        second = client.get(
+            "/api/v1/quotes/search/",
+            params={"q": "la", "limit": 2, "cursor": first["next_cursor"]},
+        ).json()
+        first_ids = {quote["id"] for quote in first["data"]}
+        assert first_ids.isdisjoint(quote["id"] for quote in second["data"])
+
+    def test_invalid_cursor_and_fields(self, client):
+        """Test that malformed cursors and unknown fields are rejected."""
+        assert client.get("/api/v1/quotes/?cursor=not-a-cursor").status_code == 400
+        assert client.get("/api/v1/quotes/?fields=id,unknown").status_code == 400
+        assert client.get("/api/v1/quotes/?limit=0").status_code == 422
+
+
+class TestExport:
+    """Integration tests for the streaming export endpoint."""
+
+    def test_ndjson_export(self, client):
+        """Test that every quote is exported as one JSON line."""
+        import json
+
+        response = client.get(
+            "/api/v1/quotes/export", headers={"Accept-Encoding": "identity"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        total = client.get("/api/v1/meta/stats").json()["total_quotes"]
+        assert len(lines) == total
+        assert [json.loads(line)["id"] for line in lines] == sorted(range(1, total + 1))
+
+    def test_csv_export(self, client):
+        """Test the CSV export format."""
+        import csv
+        import io
+
+        response = client.get("/api/v1/quotes/export?format=csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows[0]["id"] == "1"
+        assert rows[0]["author"] == "Victor Hugo"
+
+    def test_gzip_export(self, client):
+        """Test that the stream is gzipped when the client accepts it."""
+        response = client.get(
+            "/api/v1/quotes/export", headers={"Accept-Encoding": "gzip"}
+        )
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text.count("\n") > 0
+
+
+class TestRequestTiming:
+    """Integration tests for the request timing middleware."""
+
+    def test_process_time_header(self, client):
+        """Test that responses carry X-Process-Time, errors and streams included."""
+        for path in (
+            "/api/v1/health/ping",
+            "/api/v1/quotes/999999",
+            "/api/v1/quotes/export",
+        ):
+            response = client.get(path)
+            assert float(response.headers["x-process-time"]) >= 0
+
+    def test_streamed_body_is_intact(self, client):
+        """Test that the export stream passes through unchanged."""
+        response = client.get(
+            "/api/v1/quotes/export", headers={"Accept-Encoding": "identity"}
+        )
+        total = client.get("/api/v1/meta/stats").json()["total_quotes"]
+        assert len(response.text.splitlines()) == total
+
+
+class TestMetrics:
+    """Integration tests for the Prometheus metrics endpoint."""
+
+    def test_metrics_exposition(self, client):
+        """Test that requests, cache and index figures are exposed per route."""
+        client.get("/api/v1/quotes/1")
+        client.get("/api/v1/quotes/1")
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'route="/api/v1/quotes/{quote_id}",status="200"' in text
+        assert "quotes_api_http_request_duration_seconds_bucket" in text
+        assert "quotes_api_http_response_size_bytes_sum" in text
+        assert "quotes_api_response_cache_hits_total" in text
+        assert 'quotes_api_index_size{index="quotes"}' in text
+        assert 'quotes_api_operation_calls_total{operation="quote"}' in text
+
+
+class TestCompression:
+    """Integration tests for response compression."""
+
+    def test_cached_list_is_compressed_once(self, client, monkeypatch):
+        """Test that the gzip variant of a cached page is computed once per version."""
+        from quotes_api.config import settings
+
+        monkeypatch.setattr(settings, "compression_min_size", 64)
+        headers = {"Accept-Encoding": "gzip"}
+        first = client.get("/api/v1/meta/stats", headers=headers)
+        second = client.get("/api/v1/meta/stats", headers=headers)
+        cache = client.app.state.response_cache
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.headers["vary"] == "Accept-Encoding"
+        assert first.json() == second.json()
+        assert cache.stats()["variants"]["gzip"]["hits"] >= 1
+
+        plain = client.get(
+            "/api/v1/meta/stats", headers={"Accept-Encoding": "identity"}
+        )
+        assert "content-encoding" not in plain.headers
+        assert plain.json() == first.json()
+        assert plain.headers["etag"] != first.headers["etag"]
+
+    def test_small_bodies_are_not_compressed(self, client):
+        """Test the minimum size threshold."""
+        response = client.get("/api/v1/quotes/1", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    def test_uncached_responses_are_negotiated(self, client):
+        """Test that search results are compressed on the fly."""
+        response = client.get(
+            "/api/v1/quotes/search/?q=la", headers={"Accept-Encoding": "gzip"}
+        )
+        if len(response.content) >= 1024:
+            assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json()["success"] is True
+
+
+class TestQuoteServiceDependency:
+    """Integration tests for the shared quote service."""
+
+    def test_lifespan_creates_one_service(self):
+        """Test that the lifespan hook installs a single service for all routers."""
+        from fastapi.testclient import TestClient
+
+        from quotes_api.main import app
+
+        with TestClient(app) as client:
+            service = app.state.quote_service
+            assert client.get("/api/v1/quotes/1").status_code == 200
+            assert client.get("/api/v1/meta/stats").status_code == 200
+            assert app.state.quote_service is service
+
+    def test_sqlite_backend(self, tmp_path, monkeypatch):
+        """Test that the API serves the same answers from the SQLite backend."""
+        from fastapi.testclient import TestClient
+
+        from quotes_api.config import settings
+        from quotes_api.main import app
+
+        monkeypatch.setattr(settings, "storage_backend", "sqlite")
+        monkeypatch.setattr(settings, "sqlite_path", str(tmp_path / "quotes.db"))
+        # The lifespan replaces these; restore them for the other tests.
+        monkeypatch.setattr(app.state, "quote_service", None, raising=False)
+        monkeypatch.setattr(app.state, "response_cache", None, raising=False)
+        with TestClient(app) as client:
+            assert app.state.quote_service.blocking
+            assert (
+                client.get("/api/v1/quotes/1").json()["data"]["author"] == "Victor Hugo"
+            )
+            assert client.get("/api/v1/quotes/random").status_code == 200
+            assert client.get("/api/v1/quotes/author/socrate").json()["count"] == 1
+            found = client.get("/api/v1/quotes/search/?q=succes").json()["data"]
+            assert found[0]["id"] == 2
+            assert client.get("/api/v1/meta/stats").json()["total_quotes"] == 10
+
+    def test_snapshot_backend(self, tmp_path, monkeypatch):
+        """Test that the API serves a prebuilt snapshot."""
+        from fastapi.testclient import TestClient
+
+        from quotes_api.config import settings
+        from quotes_api.main import app
+        from quotes_api.services.quote_service import sample_quotes
+        from quotes_api.services.storage import build_snapshot
+
+        path = str(tmp_path / "quotes.snap")
+        build_snapshot(sample_quotes(), path)
+        monkeypatch.setattr(settings, "storage_backend", "snapshot")
+        monkeypatch.setattr(settings, "snapshot_path", path)
+        monkeypatch.setattr(app.state, "quote_service", None, raising=False)
+        monkeypatch.setattr(app.state, "response_cache", None, raising=False)
+        with TestClient(app) as client:
+            quote = client.get("/api/v1/quotes/7").json()["data"]
+            assert quote["author"] == "Albert Camus"
+            assert client.get("/api/v1/quotes/category/amour").json()["total"] == 1
+            found = client.get("/api/v1/quotes/search/?q=vin").json()["data"]
+            assert found[0]["id"] == 6
+
+    def test_corpus_file(self, tmp_path, monkeypatch):
+        """Test that the lifespan loads the corpus file and reports it in health."""
+        from fastapi.testclient import TestClient
+
+        from quotes_api.config import settings
+        from quotes_api.main import app
+
+        path = tmp_path / "corpus.csv"
+        path.write_text("id,text,author\n7,Seule citation,Moi\n", encoding="utf-8")
+        monkeypatch.setattr(settings, "corpus_path", str(path))
+        monkeypatch.setattr(app.state, "quote_service", None, raising=False)
+        monkeypatch.setattr(app.state, "response_cache", None, raising=False)
+        monkeypatch.setattr(app.state, "corpus_reloader", None, raising=False)
+        with TestClient(app) as client:
+            assert client.get("/api/v1/quotes/7").json()["data"]["author"] == "Moi"
+            corpus = client.get("/api/v1/health/detailed").json()["corpus"]
+            assert corpus["quotes"] == 1
+            assert corpus["reload"]["source"] == str(path)
+            assert corpus["reload"]["snapshot_version"] == corpus["version"]
+            assert corpus["reload"]["watching"] is False
+
+
+class TestAdminImport:
+    """Integration tests for the bulk import endpoint."""
+
+    URL = "/api/v1/admin/import"
+
+    def test_disabled_without_token(self, client):
+        """Test that admin endpoints are refused while no token is configured."""
+        assert client.post(self.URL, content=b"").status_code == 403
+
+    def test_rejects_wrong_token(self, client, monkeypatch):
+        """Test that a wrong bearer token is refused."""
+        from quotes_api.config import settings
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        response = client.post(
+            self.URL, content=b"", headers={"Authorization": "Bearer nope"}
+        )
+        assert response.status_code == 401
+
+    def test_import_csv(self, client, monkeypatch):
+        """Test that an uploaded file is served once imported."""
+        from quotes_api.config import settings
+        from quotes_api.services.quote_service import QuoteService
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        monkeypatch.setattr(
+            client.app.state, "quote_service", QuoteService(), raising=False
+        )
+        monkeypatch.setattr(client.app.state, "response_cache", None, raising=False)
+        body = "text,author,category\nNouvelle citation,Moi,Import\n,Moi,Import\n"
+        response = client.post(
+            f"{self.URL}?format=csv",
+            content=body.encode("utf-8"),
+            headers={"Authorization": "Bearer secret"},
+        )
+        assert response.status_code == 200
+        report = response.json()["data"]
+        assert (report["imported"], report["invalid"]) == (1, 1)
+        assert report["errors"][0]["line"] == 3
+        quotes = client.get("/api/v1/quotes/category/import").json()["data"]
+        assert [quote["id"] for quote in quotes] == [11]
+
+
+class TestQuoteWrites:
+    """Integration tests for the quote write endpoints."""
+
+    URL = "/api/v1/quotes/"
+    AUTH = {"Authorization": "Bearer secret"}
+
+    @pytest.fixture(autouse=True)
+    def _writable(self, client, monkeypatch):
+        from quotes_api.config import settings
+        from quotes_api.services.quote_service import QuoteService
+
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        monkeypatch.setattr(
+            client.app.state, "quote_service", QuoteService(), raising=False
+        )
+        monkeypatch.setattr(client.app.state, "response_cache", None, raising=False)
+
+    def test_writes_require_admin_token(self, client):
+        """Test that writes are refused without the admin token."""
+        assert client.post(self.URL, json={"text": "Anonyme"}).status_code == 401
+        assert client.delete(f"{self.URL}1").status_code == 401
+        assert client.get(f"{self.URL}1").status_code == 200
+
+    def test_create(self, client):
+        """Test that a created quote is served with its new ID."""
+        response = client.post(
+            self.URL,
+            json={"text": "Nouvelle citation", "author": "Moi"},
+            headers=self.AUTH,
+        )
+        assert response.status_code == 201
+        quote = response.json()["data"]
+        assert quote["id"] == 11
+        assert quote["created_at"] is not None
+        assert response.headers["location"] == "/api/v1/quotes/11"
+        created = client.get(response.headers["location"]).json()["data"]
+        assert created["text"] == "Nouvelle citation"
+        empty = client.post(self.URL, json={"text": ""}, headers=self.AUTH)
+        assert empty.status_code == 422
+
+    def test_replace_and_patch(self, client):
+        """Test that PUT replaces every field and PATCH only the given ones."""
+        response = client.put(
+            f"{self.URL}5", json={"text": "Remplacée"}, headers=self.AUTH
+        )
+        assert response.status_code == 200
+        assert response.json()["data"]["author"] is None
+
+        response = client.patch(
+            f"{self.URL}5", json={"author": "Socrate"}, headers=self.AUTH
+        )
+        quote = response.json()["data"]
+        assert (quote["text"], quote["author"]) == ("Remplacée", "Socrate")
+        assert quote["updated_at"] is not None
+        missing = client.patch(f"{self.URL}99", json={}, headers=self.AUTH)
+        assert missing.status_code == 404
+        missing = client.put(f"{self.URL}99", json={"text": "x"}, headers=self.AUTH)
+        assert missing.status_code == 404
+
+    def test_delete(self, client):
+        """Test that a deleted quote is no longer served."""
+        response = client.delete(f"{self.URL}3", headers=self.AUTH)
+        assert response.json()["data"]["id"] == 3
+        assert client.get(f"{self.URL}3").status_code == 404
+        assert client.delete(f"{self.URL}3", headers=self.AUTH).status_code == 404
+
+    def test_write_invalidates_cached_responses(self, client):
+        """Test that cached reads and ETags change once a write is published."""
+        before = client.get(f"{self.URL}category/Amour")
+        assert before.json()["count"] == 1
+        client.post(
+            self.URL, json={"text": "Aimer", "category": "Amour"}, headers=self.AUTH
+        )
+        after = client.get(
+            f"{self.URL}category/Amour",
+            headers={"If-None-Match": before.headers["etag"]},
+        )
+        assert after.status_code == 200
+        assert after.json()["count"] == 2
+        assert client.get("/api/v1/meta/stats").json()["categories"]["Amour"] == 2
+
+
+class TestResponseCache:
+    """Integration tests for cached read-only endpoints."""
+
+    def test_repeated_request_is_served_from_cache(self, client):
+        """Test that a repeated request returns identical bytes from the cache."""
+        first = client.get("/api/v1/quotes/2")
+        hits = client.get("/api/v1/health/detailed").json()["response_cache"]["hits"]
+        second = client.get("/api/v1/quotes/2")
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.json()["data"]["id"] == 2
+        stats = client.get("/api/v1/health/detailed").json()["response_cache"]
+        assert stats["hits"] == hits + 1
+
+    def test_not_found_is_not_cached(self, client):
+        """Test that 404 responses are not stored."""
+        assert client.get("/api/v1/quotes/999").status_code == 404
+        assert client.get("/api/v1/quotes/999").status_code == 404
+
+
+class TestConditionalRequests:
+    """Integration tests for ETag and Cache-Control support."""
+
+    def test_etag_and_cache_control(self, client):
+        """Test that cacheable routes carry validators."""
+        response = client.get("/api/v1/quotes/")
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["cache-control"].startswith("public, max-age=")
+
+    def test_if_none_match_returns_304(self, client):
+        """Test that a matching If-None-Match gets an empty 304."""
+        etag = client.get("/api/v1/meta/stats").headers["etag"]
+        response = client.get("/api/v1/meta/stats", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_etag_differs_per_resource(self, client):
+        """Test that an ETag from one route does not validate another."""
+        etag = client.get("/api/v1/quotes/1").headers["etag"]
+        response = client.get("/api/v1/quotes/2", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_random_quote_is_not_cacheable(self, client):
+        """Test that the random quote is marked no-store."""
+        response = client.get("/api/v1/quotes/random")
+        assert response.headers["cache-control"] == "no-store"
+        assert "etag" not in response.headers
+
+
+class TestBatchLookup:
+    """Integration tests for batch lookups by id."""
+
+    def test_get_form_keeps_request_order(self, client):
+        """Test that quotes come back in request order with missing ids reported."""
+        data = client.get("/api/v1/quotes/batch?ids=3,999,1").json()
+        assert [quote["id"] for quote in data["data"]] == [3, 1]
+        assert data["missing"] == [999]
+        assert data["count"] == 2
+
+    def test_post_form(self, client):
+        """Test the POST form of the batch lookup."""
+        data = client.post("/api/v1/quotes/batch", json={"ids": [2, 5]}).json()
+        assert [quote["id"] for quote in data["data"]] == [2, 5]
+        assert data["missing"] == []
+
+    def test_invalid_batches(self, client):
+        """Test malformed, empty and oversized batches are rejected."""
+        assert client.get("/api/v1/quotes/batch?ids=1,x").status_code == 400
+        assert client.post("/api/v1/quotes/batch", json={"ids": []}).status_code == 422
+        too_many = {"ids": list(range(1, 1002))}
+        assert client.post("/api/v1/quotes/batch", json=too_many).status_code == 400
+
+
+class TestRandomQuote:
+    """Integration tests for filtered, weighted and no-repeat random quotes."""
+
+    def test_filters(self, client):
+        """Test that filters restrict the draw."""
+        data = client.get("/api/v1/quotes/random?category=amour").json()["data"]
+        assert data["category"] == "Amour"
+        data = client.get(
+            "/api/v1/quotes/random?author=socrate&weighting=recency"
+        ).json()["data"]
+        assert data["author"] == "Socrate"
+        assert client.get("/api/v1/quotes/random?category=Inconnue").status_code == 404
+        assert client.get("/api/v1/quotes/random?weighting=unknown").status_code == 400
+
+    def test_no_repeat_session(self, client):
+        """Test that a session sees every quote once before repeats."""
+        total = client.get("/api/v1/meta/stats").json()["total_quotes"]
+        url = "/api/v1/quotes/random?no_repeat=true&session=widget"
+        ids = [client.get(url).json()["data"]["id"] for _ in range(total)]
+        assert len(set(ids)) == total
+
+
+class TestFuzzyLookup:
+    """Integration tests for typo-tolerant author and category lookups."""
+
+    def test_author_typo_resolves_to_closest_author(self, client):
+        """Test that a misspelled author serves the closest author's quotes."""
+        response = client.get("/api/v1/quotes/author/Victr Hugo")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["matches"][0]["name"] == "Victor Hugo"
+        assert 0.7 <= data["matches"][0]["score"] < 1
+        assert data["matches"][0]["count"] == data["total"]
+        assert all(quote["author"] == "Victor Hugo" for quote in data["data"])
+        assert "closest match for 'Victr Hugo'" in data["message"]
+
+    def test_missing_accent_resolves_category(self, client):
+        """Test that a category typed without its accent is found."""
+        data = client.get("/api/v1/quotes/category/Succes").json()
+        assert data["matches"][0] == {
+            "name": "Succès",
+            "score": 1.0,
+            "count": data["total"],
+        }
+        assert data["count"] >= 1
+
+    def test_exact_match_has_no_matches(self, client):
+        """Test that exact lookups do not report near matches."""
+        assert client.get("/api/v1/quotes/author/Victor Hugo").json()["matches"] is None
+
+    def test_unrelated_or_disabled_lookup_is_not_found(self, client):
+        """Test that names far from any known one, or fuzzy=false, still 404."""
+        assert client.get("/api/v1/quotes/author/Zzyzx Qwerty").status_code == 404
+        response = client.get("/api/v1/quotes/author/Victr Hugo?fuzzy=false")
+        assert response.status_code == 404
+
+
 class TestHealthAPI:
     """Integration tests for health check endpoints."""
 
@@ -139,6 +635,17 @@ class TestHealthAPI:
         assert "features" in data
         assert "platform" in data["system"]
         assert "memory" in data["system"]
+        assert data["corpus"]["quotes"] >= 1
+        assert data["corpus"]["reload"] is None
+
+    def test_detailed_health_reports_operations(self, client):
+        """Test that heavy operations are counted and timed per operation."""
+        client.get("/api/v1/quotes/search/?q=vie")
+        data = client.get("/api/v1/health/detailed").json()
+        operations = data["operations"]
+        assert operations["workers"] >= 1
+        assert operations["stats"]["search"]["calls"] >= 1
+        assert operations["stats"]["search"]["in_flight"] == 0
 
     def test_ping(self, client):
         """Test ping endpoint."""
@@ -172,6 +679,7 @@ class TestMetaAPI:
         assert "categories" in data
         assert "authors" in data
         assert data["total_quotes"] > 0
+        assert sum(data["language_distribution"].values()) == data["total_quotes"]
 
     def test_get_categories(self, client):
         """Test getting all categories."""
@@ -213,4 +721,4 @@ class TestAsyncAPI:
         response = await async_client.get("/api/v1/health/")
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "healthy"
\ No newline at end of file
+        assert data["status"] == "healthy"
@@ -0,0 +1,224 @@
+"""
+Unit tests for the bulk import pipeline.
+"""
+
+import io
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from quotes_api.cli import main as cli_main
+from quotes_api.models.quote import Quote
+from quotes_api.services.bulk_import import BulkImporter, dedupe_key, validate_chunk
+from quotes_api.services.quote_service import QuoteService, sample_quotes
+from quotes_api.services.storage import SnapshotBackend, SQLiteBackend, build_snapshot
+from quotes_api.utils.exceptions import ReadOnlyStorageError, ValidationError
+
+
+def ndjson(*rows) -> io.BytesIO:
+    return io.BytesIO(b"".join(json.dumps(row).encode("utf-8") + b"\n" for row in rows))
+
+
+class TestBulkImporter:
+    """Test cases for BulkImporter."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.service = QuoteService()
+
+    def test_appends_with_fresh_ids(self):
+        """Test that quotes without an id get the next free ones."""
+        report = BulkImporter(self.service).run(
+            ndjson(
+                {"text": "Première", "author": "A"},
+                {"text": "Seconde", "author": "B", "category": "Test"},
+            )
+        )
+        assert (report.read, report.imported, report.invalid) == (2, 2, 0)
+        assert self.service.get_quote_count() == 12
+        assert self.service.get_quote_by_id(12).category == "Test"
+        assert report.version == self.service.version
+
+    def test_deduplicates_on_normalized_text_and_author(self):
+        """Test duplicates within the file and against the corpus."""
+        report = BulkImporter(self.service).run(
+            ndjson(
+                {
+                    "text": "L'imagination est plus importante que le savoir.",
+                    "author": "albert EINSTEIN",
+                },
+                {"text": "Coeur  léger", "author": "Moi"},
+                {"text": "CŒUR LEGER ", "author": "moi"},
+                {"text": "Coeur léger", "author": "Quelqu'un d'autre"},
+            )
+        )
+        assert (report.imported, report.duplicates) == (2, 2)
+        assert dedupe_key("Cœur  léger", "Moi") == dedupe_key("coeur leger", " MOI")
+
+    def test_reports_invalid_rows_with_line_numbers(self):
+        """Test that bad rows are skipped and the rest of the chunk imported."""
+        source = io.BytesIO(
+            b'{"text": "Valide"}\n'
+            b"\n"
+            b"{not json\n"
+            b'{"text": ""}\n'
+            b"[1, 2]\n"
+            b'{"id": 3, "text": "Id pris"}\n'
+            b'{"text": "Valide aussi", "language": "en"}\n'
+        )
+        report = BulkImporter(self.service, chunk_size=2).run(source)
+        assert (report.read, report.imported, report.invalid) == (6, 2, 4)
+        assert [error["line"] for error in report.errors] == [3, 4, 5, 6]
+        assert report.errors[1]["error"].startswith("text:")
+
+    def test_csv(self):
+        """Test CSV input with a header row and empty optional cells."""
+        source = io.BytesIO(
+            "id,text,author,category,language\n"
+            '100,"Une, deux",Auteur,,\n'
+            ",Sans id,,Catégorie,en\n".encode("utf-8")
+        )
+        report = BulkImporter(self.service).run(source, "csv")
+        assert report.imported == 2
+        assert self.service.get_quote_by_id(100).language == "fr"
+        assert self.service.get_quote_by_id(101).author is None
+        assert source.closed is False
+
+    def test_replace_swaps_the_whole_corpus(self):
+        """Test that replace keeps ids and drops the previous corpus."""
+        previous = self.service.version
+        report = BulkImporter(self.service, replace=True).run(
+            ndjson({"id": 7, "text": "Seule"}, {"text": "Autre"})
+        )
+        assert report.imported == 2
+        assert [quote.id for quote in self.service.get_all_quotes()] == [7, 8]
+        assert self.service.search_quotes("seule")[0].id == 7
+        assert self.service.version > previous
+
+    def test_readers_see_old_corpus_until_swap(self):
+        """Test that the corpus is published only once fully loaded."""
+        counts = []
+
+        def quotes():
+            for n in range(5):
+                counts.append(self.service.get_quote_count())
+                yield Quote(id=100 + n, text=f"Citation {n}")
+
+        self.service.import_quotes(quotes())
+        assert counts == [10] * 5
+        assert self.service.get_quote_count() == 15
+
+    def test_failed_import_keeps_old_corpus(self):
+        """Test that an error while loading publishes nothing."""
+        version = self.service.version
+        with pytest.raises(ValidationError):
+            BulkImporter(self.service).run(ndjson({"text": "x"}), "xml")
+        assert self.service.version == version
+
+    def test_snapshot_is_read_only(self, tmp_path):
+        """Test that a snapshot backend refuses imports."""
+        path = str(tmp_path / "quotes.snap")
+        build_snapshot(sample_quotes(), path)
+        service = QuoteService(backend=SnapshotBackend(path))
+        with pytest.raises(ReadOnlyStorageError):
+            BulkImporter(service).run(ndjson({"text": "x"}))
+        service.close()
+
+
+class TestSQLiteBulkLoad:
+    """Test cases for SQLiteBackend.bulk_load."""
+
+    @pytest.fixture(autouse=True)
+    def _backend(self, tmp_path):
+        self.path = str(tmp_path / "quotes.db")
+        self.service = QuoteService(
+            backend=SQLiteBackend(self.path, quotes=sample_quotes())
+        )
+        yield
+        self.service.close()
+
+    def test_readers_see_previous_corpus_until_commit(self):
+        """Test that the load runs in one transaction invisible to readers."""
+        reader = sqlite3.connect(self.path)
+        counts = []
+
+        def quotes():
+            for n in range(3):
+                counts.append(
+                    reader.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+                )
+                yield Quote(id=100 + n, text=f"Citation {n}")
+
+        self.service.import_quotes(quotes(), replace=True)
+        assert counts == [10, 10, 10]
+        assert reader.execute("SELECT COUNT(*) FROM quotes").fetchone()[0] == 3
+        reader.close()
+
+    def test_replace_rebuilds_indexes_and_search(self):
+        """Test that replace leaves consistent indexes, search and fingerprint."""
+        quotes = sample_quotes()[:3]
+        self.service.import_quotes(quotes, replace=True)
+        backend = self.service.backend
+        assert backend.count() == 3
+        assert backend.by_author("victor hugo")[0].id == 1
+        assert backend.search("succes")[0].id == 2
+        assert backend.search("vin") == []
+        assert backend.fingerprint == QuoteService(quotes).fingerprint
+
+    def test_duplicate_id_rolls_back(self):
+        """Test that a failing load leaves the corpus untouched."""
+        version = self.service.version
+        with pytest.raises(ValidationError):
+            self.service.import_quotes(sample_quotes()[:1])
+        assert self.service.version == version
+        assert self.service.get_quote_count() == 10
+        assert self.service.backend.by_category("amour")[0].id == 1
+
+    def test_append_dedupes_with_a_single_connection(self, tmp_path):
+        """Test that an append import does not deadlock on a one-connection pool."""
+        path = str(tmp_path / "single.db")
+        service = QuoteService(
+            backend=SQLiteBackend(path, quotes=sample_quotes(), pool_size=1)
+        )
+        existing = sample_quotes()[0]
+        source = ndjson(
+            {"text": existing.text, "author": existing.author}, {"text": "Nouvelle"}
+        )
+        reports = []
+        worker = threading.Thread(
+            target=lambda: reports.append(BulkImporter(service).run(source)),
+            daemon=True,
+        )
+        worker.start()
+        worker.join(10)
+        try:
+            assert not worker.is_alive()
+            assert (reports[0].imported, reports[0].duplicates) == (1, 1)
+            assert service.get_quote_count() == 11
+        finally:
+            if not worker.is_alive():
+                service.close()
+
+
+class TestImportCommand:
+    """Test cases for the import command line."""
+
+    def test_import_into_sqlite(self, tmp_path, monkeypatch, capsys):
+        """Test importing a CSV file into the configured SQLite database."""
+        from quotes_api.config import settings
+
+        path = tmp_path / "quotes.csv"
+        path.write_text(
+            "text,author\nUne citation,Quelqu'un\nUne  CITATION,quelqu'un\n"
+        )
+        monkeypatch.setattr(settings, "storage_backend", "sqlite")
+        monkeypatch.setattr(settings, "sqlite_path", str(tmp_path / "quotes.db"))
+        cli_main(["import", str(path), "--replace"])
+        assert (
+            "Imported 1 of 2 rows (1 duplicates, 0 invalid)" in capsys.readouterr().out
+        )
+        backend = SQLiteBackend(settings.sqlite_path)
+        assert [quote.text for quote in backend.page()] == ["Une citation"]
+        backend.close()
@@ -0,0 +1,58 @@
+"""
+Unit tests for response compression.
+"""
+
+import gzip
+
+import pytest
+
+from quotes_api.api import compression
+from quotes_api.api.compression import compress, negotiate_encoding
+
+
+class TestNegotiateEncoding:
+    """Test cases for Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, None),
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("br", "br"),
+            ("gzip, deflate, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("GZIP;q=0.8", "gzip"),
+            ("gzip;q=0, br;q=0", None),
+            ("*", "br"),
+            ("*;q=0.1, gzip;q=0", "br"),
+            ("gzip;q=bad", None),
+        ],
+    )
+    def test_negotiation(self, header, expected):
+        """Test q-values, wildcards and the server's preference for br."""
+        assert negotiate_encoding(header, available=("br", "gzip")) == expected
+
+    def test_only_offers_available_codings(self):
+        """Test that br is not picked when the server cannot produce it."""
+        assert negotiate_encoding("br", available=("gzip",)) is None
+        assert negotiate_encoding("br, gzip;q=0.1", available=("gzip",)) == "gzip"
+
+
+class TestCompress:
+    """Test cases for compress."""
+
+    def test_gzip_is_deterministic(self):
+        """Test that gzip output round-trips and does not depend on the time."""
+        body = b'{"data":"' + b"x" * 5000 + b'"}'
+        compressed = compress(body, "gzip")
+        assert gzip.decompress(compressed) == body
+        assert len(compressed) < len(body) // 10
+        assert compress(body, "gzip") == compressed
+
+    @pytest.mark.skipif(compression.brotli is None, reason="brotli is not installed")
+    def test_brotli(self):
+        """Test brotli output round-trips."""
+        body = b"quote " * 1000
+        assert compression.brotli.decompress(compress(body, "br")) == body
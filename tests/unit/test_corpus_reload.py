@@ -0,0 +1,165 @@
+"""
+Unit tests for the corpus hot reload.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.corpus_reload import (
+    CorpusReloader,
+    FileSource,
+    SQLiteSource,
+    create_corpus_reloader,
+    open_source,
+)
+from quotes_api.services.quote_service import QuoteService, sample_quotes
+from quotes_api.services.storage import SQLiteBackend
+from quotes_api.utils.exceptions import ConfigurationError
+
+
+def write_corpus(path, generation: int, size: int = 50) -> None:
+    """Atomically write a corpus whose texts all carry their generation."""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as target:
+        for n in range(size + generation):
+            target.write(json.dumps({"text": f"gen {generation} citation {n}"}) + "\n")
+    os.replace(temporary, path)
+
+
+class TestCorpusReloader:
+    """Test cases for CorpusReloader with a file source."""
+
+    @pytest.fixture(autouse=True)
+    def _reloader(self, tmp_path):
+        self.path = str(tmp_path / "corpus.ndjson")
+        write_corpus(self.path, 0)
+        self.service = QuoteService(quotes=())
+        self.reloader = CorpusReloader(
+            self.service, FileSource(self.path), interval=0.01
+        )
+        yield
+        self.reloader.stop()
+
+    def test_reload_swaps_corpus(self):
+        """Test that a reload publishes the file contents and records stats."""
+        assert self.reloader.reload()
+        assert self.service.get_quote_count() == 50
+        stats = self.reloader.stats()
+        assert stats["kind"] == "file"
+        assert stats["reloads"] == 1
+        assert stats["snapshot_version"] == self.service.version
+        assert stats["last_swap"] <= time.time()
+        assert stats["last_duration_ms"] > 0
+        assert stats["last_import"]["imported"] == 50
+
+    def test_check_waits_for_a_stable_change(self):
+        """Test that a change is loaded once unchanged for one poll."""
+        self.reloader.reload()
+        assert not self.reloader.check()
+        write_corpus(self.path, 1)
+        assert not self.reloader.check()
+        assert self.service.get_quote_count() == 50
+        assert self.reloader.check()
+        assert self.service.get_quote_count() == 51
+        assert not self.reloader.check()
+
+    def test_failed_reload_keeps_corpus(self, monkeypatch):
+        """Test that a failing load is reported and only retried after a change."""
+        self.reloader.reload()
+        version = self.service.version
+
+        def fail(service):
+            raise OSError("disk on fire")
+
+        monkeypatch.setattr(self.reloader.source, "load", fail)
+        write_corpus(self.path, 1)
+        self.reloader.check()
+        assert not self.reloader.check()
+        assert self.service.version == version
+        assert self.reloader.stats()["failures"] == 1
+        assert "disk on fire" in self.reloader.stats()["last_error"]
+        assert not self.reloader.check()
+
+    def test_readers_see_one_snapshot(self):
+        """Test that reads during reloads never mix two generations."""
+        self.reloader.reload()
+        stop = threading.Event()
+
+        def reload_forever():
+            generation = 1
+            while not stop.is_set():
+                write_corpus(self.path, generation)
+                self.reloader.reload()
+                generation += 1
+
+        writer = threading.Thread(target=reload_forever)
+        writer.start()
+        try:
+            for _ in range(300):
+                page = self.service.get_all_quotes()
+                assert len({quote.text.split()[1] for quote in page}) == 1
+                assert len(page) == 50 + int(page[0].text.split()[1])
+        finally:
+            stop.set()
+            writer.join()
+
+    def test_watcher_thread(self):
+        """Test that the background thread picks up a replaced file."""
+        self.reloader.reload()
+        self.reloader.start()
+        assert self.reloader.stats()["watching"]
+        write_corpus(self.path, 3)
+        deadline = time.monotonic() + 5
+        while self.service.get_quote_count() != 53 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self.service.get_quote_count() == 53
+        self.reloader.stop()
+        assert not self.reloader.running
+
+
+class TestSQLiteSource:
+    """Test cases for reloading from a SQLite database."""
+
+    def test_reloads_on_commit(self, tmp_path):
+        """Test that a commit from another connection is detected and loaded."""
+        path = str(tmp_path / "corpus.db")
+        writer = SQLiteBackend(path, quotes=sample_quotes())
+        service = QuoteService(quotes=())
+        reloader = CorpusReloader(service, open_source(path))
+        assert isinstance(reloader.source, SQLiteSource)
+        try:
+            assert reloader.reload()
+            assert service.get_quote_count() == 10
+            assert service.get_quotes_by_author("socrate")[0].id == 5
+            assert not reloader.check()
+
+            writer.add(Quote(text="Une nouvelle citation", author="Moi"))
+            assert not reloader.check()
+            assert reloader.check()
+            assert service.get_quote_by_id(11).author == "Moi"
+            assert service.fingerprint == writer.fingerprint
+        finally:
+            reloader.stop()
+            writer.close()
+
+
+class TestCreateCorpusReloader:
+    """Test cases for create_corpus_reloader."""
+
+    def test_disabled_without_path(self):
+        """Test that no reloader is built without a corpus path."""
+        assert create_corpus_reloader(QuoteService()) is None
+
+    def test_requires_memory_backend(self, monkeypatch):
+        """Test that a corpus path is refused with another backend."""
+        from quotes_api.config import settings
+
+        monkeypatch.setattr(settings, "corpus_path", "corpus.csv")
+        monkeypatch.setattr(settings, "storage_backend", "sqlite")
+        with pytest.raises(ConfigurationError):
+            create_corpus_reloader(QuoteService())
@@ -0,0 +1,150 @@
+"""
+Unit tests for the operation dispatcher and the async quote service.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from quotes_api.config.settings import Settings
+from quotes_api.services.async_quote_service import AsyncQuoteService
+from quotes_api.services.dispatch import OperationDispatcher
+from quotes_api.services.quote_service import QuoteService
+
+
+class TestOperationDispatcher:
+    """Test cases for OperationDispatcher."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.dispatcher = OperationDispatcher(
+            max_workers=4, max_concurrency=2, limits={"export": 1}
+        )
+
+    def teardown_method(self):
+        """Release the worker threads after each test method."""
+        self.dispatcher.close()
+
+    def test_inline_runs_on_the_caller_thread(self):
+        """Test that inline calls run on the current thread and are timed."""
+        assert (
+            self.dispatcher.inline("quote", threading.get_ident)
+            == threading.get_ident()
+        )
+        stats = self.dispatcher.stats()["quote"]
+        assert stats["calls"] == 1
+        assert stats["errors"] == 0
+        assert stats["avg_ms"] is not None
+
+    def test_offload_runs_in_the_pool(self):
+        """Test that offloaded calls run in a worker thread."""
+        thread = asyncio.run(
+            self.dispatcher.offload("search", threading.current_thread)
+        )
+        assert thread.name.startswith("quotes-heavy")
+        assert self.dispatcher.stats()["search"]["calls"] == 1
+
+    def test_limit_makes_callers_wait(self):
+        """Test that calls over an operation's limit wait for a free slot."""
+        assert self.dispatcher.limit("export") == 1
+        assert self.dispatcher.limit("search") == 2
+        release = threading.Event()
+        waiting = []
+
+        async def run():
+            first = asyncio.ensure_future(
+                self.dispatcher.offload("export", release.wait, 5)
+            )
+            second = asyncio.ensure_future(
+                self.dispatcher.offload("export", release.wait, 5)
+            )
+            await asyncio.sleep(0.05)
+            waiting.append(self.dispatcher.stats()["export"])
+            release.set()
+            await asyncio.gather(first, second)
+
+        asyncio.run(run())
+        assert waiting[0]["in_flight"] == 1
+        assert waiting[0]["waiting"] == 1
+        stats = self.dispatcher.stats()["export"]
+        assert stats["calls"] == 2
+        assert (stats["in_flight"], stats["waiting"]) == (0, 0)
+        assert stats["wait_ms"] > 0
+
+    def test_errors_are_counted(self):
+        """Test that a failing call is counted and its exception raised."""
+        with pytest.raises(ZeroDivisionError):
+            asyncio.run(self.dispatcher.offload("stats", lambda: 1 / 0))
+        with pytest.raises(ZeroDivisionError):
+            self.dispatcher.inline("quote", lambda: 1 / 0)
+        stats = self.dispatcher.stats()
+        assert stats["stats"]["errors"] == 1
+        assert stats["quote"]["errors"] == 1
+
+    def test_stream_yields_every_item(self):
+        """Test that a stream pulls all items in the pool and releases its slot."""
+
+        async def run():
+            return [
+                item async for item in self.dispatcher.stream("export", iter(range(5)))
+            ]
+
+        assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+        stats = self.dispatcher.stats()["export"]
+        assert stats["calls"] == 1
+        assert stats["in_flight"] == 0
+
+
+class TestAsyncQuoteService:
+    """Test cases for AsyncQuoteService."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.dispatcher = OperationDispatcher()
+        self.quotes = AsyncQuoteService(QuoteService(), self.dispatcher)
+
+    def teardown_method(self):
+        """Release the worker threads after each test method."""
+        self.dispatcher.close()
+
+    def test_operations_are_routed(self):
+        """Test that lookups run inline and searches in the pool."""
+
+        async def run():
+            quote = await self.quotes.get_quote_by_id(1)
+            results = await self.quotes.search_quotes("vie", limit=5)
+            return quote, results
+
+        quote, results = asyncio.run(run())
+        assert quote.id == 1
+        assert results
+        stats = self.dispatcher.stats()
+        assert stats["quote"]["wait_ms"] == 0
+        assert stats["search"]["calls"] == 1
+
+    def test_pinned_snapshot_reaches_the_pool(self):
+        """Test that an offloaded call reads the snapshot pinned by its caller."""
+        service = self.quotes.service
+
+        async def run():
+            with service.pinned():
+                version = service.version
+                service.delete_quote(1)
+                stats = await self.quotes.get_stats()
+                return version, stats
+
+        version, stats = asyncio.run(run())
+        assert version != service.version
+        assert stats["total_quotes"] == 10
+        assert service.get_quote_count() == 9
+
+
+class TestOffloadSettings:
+    """Test cases for the dispatcher settings."""
+
+    def test_offload_limits_parse(self):
+        """Test that per-operation limits are parsed from their raw string."""
+        settings = Settings(offload_limits_raw="search=4, export=1")
+        assert settings.offload_limits == {"search": 4, "export": 1}
+        assert Settings(offload_limits_raw="").offload_limits == {}
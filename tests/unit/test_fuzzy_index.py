@@ -0,0 +1,94 @@
+"""
+Unit tests for the fuzzy name index.
+"""
+
+import random
+import string
+import time
+
+from quotes_api.services.fuzzy_index import FuzzyIndex, fold_name, similarity
+
+
+class TestSimilarity:
+    """Test cases for the name similarity."""
+
+    def test_edit_distance_score(self):
+        """Test that the score is one minus the normalized edit distance."""
+        assert similarity("victor hugo", "victor hugo") == 1.0
+        assert similarity("victr hugo", "victor hugo") == 1 - 1 / 11
+        assert similarity("abc", "xyz") == 0.0
+
+    def test_early_exit_below_minimum(self):
+        """Test that names too far apart score zero under a minimum."""
+        assert similarity("socrate", "platon", min_score=0.7) == 0.0
+        assert similarity("socrate", "socrates", min_score=0.7) == 1 - 1 / 8
+
+    def test_fold_name(self):
+        """Test that case, accents and punctuation are folded away."""
+        assert fold_name("  Saint-Exupéry ") == fold_name("saint exupery")
+        assert fold_name("Succès") == "succes"
+
+
+class TestFuzzyIndex:
+    """Test cases for FuzzyIndex."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.index = FuzzyIndex(
+            [
+                "Victor Hugo",
+                "Voltaire",
+                "Albert Camus",
+                "Antoine de Saint-Exupéry",
+                "Sagesse",
+                "Succès",
+                "Amour",
+                "Socrate",
+                "",
+            ]
+        )
+
+    def test_typos_and_accents(self):
+        """Test that typos and missing accents find the intended name."""
+        assert self.index.match("Victr Hugo")[0][0] == "Victor Hugo"
+        assert self.index.match("albert camu")[0][0] == "Albert Camus"
+        assert self.index.match("antoine de saint exupery") == [
+            ("Antoine de Saint-Exupéry", 1.0)
+        ]
+        assert self.index.match("Succes") == [("Succès", 1.0)]
+
+    def test_ranking_and_limit(self):
+        """Test that matches come best first and are capped by the limit."""
+        index = FuzzyIndex(["Martin", "Marti", "Martine", "Martins"])
+        matches = index.match("Martin", limit=3)
+        assert matches[0] == ("Martin", 1.0)
+        assert len(matches) == 3
+        scores = [score for _, score in matches]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_no_match(self):
+        """Test that unrelated, empty and punctuation-only names match nothing."""
+        assert self.index.match("Zzyzx Qwerty") == []
+        assert self.index.match("") == []
+        assert self.index.match("!!!") == []
+        assert self.index.match("Victor Hugo", limit=0) == []
+        assert len(self.index) == 8
+
+    def test_lookup_is_fast_on_many_names(self):
+        """Test that a lookup among 20,000 names takes milliseconds."""
+        rng = random.Random(7)
+        names = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9))).title()
+            + " "
+            + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))).title()
+            for _ in range(20_000)
+        ]
+        index = FuzzyIndex(names)
+        queries = [name[:3] + name[4:] for name in names[:50]]
+        start = time.perf_counter()
+        found = sum(
+            index.match(query)[0][0] == name for query, name in zip(queries, names)
+        )
+        per_lookup = (time.perf_counter() - start) / len(queries)
+        assert found >= 45
+        assert per_lookup < 0.05
@@ -0,0 +1,158 @@
+"""
+Unit tests for the logging pipeline.
+"""
+
+import io
+import json
+import logging
+import os
+import queue
+import random
+
+import pytest
+
+from quotes_api.utils import logger as log_module
+from quotes_api.utils.logger import (
+    LogQueueHandler,
+    LogQueueListener,
+    PathSampler,
+    build_formatter,
+    get_log_stats,
+    log_request_response,
+    setup_logging,
+)
+
+
+def make_record(message: str) -> logging.LogRecord:
+    """Build a plain standard library record."""
+    return logging.LogRecord("test", logging.INFO, __file__, 1, message, None, None)
+
+
+class TestLogQueueHandler:
+    """Test cases for LogQueueHandler and LogQueueListener."""
+
+    def test_drop_policy_counts_overflow(self):
+        """Test that a full queue drops records instead of blocking."""
+        handler = LogQueueHandler(queue.Queue(maxsize=2), policy="drop")
+        for index in range(5):
+            handler.emit(make_record(f"message {index}"))
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_records_are_not_formatted_on_the_caller(self):
+        """Test that the record is enqueued untouched for the listener to render."""
+        handler = LogQueueHandler(queue.Queue(), policy="block")
+        record = make_record("hello %s")
+        record.args = ("world",)
+        handler.emit(record)
+        queued = handler.queue.get_nowait()
+        assert queued is record
+        assert queued.args == ("world",)
+
+    def test_listener_renders_json_lines(self):
+        """Test that the background thread renders and writes every record."""
+        stream = io.StringIO()
+        writer = logging.StreamHandler(stream)
+        writer.setFormatter(build_formatter())
+        handler = LogQueueHandler(queue.Queue(maxsize=1), policy="block")
+        listener = LogQueueListener(handler.queue, writer)
+        listener.start()
+        for index in range(50):
+            handler.emit(make_record(f"message {index}"))
+        listener.stop()
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["event"] for line in lines] == [
+            f"message {index}" for index in range(50)
+        ]
+        assert lines[0]["level"] == "info"
+        assert lines[0]["timestamp"].endswith("Z")
+        assert handler.dropped == 0
+
+    def test_unknown_policy(self):
+        """Test that an unknown policy is rejected."""
+        with pytest.raises(ValueError):
+            LogQueueHandler(queue.Queue(), policy="spill")
+
+
+class TestRequestSampling:
+    """Test cases for per-path request log sampling."""
+
+    class RecordingLogger:
+        """Logger stub recording the events it receives."""
+
+        def __init__(self):
+            self.events = []
+
+        def info(self, event, **fields):
+            self.events.append((event, fields))
+
+        error = info
+
+    @pytest.fixture(autouse=True)
+    def _sampler(self, monkeypatch):
+        self.sampler = PathSampler({"/ping": 0.1}, rng=random.Random(7))
+        monkeypatch.setattr(log_module, "_sampler", self.sampler)
+
+    def test_sampled_path_keeps_a_fraction(self):
+        """Test that only a fraction of a sampled path is logged."""
+        logger = self.RecordingLogger()
+        for _ in range(1000):
+            log_request_response(logger, "GET", "/ping", status_code=200)
+        assert 50 < len(logger.events) < 150
+        assert self.sampler.sampled_out == 1000 - len(logger.events)
+        assert get_log_stats()["sampled_out"] == self.sampler.sampled_out
+
+    def test_other_paths_and_errors_are_always_logged(self):
+        """Test that unsampled paths and error responses bypass sampling."""
+        logger = self.RecordingLogger()
+        for _ in range(20):
+            log_request_response(logger, "GET", "/quotes", status_code=200)
+            log_request_response(logger, "GET", "/ping", status_code=503)
+        assert len(logger.events) == 40
+        assert self.sampler.sampled_out == 0
+
+
+class TestSetupLogging:
+    """Test cases for setup_logging."""
+
+    def test_structlog_events_render_off_thread(self, monkeypatch):
+        """Test the full pipeline from a structlog call to the stream."""
+        stream = io.StringIO()
+        monkeypatch.setattr(log_module.settings, "log_sample_rates_raw", "/a=0.5,/b=1")
+        setup_logging(stream=stream)
+        try:
+            log_module.get_logger("tests.logger").info("rendered", answer=42)
+            assert get_log_stats()["mode"] == "async"
+            assert log_module._sampler.rates == {"/a": 0.5, "/b": 1.0}
+            log_module.stop_logging()
+            line = json.loads(stream.getvalue().splitlines()[-1])
+            assert line["event"] == "rendered"
+            assert line["answer"] == 42
+            assert line["logger"] == "tests.logger"
+        finally:
+            setup_logging()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+    def test_forked_worker_writes_its_records(self, tmp_path):
+        """Test that a process forked after setup restarts the writer thread."""
+        path = tmp_path / "worker.log"
+        with open(path, "w") as stream:
+            setup_logging(stream=stream)
+            try:
+                pid = os.fork()
+                if pid == 0:
+                    code = 1
+                    try:
+                        for n in range(3):
+                            log_module.get_logger("tests.worker").info("forked", n=n)
+                        log_module.stop_logging()
+                        code = 0
+                    finally:
+                        os._exit(code)
+                _, status = os.waitpid(pid, 0)
+            finally:
+                setup_logging()
+        assert os.WEXITSTATUS(status) == 0
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["n"] for line in lines if line["event"] == "forked"] == [0, 1, 2]
@@ -0,0 +1,169 @@
+"""
+Unit tests for the metrics registry.
+"""
+
+import asyncio
+import json
+import os
+
+from quotes_api.services.metrics import MetricsRegistry
+
+
+def parse(text: str) -> dict:
+    """Map each sample line of an exposition to its value."""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.registry = MetricsRegistry(
+            latency_buckets=(0.01, 0.1), size_buckets=(100, 1000)
+        )
+
+    def record(
+        self, route: str, status: int, duration: float, size: int, registry=None
+    ):
+        registry = registry or self.registry
+        registry.request_started("GET")
+        registry.request_finished("GET", route, status, duration, size)
+
+    def test_histograms_are_cumulative(self):
+        """Test counters, bucket counts, sums and in-flight gauges."""
+        self.record("/quotes/{quote_id}", 200, 0.005, 50)
+        self.record("/quotes/{quote_id}", 200, 0.05, 500)
+        self.record("/quotes/{quote_id}", 200, 0.5, 5000)
+        self.record("/quotes/{quote_id}", 404, 0.001, 80)
+        self.registry.request_started("POST")
+
+        samples = parse(
+            self.registry.render(self.registry.collect(self.registry.snapshot()))
+        )
+        labels = 'method="GET",route="/quotes/{quote_id}",status="200"'
+        assert samples[f"quotes_api_http_requests_total{{{labels}}}"] == 3
+        assert (
+            samples[
+                f'quotes_api_http_request_duration_seconds_bucket{{{labels},le="0.01"}}'
+            ]
+            == 1
+        )
+        assert (
+            samples[
+                f'quotes_api_http_request_duration_seconds_bucket{{{labels},le="0.1"}}'
+            ]
+            == 2
+        )
+        assert (
+            samples[
+                f'quotes_api_http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+            ]
+            == 3
+        )
+        assert (
+            samples[f"quotes_api_http_request_duration_seconds_sum{{{labels}}}"]
+            == 0.555
+        )
+        assert (
+            samples[f'quotes_api_http_response_size_bytes_bucket{{{labels},le="1000"}}']
+            == 2
+        )
+        assert samples[f"quotes_api_http_response_size_bytes_sum{{{labels}}}"] == 5550
+        assert samples['quotes_api_http_requests_in_flight{method="GET"}'] == 0
+        assert samples['quotes_api_http_requests_in_flight{method="POST"}'] == 1
+        assert samples["quotes_api_workers"] == 1
+
+    def test_labels_are_escaped(self):
+        """Test that quotes and backslashes in label values are escaped."""
+        self.record('/a"b\\c', 200, 0.001, 1)
+        text = self.registry.render(self.registry.collect(self.registry.snapshot()))
+        assert 'route="/a\\"b\\\\c"' in text
+
+    def test_workers_are_aggregated(self, tmp_path):
+        """Test that snapshots of other workers are summed, dead ones without gauges."""
+        directory = str(tmp_path / "metrics")
+        registry = MetricsRegistry(
+            directory=directory, latency_buckets=(0.01, 0.1), size_buckets=(100, 1000)
+        )
+        self.record("/ping", 200, 0.001, 10, registry=registry)
+        gauges = {
+            "quotes_api_index_size": {"quotes": 10},
+            "quotes_api_response_cache_entries": {"": 2},
+        }
+        counters = {
+            "quotes_api_response_cache_hits_total": {"": 5},
+            "quotes_api_response_cache_variant_hits_total": {"gzip": 2},
+        }
+
+        # A sibling worker that is still running (our parent) and one that exited
+        for pid, in_flight in ((os.getppid(), 3), (2**22 + 12345, 7)):
+            self.write_sibling(
+                directory, registry, pid, None, counters, gauges, in_flight
+            )
+
+        own = registry.snapshot(counters=counters, gauges=gauges)
+        for _ in range(2):
+            samples = parse(registry.render(registry.collect(own)))
+            labels = 'method="GET",route="/ping",status="200"'
+            assert samples[f"quotes_api_http_requests_total{{{labels}}}"] == 3
+            assert samples["quotes_api_response_cache_hits_total"] == 15
+            assert (
+                samples['quotes_api_response_cache_variant_hits_total{encoding="gzip"}']
+                == 6
+            )
+            assert samples['quotes_api_http_requests_in_flight{method="GET"}'] == 3
+            assert samples["quotes_api_response_cache_entries"] == 4
+            assert samples['quotes_api_index_size{index="quotes"}'] == 10
+            assert samples["quotes_api_workers"] == 2
+        assert f"{2 ** 22 + 12345}-x.json" not in os.listdir(directory)
+
+    def test_reused_pid_keeps_exited_counts(self, tmp_path):
+        """Test that a file whose pid now runs another process counts as exited."""
+        directory = str(tmp_path / "metrics")
+        registry = MetricsRegistry(directory=directory)
+        counters = {"quotes_api_response_cache_hits_total": {"": 5}}
+        # Our parent's pid, but a start time it does not have: an exited
+        # worker whose pid was reused.
+        self.write_sibling(directory, registry, os.getppid(), -1, counters, {}, 1)
+        samples = parse(
+            registry.render(registry.collect(registry.snapshot(counters=counters)))
+        )
+        assert samples["quotes_api_response_cache_hits_total"] == 10
+        assert samples["quotes_api_workers"] == 1
+        assert sorted(
+            name for name in os.listdir(directory) if name.endswith(".json")
+        ) == ["exited.json"]
+
+    @staticmethod
+    def write_sibling(directory, registry, pid, started, counters, gauges, in_flight):
+        sibling = registry.snapshot(counters=counters, gauges=gauges)
+        sibling.update(
+            pid=pid, started=started, process=f"{pid}-x", in_flight={"GET": in_flight}
+        )
+        with open(os.path.join(directory, f"{pid}-x.json"), "w") as handle:
+            json.dump(sibling, handle)
+
+    def test_flush_task_writes_snapshots(self, tmp_path):
+        """Test the periodic and final snapshot writes."""
+        directory = str(tmp_path / "metrics")
+        registry = MetricsRegistry(directory=directory, flush_interval=0.01)
+
+        async def snapshot():
+            return registry.snapshot(
+                counters={"quotes_api_response_cache_hits_total": {"": 1}}
+            )
+
+        async def run():
+            registry.start(snapshot)
+            await asyncio.sleep(0.05)
+            await registry.stop(await snapshot())
+
+        asyncio.run(run())
+        assert os.listdir(directory) == [f"{registry.process_id}.json"]
+        assert registry.process_id.startswith(f"{os.getpid()}-")
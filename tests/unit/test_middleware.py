@@ -0,0 +1,93 @@
+"""
+Unit tests for the ASGI middleware.
+"""
+
+import asyncio
+
+import pytest
+
+from quotes_api.api.middleware import RequestTimingMiddleware
+
+
+def http_scope(path: str = "/stream") -> dict:
+    """Build a minimal HTTP scope."""
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(b"user-agent", b"tests")],
+        "client": ("127.0.0.1", 5000),
+    }
+
+
+async def streaming_app(scope, receive, send):
+    """ASGI app streaming three chunks."""
+    await send(
+        {"type": "http.response.start", "status": 200, "headers": [(b"a", b"1")]}
+    )
+    for chunk in (b"one", b"two", b"three"):
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def failing_app(scope, receive, send):
+    """ASGI app raising before the response starts."""
+    raise RuntimeError("boom")
+
+
+class TestRequestTimingMiddleware:
+    """Test cases for RequestTimingMiddleware."""
+
+    @pytest.fixture(autouse=True)
+    def _logged(self, monkeypatch):
+        self.logged = []
+        monkeypatch.setattr(
+            "quotes_api.api.middleware.log_request_response",
+            lambda **fields: self.logged.append(fields),
+        )
+
+    def run(self, app, scope):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(RequestTimingMiddleware(app)(scope, receive, send))
+        return sent
+
+    def test_streamed_chunks_pass_through(self):
+        """Test that body messages are forwarded one by one, unchanged."""
+        sent = self.run(streaming_app, http_scope())
+        assert [message.get("body") for message in sent[1:]] == [
+            b"one",
+            b"two",
+            b"three",
+            b"",
+        ]
+        name, value = sent[0]["headers"][-1]
+        assert sent[0]["headers"][0] == (b"a", b"1")
+        assert name == b"x-process-time" and float(value) >= 0
+        assert self.logged[0]["status_code"] == 200
+        assert self.logged[0]["user_agent"] == "tests"
+        assert self.logged[0]["remote_addr"] == "127.0.0.1"
+
+    def test_errors_are_logged_and_reraised(self):
+        """Test that an unhandled exception is logged as a 500 and propagates."""
+        with pytest.raises(RuntimeError):
+            self.run(failing_app, http_scope("/boom"))
+        assert self.logged[0]["status_code"] == 500
+        assert self.logged[0]["path"] == "/boom"
+
+    def test_non_http_scopes_are_ignored(self):
+        """Test that lifespan messages bypass timing."""
+
+        async def lifespan_app(scope, receive, send):
+            await send({"type": "lifespan.startup.complete"})
+
+        assert self.run(lifespan_app, {"type": "lifespan"}) == [
+            {"type": "lifespan.startup.complete"}
+        ]
+        assert self.logged == []
@@ -2,11 +2,12 @@
 Unit tests for data models.
 """
 
-import pytest
 from datetime import datetime
+
+import pytest
 from pydantic import ValidationError
 
-from arbah.models.quote import Quote, QuoteResponse, QuoteListResponse
+from quotes_api.models.quote import Quote, QuoteListResponse, QuoteResponse
 
 
 class TestQuoteModel:
@@ -142,4 +143,4 @@ class TestQuoteListResponseModel:
         assert data["success"] is True
         assert len(data["data"]) == 2
         assert data["count"] == 2
-        assert data["message"] == "Quotes retrieved successfully"
\ No newline at end of file
+        assert data["message"] == "Quotes retrieved successfully"
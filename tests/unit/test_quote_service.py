@@ -4,8 +4,8 @@ Unit tests for the QuoteService.
 
 import pytest
 
-from arbah.services.quote_service import QuoteService
-from arbah.models.quote import Quote
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService
 
 
 class TestQuoteService:
@@ -112,4 +112,4 @@ class TestQuoteService:
         assert hasattr(quote, 'language')
         assert isinstance(quote.text, str)
         assert len(quote.text) > 0
-        assert quote.language == "fr"
\ No newline at end of file
+        assert quote.language == "fr"
@@ -0,0 +1,174 @@
+"""
+Unit tests for the QuoteStore.
+"""
+
+import pytest
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_store import QuoteRecord, QuoteStore
+from quotes_api.utils.exceptions import QuoteNotFoundError, ValidationError
+
+
+class TestQuoteStore:
+    """Test cases for QuoteStore."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.store = QuoteStore(
+            [
+                Quote(id=3, text="Troisième", author="Victor Hugo", category="Amour"),
+                Quote(id=1, text="Première", author="victor hugo", category="Sagesse"),
+                Quote(
+                    id=2,
+                    text="Deuxième",
+                    author="Socrate",
+                    category="amour",
+                    language="en",
+                ),
+            ]
+        )
+
+    def test_load_orders_by_id(self):
+        """Test that bulk-loaded quotes are iterated in id order."""
+        assert [quote.id for quote in self.store] == [1, 2, 3]
+        assert len(self.store) == 3
+
+    def test_load_rejects_duplicate_ids(self):
+        """Test that bulk loading refuses duplicate ids."""
+        with pytest.raises(ValidationError):
+            QuoteStore([Quote(id=1, text="a"), Quote(id=1, text="b")])
+
+    def test_lookups_are_case_insensitive(self):
+        """Test category, author and language lookups ignore case."""
+        assert [quote.id for quote in self.store.by_category("AMOUR")] == [2, 3]
+        assert [quote.id for quote in self.store.by_author("Victor Hugo")] == [1, 3]
+        assert [quote.id for quote in self.store.by_language("FR")] == [1, 3]
+        assert self.store.by_category("Inconnue") == []
+
+    def test_add_assigns_next_id(self):
+        """Test that adding a quote without id assigns the next one."""
+        quote = self.store.add(Quote(text="Nouvelle", category="Amour"))
+        assert quote.id == 4
+        assert self.store.get(4) is quote
+        assert quote.to_quote() == Quote(id=4, text="Nouvelle", category="Amour")
+        assert [q.id for q in self.store.by_category("amour")] == [2, 3, 4]
+
+    def test_add_rejects_duplicate_id(self):
+        """Test that adding an existing id fails."""
+        with pytest.raises(ValidationError):
+            self.store.add(Quote(id=1, text="Doublon"))
+
+    def test_update_reindexes(self):
+        """Test that updating a quote moves it between index keys."""
+        self.store.update(
+            Quote(id=3, text="Troisième", author="Socrate", category="Sagesse")
+        )
+        assert [quote.id for quote in self.store.by_author("socrate")] == [2, 3]
+        assert [quote.id for quote in self.store.by_category("amour")] == [2]
+        assert [quote.id for quote in self.store.by_category("sagesse")] == [1, 3]
+
+    def test_update_missing_quote(self):
+        """Test that updating an unknown id fails."""
+        with pytest.raises(QuoteNotFoundError):
+            self.store.update(Quote(id=99, text="Absente"))
+
+    def test_delete_drops_empty_keys(self):
+        """Test that deleting the last quote of a key removes the key."""
+        removed = self.store.delete(2)
+        assert removed.id == 2
+        assert 2 not in self.store
+        assert self.store.ids() == [1, 3]
+        assert "en" not in self.store.languages()
+        with pytest.raises(QuoteNotFoundError):
+            self.store.delete(2)
+
+    def test_version_changes_on_write(self):
+        """Test that every write advances the store version."""
+        version = self.store.version
+        self.store.add(Quote(text="Nouvelle"))
+        added = self.store.version
+        self.store.delete(1)
+        assert version < added < self.store.version
+        assert QuoteStore().version != QuoteStore().version
+
+    def test_stats_counts_per_key(self):
+        """Test that stats reflect category, author and language counts."""
+        stats = self.store.stats()
+        assert stats["total_quotes"] == 3
+        assert stats["categories"] == {"Amour": 2, "Sagesse": 1}
+        assert stats["authors"] == {"Socrate": 1, "Victor Hugo": 2}
+        assert stats["language_distribution"] == {"en": 1, "fr": 2}
+
+    def test_stats_follow_writes(self):
+        """Test that stats are refreshed after a write and cached otherwise."""
+        assert self.store.stats() is self.store.stats()
+        self.store.add(Quote(text="Nouvelle", category="Sagesse", language="en"))
+        self.store.delete(3)
+        stats = self.store.stats()
+        assert stats["total_quotes"] == 3
+        assert stats["categories"] == {"Amour": 1, "Sagesse": 2}
+        assert stats["language_distribution"] == {"en": 2, "fr": 1}
+
+    def test_fingerprint_tracks_content(self):
+        """Test that the fingerprint depends on content only, not on write history."""
+        fingerprint = self.store.fingerprint
+        quote = self.store.add(Quote(text="Nouvelle"))
+        assert self.store.fingerprint != fingerprint
+        self.store.delete(quote.id)
+        assert self.store.fingerprint == fingerprint
+        rebuilt = QuoteStore(list(self.store))
+        assert rebuilt.fingerprint == fingerprint
+
+    def test_page_after_id(self):
+        """Test id-ordered pagination over the corpus and an index."""
+        assert [quote.id for quote in self.store.page(limit=2)] == [1, 2]
+        assert [quote.id for quote in self.store.page(after=2)] == [3]
+        page = self.store.by_category("amour", after=2, limit=5)
+        assert [quote.id for quote in page] == [3]
+        assert self.store.page(after=3) == []
+        assert self.store.count_category("AMOUR") == 2
+
+    def test_records_are_compact_and_interned(self):
+        """Test that stored rows are slotted records sharing key strings."""
+        first, third = self.store.get(1), self.store.get(3)
+        assert isinstance(first, QuoteRecord)
+        assert not hasattr(first, "__dict__")
+        assert third.language is first.language
+        record = QuoteRecord.from_quote(
+            Quote(id=9, text="x", author="".join(["Socr", "ate"]))
+        )
+        assert record.author is self.store.get(2).author
+
+    def test_copy_leaves_original_unchanged(self):
+        """Test that writes to a copy do not show through the original store."""
+        hugo = self.store.by_author("victor hugo")
+        copy = self.store.copy()
+        copy.add(Quote(text="Quatrième", author="Victor Hugo", category="Amour"))
+        copy.update(Quote(id=2, text="Deuxième", author="Socrate", category="Sagesse"))
+        copy.delete(1)
+
+        assert [quote.id for quote in self.store] == [1, 2, 3]
+        assert self.store.by_author("victor hugo") == hugo
+        assert self.store.count_category("amour") == 2
+        assert self.store.stats()["total_quotes"] == 3
+        assert [quote.id for quote in copy.by_author("victor hugo")] == [3, 4]
+        assert [quote.id for quote in copy.by_category("sagesse")] == [2]
+        assert copy.version != self.store.version
+        assert copy.fingerprint == QuoteStore(list(copy)).fingerprint
+
+    def test_similar_names(self):
+        """Test that misspelled authors and categories find their closest names."""
+        [(author, score)] = self.store.similar_authors("Socrat")
+        assert author == "Socrate"
+        assert score == pytest.approx(6 / 7)
+        assert self.store.similar_categories("sagese")[0][0] == "Sagesse"
+        assert self.store.similar_authors("Aristote") == []
+
+    def test_fuzzy_index_follows_names(self):
+        """Test that copies share the fuzzy index until their names change."""
+        self.store.similar_authors("Socrat")
+        copy = self.store.copy()
+        assert copy.similar_authors("Socrat")[0][0] == "Socrate"
+        copy.add(Quote(text="Cinquième", author="Platon", category="Sagesse"))
+        assert copy.similar_authors("Platn")[0][0] == "Platon"
+        assert self.store.similar_authors("Platn") == []
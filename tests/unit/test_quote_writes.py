@@ -0,0 +1,266 @@
+"""
+Unit tests for QuoteService writes and reads running concurrently with them.
+"""
+
+import random
+import threading
+import time
+
+import pytest
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.storage import InMemoryBackend, SQLiteBackend
+from quotes_api.utils.exceptions import QuoteNotFoundError, ValidationError
+
+
+class TestQuoteWrites:
+    """Test cases for the single writer of QuoteService."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.service = QuoteService()
+
+    def test_write_publishes_a_new_snapshot(self):
+        """Test that a write swaps in a new backend and leaves the old one intact."""
+        before = self.service.backend
+        quote = self.service.add_quote(Quote(text="Nouvelle", author="Victor Hugo"))
+        assert quote.id == 11
+        assert quote.created_at is not None
+        assert self.service.backend is not before
+        assert self.service.version != before.version
+        assert before.count() == 10
+        assert before.by_author("victor hugo")[-1].id == 1
+        assert self.service.count_quotes_by_author("Victor Hugo") == 2
+        assert self.service.get_stats()["total_quotes"] == 11
+
+    def test_update_keeps_created_at(self):
+        """Test that a replacement keeps the creation time and stamps the update."""
+        created = self.service.add_quote(Quote(text="Nouvelle"))
+        updated = self.service.update_quote(
+            Quote(id=created.id, text="Changée", category="Test")
+        )
+        assert updated.created_at == created.created_at
+        assert updated.updated_at is not None
+        assert self.service.get_quotes_by_category("test")[0].text == "Changée"
+        with pytest.raises(QuoteNotFoundError):
+            self.service.update_quote(Quote(id=99, text="Absente"))
+
+    def test_patch_changes_given_fields(self):
+        """Test that a patch keeps the fields it does not name."""
+        original = self.service.get_quote_by_id(5)
+        patched = self.service.patch_quote(5, {"category": "Philosophie"})
+        assert (patched.text, patched.author) == (original.text, original.author)
+        assert self.service.count_quotes_by_category("Sagesse") == 0
+        assert self.service.count_quotes_by_category("philosophie") == 2
+        with pytest.raises(ValidationError):
+            self.service.patch_quote(5, {"text": None})
+        with pytest.raises(QuoteNotFoundError):
+            self.service.patch_quote(99, {"author": "Personne"})
+
+    def test_delete(self):
+        """Test that a deleted quote disappears from every index."""
+        removed = self.service.delete_quote(5)
+        assert removed.author == "Socrate"
+        assert self.service.get_quote_by_id(5) is None
+        assert self.service.search_quotes("sagesse") == []
+        assert "Socrate" not in self.service.get_stats()["authors"]
+        with pytest.raises(QuoteNotFoundError):
+            self.service.delete_quote(5)
+
+    def test_failed_write_changes_nothing(self):
+        """Test that a rejected write publishes no new version."""
+        version = self.service.version
+        with pytest.raises(ValidationError):
+            self.service.add_quote(Quote(id=1, text="Doublon"))
+        assert self.service.version == version
+
+    def test_queued_writes_share_one_copy(self, monkeypatch):
+        """Test that writes queued behind the writer are applied in one batch."""
+        copies = []
+        begin_write = InMemoryBackend.begin_write
+
+        def counting(backend):
+            copies.append(backend)
+            return begin_write(backend)
+
+        monkeypatch.setattr(InMemoryBackend, "begin_write", counting)
+        errors = []
+
+        def add(quote):
+            try:
+                self.service.add_quote(quote)
+            except ValidationError as exc:
+                errors.append(exc)
+
+        quotes = [Quote(id=20 + n, text=f"Citation {n}") for n in range(3)] + [
+            Quote(id=1, text="Doublon")
+        ]
+        with self.service._write_lock:
+            threads = [threading.Thread(target=add, args=(quote,)) for quote in quotes]
+            for thread in threads:
+                thread.start()
+            deadline = time.monotonic() + 5
+            while (
+                len(self.service._queue) < len(quotes) and time.monotonic() < deadline
+            ):
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        assert len(copies) == 1
+        assert len(errors) == 1
+        assert self.service.get_quote_count() == 13
+
+    def test_pinned_reads_ignore_later_writes(self):
+        """Test that a pinned context keeps reading the snapshot it started with."""
+        with self.service.pinned() as backend:
+            version = self.service.version
+            self.service.delete_quote(1)
+            assert self.service.backend is backend
+            assert self.service.version == version
+            assert self.service.get_quote_by_id(1) is not None
+        assert self.service.get_quote_by_id(1) is None
+
+    def test_sqlite_writes_in_place(self, tmp_path):
+        """Test that a backend with its own isolation is written directly."""
+        backend = SQLiteBackend(
+            str(tmp_path / "quotes.db"), quotes=[Quote(id=1, text="Une")]
+        )
+        service = QuoteService(backend=backend)
+        try:
+            service.add_quote(Quote(text="Deux"))
+            assert service.backend is backend
+            assert service.get_quote_count() == 2
+        finally:
+            service.close()
+
+
+class TestReadUnderWrite:
+    """Load test: readers checking snapshot consistency while writers run."""
+
+    READERS = 4
+    WRITERS = 2
+    WRITES = 150
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.service = QuoteService(
+            quotes=[
+                Quote(
+                    id=n,
+                    text=f"Citation numéro {n}",
+                    author=f"Auteur {n % 7}",
+                    category=f"Thème {n % 5}",
+                )
+                for n in range(1, 501)
+            ]
+        )
+
+    def check_snapshot(self, last_version: int) -> int:
+        """Assert that every view of the pinned snapshot agrees; return its version."""
+        service = self.service
+        with service.pinned():
+            version = service.version
+            assert version >= last_version
+            stats = service.get_stats()
+            count = service.get_quote_count()
+            assert stats["total_quotes"] == count
+            assert len(service.get_all_quotes()) == count
+            assert sum(stats["categories"].values()) == count
+            assert sum(stats["authors"].values()) == count
+            for category, total in stats["categories"].items():
+                quotes = service.get_quotes_by_category(category)
+                assert (
+                    len(quotes) == total == service.count_quotes_by_category(category)
+                )
+                assert all(quote.category == category for quote in quotes)
+            for quote in service.search_quotes("citation", limit=20):
+                assert service.get_quote_by_id(quote.id) == quote
+            assert service.version == version
+        return version
+
+    def read_until(
+        self, stop: threading.Event, reads: list, slot: int, failures: list
+    ) -> None:
+        """Check snapshots until stopped, counting reads in ``reads[slot]``."""
+        version = 0
+        try:
+            while not stop.is_set():
+                version = self.check_snapshot(version)
+                reads[slot] += 1
+        except Exception as exc:
+            failures.append(exc)
+
+    def write(self, seed: int, failures: list) -> None:
+        """Run WRITES random writes."""
+        rng = random.Random(seed)
+        try:
+            for n in range(self.WRITES):
+                self.write_randomly(rng, f"{seed}-{n}")
+        except Exception as exc:
+            failures.append(exc)
+
+    def write_randomly(self, rng: random.Random, label: str) -> None:
+        """Add, patch or delete a quote at random."""
+        operation = rng.random()
+        ids = self.service.backend.random_pool()
+        if operation < 0.5 or len(ids) < 100:
+            self.service.add_quote(
+                Quote(
+                    text=f"Citation ajoutée {label}",
+                    author=f"Auteur {rng.randrange(9)}",
+                    category=f"Thème {rng.randrange(7)}",
+                )
+            )
+            return
+        quote_id = rng.choice(ids)
+        try:
+            if operation < 0.75:
+                self.service.patch_quote(
+                    quote_id, {"category": f"Thème {rng.randrange(7)}"}
+                )
+            else:
+                self.service.delete_quote(quote_id)
+        except QuoteNotFoundError:
+            pass  # deleted by the other writer meanwhile
+
+    def test_readers_see_consistent_snapshots(self):
+        """Test that concurrent writes never expose a half-applied write."""
+        stop = threading.Event()
+        failures = []
+        reads = [0] * self.READERS
+
+        readers = [
+            threading.Thread(target=self.read_until, args=(stop, reads, slot, failures))
+            for slot in range(self.READERS)
+        ]
+        writers = [
+            threading.Thread(target=self.write, args=(seed, failures))
+            for seed in range(self.WRITERS)
+        ]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        assert not failures, failures[0]
+        assert all(reads)
+        self.check_snapshot(0)
+
+    def test_reads_do_not_wait_for_the_writer(self):
+        """Test that reads complete while the write lock is held."""
+        done = threading.Event()
+
+        def read():
+            self.check_snapshot(0)
+            done.set()
+
+        with self.service._write_lock:
+            thread = threading.Thread(target=read)
+            thread.start()
+            assert done.wait(5)
+        thread.join()
@@ -0,0 +1,80 @@
+"""
+Unit tests for random quote selection.
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService
+from quotes_api.services.random_selection import (
+    AliasTable,
+    RandomSelector,
+    ShuffledCursor,
+)
+from quotes_api.utils.exceptions import ValidationError
+
+
+class TestRandomSelection:
+    """Test cases for AliasTable, ShuffledCursor and RandomSelector."""
+
+    def test_alias_table_follows_weights(self):
+        """Test that draws are proportional to the weights."""
+        table = AliasTable([1, 0, 3])
+        rng = random.Random(7)
+        counts = Counter(table.sample(rng) for _ in range(40_000))
+        assert counts[1] == 0
+        assert 2.7 < counts[2] / counts[0] < 3.3
+
+    def test_alias_table_rejects_zero_weights(self):
+        """Test that a table needs a positive weight."""
+        with pytest.raises(ValidationError):
+            AliasTable([0, 0])
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 17, 1000])
+    def test_shuffled_cursor_is_a_permutation(self, size):
+        """Test that a cursor visits every position exactly once."""
+        cursor = ShuffledCursor(size, random.Random(size))
+        positions = [cursor.next() for _ in range(size)]
+        assert sorted(positions) == list(range(size))
+        assert cursor.exhausted
+
+    def test_session_does_not_repeat(self):
+        """Test that a session sees the whole pool before a repeat."""
+        selector = RandomSelector()
+        pool = list(range(10, 30))
+        first = [selector.pick(pool, "all", 1, session="a") for _ in range(20)]
+        assert sorted(first) == pool
+        second = [selector.pick(pool, "all", 1, session="a") for _ in range(20)]
+        assert sorted(second) == pool
+        assert selector.session_count == 1
+
+    def test_invalid_weighting(self):
+        """Test unknown weightings and weighted no-repeat are refused."""
+        selector = RandomSelector()
+        with pytest.raises(ValidationError):
+            selector.pick([1], "all", 1, weighting="popularity")
+        with pytest.raises(ValidationError):
+            selector.pick([1], "all", 1, weighting="recency", session="a")
+        assert selector.pick([], "all", 1) is None
+
+    def test_service_filters(self):
+        """Test filtered draws through the service."""
+        service = QuoteService(
+            [
+                Quote(id=1, text="Un", author="Hugo", category="Amour"),
+                Quote(
+                    id=2, text="Deux", author="Hugo", category="Sagesse", language="en"
+                ),
+                Quote(id=3, text="Trois", author="Camus", category="Amour"),
+            ]
+        )
+        assert {service.get_random_quote(category="amour").id for _ in range(30)} == {
+            1,
+            3,
+        }
+        assert service.get_random_quote(author="HUGO", category="Amour").id == 1
+        assert service.get_random_quote(language="en", weighting="recency").id == 2
+        assert service.get_random_quote(author="Camus", language="en") is None
@@ -0,0 +1,92 @@
+"""
+Unit tests for the ResponseCache.
+"""
+
+from quotes_api.services.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses."""
+        cache = ResponseCache()
+        assert cache.get("a", 1) is None
+        cache.put("a", 1, b"body")
+        assert cache.get("a", 1) == b"body"
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["bytes"] == 4
+
+    def test_new_version_invalidates(self):
+        """Test that a newer corpus version drops every entry."""
+        cache = ResponseCache()
+        cache.get("a", 1)
+        cache.put("a", 1, b"old")
+        assert cache.get("a", 2) is None
+        assert len(cache) == 0
+        assert cache.stats()["invalidations"] == 1
+
+    def test_older_version_is_a_miss(self):
+        """Test that a lookup from an older version is a miss and keeps the cache."""
+        cache = ResponseCache()
+        cache.get("a", 2)
+        cache.put("a", 2, b"new")
+        cache.put_variant("a", 2, "gzip", b"zz")
+        assert cache.get("a", 1) is None
+        assert cache.get_variant("a", 1, "gzip") is None
+        assert cache.get("a", 2) == b"new"
+        assert cache.get_variant("a", 2, "gzip") == b"zz"
+        assert cache.stats()["invalidations"] == 0
+
+    def test_stale_put_is_ignored(self):
+        """Test that a body rendered from a superseded version is not stored."""
+        cache = ResponseCache()
+        cache.get("a", 2)
+        cache.put("a", 1, b"stale")
+        assert cache.get("a", 2) is None
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        """Test that least recently used entries are evicted first."""
+        cache = ResponseCache(max_entries=2, max_bytes=10)
+        cache.get("a", 1)
+        cache.put("a", 1, b"aaaa")
+        cache.put("b", 1, b"bbbb")
+        cache.get("a", 1)
+        cache.put("c", 1, b"cccc")
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == b"aaaa"
+        cache.put("d", 1, b"dddddddd")
+        assert len(cache) == 1
+        assert cache.stats()["evictions"] == 3
+
+    def test_encoded_variants_live_with_their_entry(self):
+        """Test that variants are counted per encoding and live as long as the entry."""
+        cache = ResponseCache(max_entries=2, max_bytes=100)
+        cache.get("a", 1)
+        cache.put_variant("a", 1, "gzip", b"zz")
+        assert cache.get_variant("a", 1, "gzip") is None  # no body to derive from
+
+        cache.put("a", 1, b"aaaaaaaa")
+        cache.put_variant("a", 1, "gzip", b"zz")
+        assert cache.get_variant("a", 1, "gzip") == b"zz"
+        assert cache.get_variant("a", 1, "br") is None
+        stats = cache.stats()
+        assert stats["bytes"] == 10
+        assert stats["variants"] == {
+            "br": {"hits": 0, "misses": 1},
+            "gzip": {"hits": 1, "misses": 1},
+        }
+
+        cache.put("a", 1, b"new body")
+        assert cache.get_variant("a", 1, "gzip") is None
+        cache.put_variant("a", 1, "gzip", b"zz")
+        cache.put("b", 1, b"b")
+        cache.put("c", 1, b"c")
+        assert cache.get_variant("a", 1, "gzip") is None
+        assert cache.stats()["bytes"] == 2
+
+        cache.put_variant("c", 1, "gzip", b"zz")
+        assert cache.get_variant("c", 2, "gzip") is None
+        assert cache.stats()["bytes"] == 0
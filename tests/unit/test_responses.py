@@ -0,0 +1,59 @@
+"""
+Unit tests for the JSON response encoding.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+
+from quotes_api.api import responses
+from quotes_api.api.responses import FastJSONResponse, dumps, encode_json
+from quotes_api.models.quote import Quote, QuoteResponse
+
+
+class TestJSONEncoding:
+    """Test cases for the orjson and stdlib encoding paths."""
+
+    content = {
+        "categories": ["Sagesse", "Été"],
+        "count": 2,
+        "ratio": 0.5,
+        "missing": None,
+        "sampled_at": datetime(2024, 5, 1, 12, 30),
+    }
+
+    @pytest.fixture(params=["orjson", "stdlib"])
+    def encoder(self, request, monkeypatch):
+        if request.param == "stdlib":
+            monkeypatch.setattr(responses, "orjson", None)
+        elif responses.orjson is None:
+            pytest.skip("orjson is not installed")
+        return request.param
+
+    def test_plain_content_is_compact_utf8(self, encoder):
+        """Test that both encoders produce the same compact, unescaped JSON."""
+        body = dumps(self.content)
+        assert "Été".encode("utf-8") in body
+        assert b", " not in body
+        assert json.loads(body) == {**self.content, "sampled_at": "2024-05-01T12:30:00"}
+
+    def test_models_nested_in_plain_content(self, encoder):
+        """Test that models inside dicts fall back to jsonable_encoder."""
+        body = dumps({"quote": Quote(id=1, text="Bonjour")})
+        assert json.loads(body)["quote"]["text"] == "Bonjour"
+
+    def test_models_skip_the_dict_round_trip(self):
+        """Test that models are serialized by their compiled serializer."""
+        quote = Quote(id=1, text="Bonjour", created_at=datetime(2024, 5, 1, 12, 30))
+        response = QuoteResponse(data=quote)
+        assert encode_json(response) == response.model_dump_json().encode("utf-8")
+        assert json.loads(encode_json(quote))["created_at"] == "2024-05-01T12:30:00"
+        assert encode_json(b"{}") == b"{}"
+
+    def test_response_class_accepts_models(self):
+        """Test that FastJSONResponse renders models, bytes and plain content."""
+        response = FastJSONResponse(QuoteResponse(data=Quote(id=2, text="Salut")))
+        assert json.loads(response.body)["data"]["id"] == 2
+        assert response.media_type == "application/json"
+        assert FastJSONResponse({"a": 1}).body == b'{"a":1}'
@@ -0,0 +1,153 @@
+"""
+Unit tests for the SearchIndex.
+"""
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.search_index import SearchIndex, fold_text, tokenize
+
+
+class TestTextFolding:
+    """Test cases for accent folding and tokenization."""
+
+    def test_fold_text_strips_accents_and_ligatures(self):
+        """Test that French accents and ligatures fold to ASCII."""
+        assert fold_text("Succès") == "succes"
+        assert fold_text("Cœur") == "coeur"
+        assert fold_text("Façon") == "facon"
+
+    def test_tokenize_splits_elisions(self):
+        """Test that elided articles are split from their word."""
+        assert tokenize("L'avenir appartient") == ["l", "avenir", "appartient"]
+
+
+class TestSearchIndex:
+    """Test cases for SearchIndex."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.index = SearchIndex(
+            [
+                Quote(
+                    id=1,
+                    text="La vie est une fleur.",
+                    author="Victor Hugo",
+                    category="Amour",
+                ),
+                Quote(
+                    id=2,
+                    text="La vie, la vie, toujours la vie.",
+                    author="Anonyme",
+                    category="Vie",
+                ),
+                Quote(
+                    id=3,
+                    text="Le succès n'est pas la clé.",
+                    author="Albert Schweitzer",
+                    category="Succès",
+                ),
+                Quote(id=4, text="Un cœur vivant.", author="Anonyme", category="Amour"),
+            ]
+        )
+
+    def ids(self, query, limit=None):
+        return [quote_id for quote_id, _ in self.index.search(query, limit)]
+
+    def test_ranks_by_relevance(self):
+        """Test that the quote repeating a term ranks first."""
+        assert self.ids("vie")[0] == 2
+        assert set(self.ids("vie")) == {1, 2}
+
+    def test_accent_insensitive(self):
+        """Test that unaccented queries match accented text."""
+        assert self.ids("succes") == [3]
+        assert self.ids("COEUR") == [4]
+
+    def test_prefix_matching_on_last_token(self):
+        """Test that the last query token matches as a prefix."""
+        assert set(self.ids("viv")) == {4}
+        assert set(self.ids("vi")) == {1, 2, 4}
+
+    def test_all_tokens_must_match(self):
+        """Test AND semantics across query tokens."""
+        assert self.ids("vie hugo") == [1]
+        assert self.ids("vie schweitzer") == []
+
+    def test_limit(self):
+        """Test that limit keeps only the best results."""
+        assert self.ids("la", limit=1) == [2]
+
+    def test_incremental_updates(self):
+        """Test that added and removed quotes are reflected in results."""
+        quote = Quote(id=5, text="Une vie nouvelle.")
+        self.index.add(quote)
+        assert 5 in self.ids("nouvelle")
+        self.index.remove(quote)
+        assert self.ids("nouvelle") == []
+        assert len(self.index) == 4
+
+    def test_empty_query(self):
+        """Test that a query without tokens returns nothing."""
+        assert self.ids("  ...  ") == []
+
+    def test_copy_leaves_original_unchanged(self):
+        """Test that writes to a copy do not show through the original index."""
+        assert self.ids("vie", limit=2) == [2, 1]
+        copy = self.index.copy()
+        copy.add(Quote(id=5, text="Une vie nouvelle."))
+        copy.remove(
+            Quote(
+                id=1,
+                text="La vie est une fleur.",
+                author="Victor Hugo",
+                category="Amour",
+            )
+        )
+
+        assert set(self.ids("vie")) == {1, 2}
+        assert self.ids("nouvelle") == []
+        assert len(self.index) == 4
+        assert {quote_id for quote_id, _ in copy.search("vie")} == {2, 5}
+        assert [quote_id for quote_id, _ in copy.search("fleur")] == []
+
+    def test_shards_with_shared_statistics_score_like_one_index(self):
+        """Test that shards scored with corpus-wide statistics rank like one index."""
+        quotes = [
+            Quote(
+                id=1,
+                text="La vie est une fleur.",
+                author="Victor Hugo",
+                category="Amour",
+            ),
+            Quote(
+                id=2,
+                text="La vie, la vie, toujours la vie.",
+                author="Anonyme",
+                category="Vie",
+            ),
+            Quote(
+                id=3,
+                text="Le succès n'est pas la clé.",
+                author="Albert Schweitzer",
+                category="Succès",
+            ),
+            Quote(id=4, text="Un cœur vivant.", author="Anonyme", category="Amour"),
+        ]
+        shards = [SearchIndex(quotes[0::2]), SearchIndex(quotes[1::2])]
+        doc_count = total_length = 0
+        frequencies = {}
+        for shard in shards:
+            count, length, shard_frequencies = shard.corpus_statistics()
+            doc_count += count
+            total_length += length
+            for term, frequency in shard_frequencies.items():
+                frequencies[term] = frequencies.get(term, 0) + frequency
+        for shard in shards:
+            shard.share_statistics(doc_count, total_length, frequencies)
+
+        for groups in ([["vie"]], [["la"], ["vie", "vivant"]], [["amour"]]):
+            merged = sorted(
+                (item for shard in shards for item in shard.rank(groups)),
+                key=lambda item: (-item[1], item[0]),
+            )
+            assert merged == self.index.rank(groups)
+        assert shards[0].rank([["inconnu"]]) == []
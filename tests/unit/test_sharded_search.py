@@ -0,0 +1,196 @@
+"""
+Unit tests for search sharded across worker processes.
+"""
+
+import random
+import threading
+
+import pytest
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService, create_quote_service
+from quotes_api.services.sharded_search import SearchShards, ShardedSearch
+from quotes_api.services.storage import InMemoryBackend
+from quotes_api.utils.exceptions import ConfigurationError, ServiceUnavailableError
+
+WORDS = (
+    "vie amour succès cœur âme temps rêve sagesse liberté lumière chemin vivre".split()
+)
+
+
+def make_corpus(count, seed=7):
+    """Build a random corpus over a small vocabulary."""
+    rng = random.Random(seed)
+    return [
+        Quote(
+            id=quote_id,
+            text=" ".join(rng.choices(WORDS, k=rng.randint(3, 10))),
+            author=f"Auteur {quote_id % 13}",
+            category=rng.choice(["Amour", "Vie", "Sagesse"]),
+        )
+        for quote_id in range(1, count + 1)
+    ]
+
+
+QUERIES = [
+    "vie",
+    "amour su",
+    "cœur âme",
+    "l",
+    "sagesse vie amour",
+    "auteur 3",
+    "inconnu",
+    "",
+]
+
+
+class TestSearchShards:
+    """Test cases for SearchShards."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.backend = InMemoryBackend(make_corpus(600))
+        self.shards = SearchShards(self.backend, 3)
+
+    def teardown_method(self):
+        """Stop the worker processes after each test method."""
+        self.shards.close()
+
+    def test_results_match_a_single_index(self):
+        """Test that merged shard results equal those of one index over the corpus."""
+        index = self.backend.search_index
+        assert self.shards.doc_count == 600
+        for query in QUERIES:
+            for limit in (None, 1, 10, 50):
+                assert self.shards.search(query, limit) == index.search(query, limit), (
+                    query,
+                    limit,
+                )
+
+    def test_concurrent_searches(self):
+        """Test that searches from several threads each get their own results."""
+        index = self.backend.search_index
+        failures = []
+
+        def search(query):
+            try:
+                for _ in range(20):
+                    assert self.shards.search(query, 5) == index.search(query, 5)
+            except Exception as exc:
+                failures.append(exc)
+
+        threads = [threading.Thread(target=search, args=(query,)) for query in QUERIES]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not failures, failures[0]
+
+    def test_dead_worker_breaks_the_set(self):
+        """Test that a worker dying makes searches fail instead of hang."""
+        worker = self.shards._workers[1]
+        worker.process.kill()
+        worker.process.join()
+        with pytest.raises(ServiceUnavailableError):
+            self.shards.search("vie", 5)
+        assert self.shards.broken
+
+
+class TestShardedSearch:
+    """Test cases for ShardedSearch within QuoteService."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.sharded = ShardedSearch(2, rebuild_delay=0.01)
+        self.service = QuoteService(
+            quotes=make_corpus(300), sharded_search=self.sharded
+        )
+        self.local = QuoteService(quotes=make_corpus(300))
+
+    def teardown_method(self):
+        """Stop the worker processes after each test method."""
+        self.service.close()
+
+    def test_falls_back_until_built(self):
+        """Test that searches use the local index until the shards are ready."""
+        assert self.sharded.version is None
+        assert self.service.search_quotes("vie", limit=5) == self.local.search_quotes(
+            "vie", limit=5
+        )
+        assert self.sharded.fallbacks == 1
+        assert self.sharded.wait_ready(30)
+        assert self.sharded.version == self.service.version
+
+        for query in QUERIES:
+            expected = self.local.search_quotes(query, limit=7, offset=3)
+            assert self.service.search_quotes(query, limit=7, offset=3) == expected
+        assert self.sharded.searches == len(QUERIES)
+
+    def test_follows_writes(self):
+        """Test that a write is searchable at once and the shards catch up."""
+        self.sharded.build(self.service.backend)
+        added = self.service.add_quote(
+            Quote(text="Zénith inattendu", author="Nouvel Auteur")
+        )
+        assert [quote.id for quote in self.service.search_quotes("zenith")] == [
+            added.id
+        ]
+        assert self.sharded.wait_ready(30)
+        assert self.sharded.version == self.service.version
+        assert [quote.id for quote in self.service.search_quotes("zenith")] == [
+            added.id
+        ]
+        assert self.sharded.stats()["builds"] == 2
+
+    def test_rebuilds_after_a_worker_failure(self):
+        """Test that broken shards are replaced and searches keep working meanwhile."""
+        self.sharded.build(self.service.backend)
+        self.sharded._current._workers[0].process.kill()
+        assert self.service.search_quotes("vie", limit=5) == self.local.search_quotes(
+            "vie", limit=5
+        )
+        assert self.sharded.failures == 1
+        assert self.sharded.wait_ready(30)
+        assert self.service.search_quotes("vie", limit=5) == self.local.search_quotes(
+            "vie", limit=5
+        )
+        assert self.sharded.searches == 1
+
+    def test_swaps_let_searches_finish(self):
+        """Test that running searches do not see a shard replacement as a failure."""
+        backend = self.service.backend
+        self.sharded.build(backend)
+        expected = {
+            query: self.local.search_quotes(query, limit=5) for query in QUERIES
+        }
+        stop = threading.Event()
+        mismatches = []
+
+        def read():
+            while not stop.is_set():
+                for query in QUERIES:
+                    if self.service.search_quotes(query, limit=5) != expected[query]:
+                        mismatches.append(query)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        try:
+            for _ in range(8):
+                assert self.sharded.build(backend)
+        finally:
+            stop.set()
+            for thread in readers:
+                thread.join()
+        assert self.sharded.failures == 0
+        assert not mismatches
+        assert self.sharded.searches > 0
+
+    def test_refused_with_sqlite(self, monkeypatch):
+        """Test that sharded search is refused with the SQLite backend."""
+        from quotes_api.config import settings
+
+        monkeypatch.setattr(settings, "search_shards", 2)
+        monkeypatch.setattr(settings, "storage_backend", "sqlite")
+        with pytest.raises(ConfigurationError):
+            create_quote_service()
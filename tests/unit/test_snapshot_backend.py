@@ -0,0 +1,105 @@
+"""
+Unit tests for the memory-mapped snapshot backend.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from quotes_api.cli import main as cli_main
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import sample_quotes
+from quotes_api.services.search_index import SearchIndex
+from quotes_api.services.storage import InMemoryBackend, SnapshotBackend, build_snapshot
+from quotes_api.utils.exceptions import ReadOnlyStorageError, ValidationError
+
+
+class TestSnapshotBackend:
+    """Test cases for SnapshotBackend."""
+
+    @pytest.fixture(autouse=True)
+    def _snapshot(self, tmp_path):
+        self.quotes = sample_quotes() + [
+            Quote(id=42, text="Sans auteur", created_at=datetime(2024, 5, 1, 12, 30)),
+        ]
+        self.path = str(tmp_path / "quotes.snap")
+        assert build_snapshot(reversed(self.quotes), self.path) == 11
+        self.snapshot = SnapshotBackend(self.path)
+        self.memory = InMemoryBackend(self.quotes)
+        yield
+        self.snapshot.close()
+
+    def test_rows_round_trip(self):
+        """Test that every quote is materialized as it was stored."""
+        assert self.snapshot.count() == 11
+        assert self.snapshot.page() == self.memory.page()
+        assert self.snapshot.get(42).created_at == datetime(2024, 5, 1, 12, 30)
+        assert self.snapshot.get(42).author is None
+        assert self.snapshot.get(11) is None
+        assert self.snapshot.random().id in {quote.id for quote in self.quotes}
+
+    def test_prebuilt_indexes_match_in_memory_store(self):
+        """Test keyed lookups, counts and pagination against the in-memory backend."""
+        assert self.snapshot.by_author("VICTOR hugo") == self.memory.by_author(
+            "victor hugo"
+        )
+        assert self.snapshot.by_category("sagesse") == self.memory.by_category(
+            "Sagesse"
+        )
+        assert self.snapshot.by_language(
+            "fr", after=3, limit=4
+        ) == self.memory.by_language("fr", after=3, limit=4)
+        assert self.snapshot.page(after=9, limit=5) == self.memory.page(
+            after=9, limit=5
+        )
+        assert self.snapshot.count_category("inconnue") == 0
+        assert self.snapshot.by_author("Inconnu") == []
+        assert self.snapshot.stats() == self.memory.stats()
+        assert list(self.snapshot.random_pool(category="amour")) == [1]
+        pool = self.snapshot.random_pool(author="Albert Camus", language="fr")
+        assert list(pool) == [7]
+        assert list(self.snapshot.random_pool()) == list(self.memory.random_pool())
+        assert self.snapshot.fingerprint == self.memory.fingerprint
+
+    def test_search_builds_index_on_demand(self):
+        """Test that search works over the mapped rows."""
+        assert self.snapshot.search("succes") == self.memory.search("succes")
+        assert self.snapshot.search("la vie", limit=2, offset=1) == self.memory.search(
+            "la vie", limit=2, offset=1
+        )
+        assert self.snapshot.search("albert") == self.memory.search("albert")
+        indexed = self.snapshot._search_index.corpus_statistics()
+        assert indexed == SearchIndex(self.quotes).corpus_statistics()
+
+    def test_snapshot_is_read_only(self):
+        """Test that writes are rejected."""
+        with pytest.raises(ReadOnlyStorageError):
+            self.snapshot.add(Quote(text="Nouvelle"))
+        with pytest.raises(ReadOnlyStorageError):
+            self.snapshot.delete(1)
+
+    def test_rejects_invalid_input(self, tmp_path):
+        """Test duplicate ids and foreign files are refused."""
+        with pytest.raises(ValidationError):
+            build_snapshot(
+                [Quote(id=1, text="a"), Quote(id=1, text="b")], str(tmp_path / "x")
+            )
+        other = tmp_path / "other.bin"
+        other.write_bytes(b"\x00" * 64)
+        with pytest.raises(ValidationError):
+            SnapshotBackend(str(other))
+
+    def test_cli_builds_from_export(self, tmp_path, capsys):
+        """Test the offline build step from an NDJSON export."""
+        source = tmp_path / "quotes.ndjson"
+        source.write_text(
+            "\n".join(quote.model_dump_json() for quote in self.quotes) + "\n"
+        )
+        output = str(tmp_path / "cli.snap")
+        cli_main(["snapshot", output, "--input", str(source)])
+        assert "Wrote 11 quotes" in capsys.readouterr().out
+        snapshot = SnapshotBackend(output)
+        try:
+            assert snapshot.fingerprint == self.snapshot.fingerprint
+        finally:
+            snapshot.close()
@@ -0,0 +1,134 @@
+"""
+Unit tests for the storage backends.
+"""
+
+import asyncio
+
+import pytest
+
+from quotes_api.models.quote import Quote
+from quotes_api.services.quote_service import QuoteService, sample_quotes
+from quotes_api.services.storage import InMemoryBackend, SQLiteBackend
+from quotes_api.utils.exceptions import QuoteNotFoundError, ValidationError
+
+
+class TestSQLiteBackend:
+    """Test cases for SQLiteBackend."""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method."""
+        self.quotes = sample_quotes()
+
+    @pytest.fixture(autouse=True)
+    def _backend(self, tmp_path):
+        self.path = str(tmp_path / "quotes.db")
+        self.backend = SQLiteBackend(self.path, quotes=self.quotes, pool_size=2)
+        self.memory = InMemoryBackend(self.quotes)
+        yield
+        self.backend.close()
+
+    def test_matches_in_memory_backend(self):
+        """Test that lookups return the same quotes as the in-memory backend."""
+        for backend in (self.backend, self.memory):
+            assert backend.count() == 10
+        assert self.backend.get(3) == self.memory.get(3)
+        assert self.backend.page(after=2, limit=3) == self.memory.page(after=2, limit=3)
+        assert self.backend.by_author("ALBERT CAMUS") == self.memory.by_author(
+            "albert camus"
+        )
+        assert self.backend.by_category("amour") == self.memory.by_category("Amour")
+        assert self.backend.by_language("FR", limit=2) == self.memory.by_language(
+            "fr", limit=2
+        )
+        assert self.backend.count_category("sagesse") == 1
+        assert sorted(self.backend.authors()) == sorted(self.memory.authors())
+        assert self.backend.stats() == self.memory.stats()
+        pool = self.memory.random_pool(language="FR")
+        assert self.backend.random_pool(language="fr") == pool
+        assert self.backend.random_pool(author="socrate", category="sagesse") == [5]
+        assert self.backend.get_many([4, 99, 4]) == self.memory.get_many([4, 99, 4])
+
+    def test_random_pools_are_cached_per_version(self):
+        """Test that a filtered pool is read once per corpus version."""
+        pool = self.backend.random_pool(category="Amour")
+        assert self.backend.random_pool(category="AMOUR") is pool
+        self.backend.delete(pool[0])
+        assert self.backend.random_pool(category="amour") == pool[1:]
+
+    def test_search_is_accent_insensitive_with_prefix(self):
+        """Test that FTS search folds accents and completes the last word."""
+        assert [quote.id for quote in self.backend.search("succes")] == [2]
+        assert {quote.id for quote in self.backend.search("vie")} == {1, 6, 7}
+        assert {quote.id for quote in self.backend.search("la vie cour")} == {6}
+        assert self.backend.search("introuvable") == []
+        assert len(self.backend.search("la", limit=2, offset=1)) == 2
+
+    def test_writes_keep_search_and_fingerprint_in_sync(self):
+        """Test that writes update the FTS index, version and fingerprint."""
+        version, fingerprint = self.backend.version, self.backend.fingerprint
+        assert fingerprint == self.memory.fingerprint
+
+        added = self.backend.add(
+            Quote(text="Le hasard fait bien les choses.", category="Destin")
+        )
+        assert added.id == 11
+        assert [quote.id for quote in self.backend.search("hasard")] == [11]
+        assert self.backend.version != version
+
+        self.backend.update(added.model_copy(update={"text": "Rien ne se perd."}))
+        assert self.backend.search("hasard") == []
+        assert [quote.id for quote in self.backend.search("perd")] == [11]
+
+        self.backend.delete(11)
+        assert self.backend.search("perd") == []
+        assert self.backend.fingerprint == fingerprint
+
+    def test_write_errors(self):
+        """Test duplicate and missing ids raise the service exceptions."""
+        with pytest.raises(ValidationError):
+            self.backend.add(Quote(id=1, text="Doublon"))
+        with pytest.raises(QuoteNotFoundError):
+            self.backend.update(Quote(id=99, text="Absente"))
+        with pytest.raises(QuoteNotFoundError):
+            self.backend.delete(99)
+        assert self.backend.count() == 10
+
+    def test_reopen_keeps_corpus(self):
+        """Test that an existing database is not re-seeded."""
+        self.backend.delete(1)
+        reopened = SQLiteBackend(self.path, quotes=self.quotes)
+        try:
+            assert reopened.count() == 9
+            assert reopened.fingerprint == self.backend.fingerprint
+        finally:
+            reopened.close()
+
+    def test_version_is_shared_by_processes(self):
+        """Test that writers sharing a file advance one version, never reusing it."""
+        other = SQLiteBackend(self.path)
+        try:
+            versions = [self.backend.version]
+            for quote_id, writer in ((1, other), (2, self.backend), (3, other)):
+                writer.delete(quote_id)
+                versions.append(writer.version)
+            assert versions == sorted(set(versions))
+            assert self.backend.version == other.version
+        finally:
+            other.close()
+
+    def test_service_runs_blocking_backend_off_loop(self):
+        """Test that QuoteService.run offloads calls into a blocking backend."""
+        service = QuoteService(backend=self.backend, max_workers=2)
+        assert service.blocking
+
+        async def fetch():
+            return await asyncio.gather(
+                *(
+                    service.run(service.get_quote_by_id, quote_id)
+                    for quote_id in range(1, 11)
+                )
+            )
+
+        quotes = asyncio.run(fetch())
+        assert [quote.id for quote in quotes] == list(range(1, 11))
+        assert service.get_random_quote().id in range(1, 11)
@@ -0,0 +1,35 @@
+"""
+Unit tests for the SystemSampler.
+"""
+
+import asyncio
+
+from quotes_api.services.system_sampler import SystemSampler
+
+
+class TestSystemSampler:
+    """Test cases for SystemSampler."""
+
+    def test_latest_samples_on_demand(self):
+        """Test that an idle sampler still returns a snapshot."""
+        sampler = SystemSampler()
+        latest = sampler.latest()
+        assert "timestamp" in latest
+        assert sampler.history() == [latest]
+        assert not sampler.running
+
+    def test_background_sampling_fills_ring_buffer(self):
+        """Test that the task samples periodically and keeps a bounded history."""
+        sampler = SystemSampler(interval=0.01, history_size=3)
+
+        async def run():
+            sampler.start()
+            assert sampler.running
+            await asyncio.sleep(0.1)
+            await sampler.stop()
+
+        asyncio.run(run())
+        history = sampler.history()
+        assert len(history) == 3
+        assert history[-1]["event_loop_lag_ms"] is not None
+        assert not sampler.running